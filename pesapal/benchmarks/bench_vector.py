@@ -0,0 +1,96 @@
+# @Felix 2026
+
+"""
+Benchmark: vectorized (NumPy) filters and aggregates vs the row path on a column-store table.
+
+Run from the project directory (where manage.py lives):
+
+    python benchmarks/bench_vector.py [rows ...]
+
+Defaults to 1M and 10M rows. Needs NumPy for the vectorized column.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pesapal_app.rdbms_core import Database
+from pesapal_app import rdbms_vector
+
+
+QUERIES = [
+    "SELECT SUM(total_price) AS s, AVG(quantity) AS a FROM orders WHERE quantity > 5",
+    "SELECT COUNT(*) AS n FROM orders WHERE quantity * 2 > total_price / 10",
+    "SELECT MIN(total_price) AS lo, MAX(total_price) AS hi FROM orders WHERE quantity BETWEEN 3 AND 7",
+    "SELECT COUNT(discount) AS n, AVG(discount) AS a FROM orders WHERE discount IS NOT NULL AND quantity IN (1, 2, 3)",
+    "SELECT id FROM orders WHERE quantity = 9 AND total_price > 990",
+]
+
+CHUNK = 100000
+
+
+def build_database(rows):
+    db = Database("bench_vector_db")
+    with contextlib.redirect_stdout(io.StringIO()):
+        if 'orders' in db.tables:
+            db.execute_sql("DROP TABLE orders")
+        db.execute_sql("CREATE TABLE orders (id INTEGER PRIMARY KEY, quantity INTEGER, total_price REAL, "
+                       "discount REAL) USING COLUMNAR")
+        table = db.tables['orders']
+        for start in range(1, rows + 1, CHUNK):
+            table.insert_many({'id': i, 'quantity': i % 10, 'total_price': (i * 7919) % 100000 / 100,
+                               'discount': None if i % 3 else i % 50 / 10}
+                              for i in range(start, min(start + CHUNK, rows + 1)))
+    return db
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def same(a, b):
+    """Results agree, allowing float sums to differ in the last bits"""
+    if len(a) != len(b):
+        return False
+    for x, y in zip(a, b):
+        for key in x:
+            if isinstance(x[key], float) and isinstance(y[key], float):
+                if abs(x[key] - y[key]) > 1e-9 * max(1.0, abs(x[key])):
+                    return False
+            elif x[key] != y[key]:
+                return False
+    return True
+
+
+def run(rows):
+    load_time, db = timed(lambda: build_database(rows))
+    print(f"{rows} rows (loaded in {load_time:.1f}s)")
+    print(f"{'query':<112} {'rows':>9} {'vector':>9} {'speedup':>8}")
+    for sql in QUERIES:
+        db.set_vectorized(False)
+        row_time, expected = timed(lambda: db.execute_sql(sql))
+        db.set_vectorized(True)
+        vector_time, result = timed(lambda: db.execute_sql(sql))
+        note = "" if same(expected, result) else "   RESULTS DIFFER"
+        print(f"{sql:<112} {row_time:>8.3f}s {vector_time:>8.3f}s {row_time / vector_time:>7.1f}x{note}")
+    db.set_vectorized(False)
+
+
+def main():
+    if not rdbms_vector.available():
+        print("NumPy is not installed (pip install numpy); nothing to compare")
+        return
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000000, 10000000]
+    for rows in sizes:
+        run(rows)
+        print()
+
+
+if __name__ == "__main__":
+    main()
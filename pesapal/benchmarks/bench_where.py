@@ -0,0 +1,80 @@
+# @Felix 2026
+
+"""
+Microbenchmark: compiled WHERE predicates vs the old regex + eval evaluator.
+
+Run from the project directory (where manage.py lives):
+
+    python benchmarks/bench_where.py [rows]
+"""
+
+import contextlib
+import io
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pesapal_app.rdbms_core import Database
+
+
+CLAUSES = [
+    "age > 30",
+    "age >= 25 AND age < 40",
+    "email = 'user500@example.com'",
+    "age BETWEEN 20 AND 30 OR name LIKE 'User 1%'",
+    "id IN (1, 2, 3, 4, 5)",
+]
+
+
+def legacy_evaluate_where(row, where_clause):
+    """The pre-compilation evaluator: one re.sub per column per row, then eval"""
+    try:
+        expression = where_clause.upper()
+        for col_name, value in row.items():
+            if isinstance(value, str):
+                value_str = f"'{value}'"
+            else:
+                value_str = str(value)
+            expression = re.sub(rf'\b{re.escape(col_name.upper())}\b', value_str, expression)
+        expression = expression.replace('=', '==').replace('AND', 'and').replace('OR', 'or')
+        return eval(expression, {"__builtins__": {}}, {})
+    except:
+        return False
+
+
+def build_database(rows):
+    db = Database("bench_db")
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.execute_sql("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT UNIQUE, age INTEGER)")
+        table = db.tables['users']
+        for i in range(1, rows + 1):
+            table.insert({'id': i, 'name': f'User {i}', 'email': f'user{i}@example.com', 'age': 18 + i % 50})
+    return db
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    db = build_database(rows)
+    table = db.tables['users']
+    data = table.select()
+
+    print(f"{rows} rows")
+    print(f"{'clause':<50} {'legacy':>10} {'compiled':>10} {'speedup':>8}")
+    for clause in CLAUSES:
+        legacy_time, legacy = timed(lambda: sum(1 for row in data if legacy_evaluate_where(row, clause)))
+        compiled_time, compiled = timed(lambda: len(table.select(clause)))
+        print(f"{clause:<50} {legacy_time:>9.3f}s {compiled_time:>9.3f}s {legacy_time / compiled_time:>7.1f}x"
+              f"   ({legacy} vs {compiled} rows)")
+
+
+if __name__ == "__main__":
+    main()
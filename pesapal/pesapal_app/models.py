@@ -1,21 +1,57 @@
 # @Felix 2026
 
 
+import threading
+from functools import lru_cache
+
 from .rdbms_core import Database, Column, DataType
 
 
+@lru_cache(maxsize=None)
+def _update_by_id_sql(table_name, columns):
+    """Parameterized UPDATE ... WHERE id = ? for a fixed column tuple (built once per combination)"""
+    set_clause = ", ".join(f"{col} = ?" for col in columns)
+    return f"UPDATE {table_name} SET {set_clause} WHERE id = ?"
+
+
+@lru_cache(maxsize=None)
+def _filter_sql(table_name, conditions):
+    """Parameterized SELECT for a tuple of (column, is_null) filter conditions"""
+    where_parts = [f"{key} IS NULL" if is_null else f"{key} = ?" for key, is_null in conditions]
+    where_clause = " AND ".join(where_parts) if where_parts else "1=1"
+    return f"SELECT * FROM {table_name} WHERE {where_clause} ORDER BY id"
+
+
 class RDBMSWrapper:
     _instance = None
+    _init_lock = threading.Lock()
+    
+    # concurrent requests share one fsync per GROUP_COMMIT_DELAY_MS window
+    DURABILITY_MODE = "group"
+    GROUP_COMMIT_DELAY_MS = 2.0
+    
+    # dashboard and list pages repeat the same SELECTs; results are kept until a table they read changes
+    RESULT_CACHE_BYTES = 8 * 1024 * 1024
+    
+    # statement, row and storage metrics served at /api/metrics/
+    COLLECT_METRICS = True
     
     @classmethod
     def get_db(cls):
         if cls._instance is None:
-            cls._instance = Database("pesapal_db")
-            
-            if not cls._instance.load_from_file():
-                print("No db.pesapal file found, creating new database...")
-                cls._create_tables(cls._instance)
-                cls._instance.save_to_file()
+            # request threads race here on first use; only one may open the file
+            with cls._init_lock:
+                if cls._instance is None:
+                    db = Database("pesapal_db")
+                    db.set_durability(cls.DURABILITY_MODE, max_delay_ms=cls.GROUP_COMMIT_DELAY_MS)
+                    db.set_result_cache(max_bytes=cls.RESULT_CACHE_BYTES)
+                    db.set_metrics(cls.COLLECT_METRICS)
+                    
+                    if not db.load_from_file():
+                        print("No db.pesapal file found, creating new database...")
+                        cls._create_tables(db)
+                        db.save_to_file()
+                    cls._instance = db
         
         return cls._instance
     
@@ -82,8 +118,9 @@ class RDBMSWrapper:
     
     @classmethod
     def save_db(cls):
+        """Make pending changes durable (one WAL append; snapshots happen at checkpoints)"""
         if cls._instance:
-            cls._instance.save_to_file()
+            cls._instance.commit()
             return True
         return False
     
@@ -139,7 +176,7 @@ class RDBMSWrapper:
                 email = dup['email']
                 count = dup['count']
                 
-                users = db.execute_sql(f"SELECT id, name FROM users WHERE email = '{email}' ORDER BY id")
+                users = db.execute_sql("SELECT id, name FROM users WHERE email = ? ORDER BY id", [email])
                 
                 for i, user in enumerate(users):
                     if i == 0:
@@ -150,7 +187,7 @@ class RDBMSWrapper:
                     
                     print(f"  Changing user {user_id} email from '{email}' to '{new_email}'")
                     
-                    db.execute_sql(f"UPDATE users SET email = '{new_email}' WHERE id = {user_id}")
+                    db.execute_sql("UPDATE users SET email = ? WHERE id = ?", [new_email, user_id])
             
             cls.save_db()
             print("✓ Fixed duplicate emails")
@@ -228,19 +265,10 @@ class UserManager:
     def filter(self, **kwargs):
         """Filter users by conditions"""
         try:
-            where_parts = []
-            for key, value in kwargs.items():
-                if isinstance(value, str):
-                    where_parts.append(f"{key} = '{value}'")
-                elif value is None:
-                    where_parts.append(f"{key} IS NULL")
-                else:
-                    where_parts.append(f"{key} = {value}")
+            conditions = tuple((key, value is None) for key, value in kwargs.items())
+            params = [value for value in kwargs.values() if value is not None]
             
-            where_clause = " AND ".join(where_parts) if where_parts else "1=1"
-            sql = f"SELECT * FROM users WHERE {where_clause} ORDER BY id"
-            
-            results = self.db.execute_sql(sql)
+            results = self.db.execute_sql(_filter_sql('users', conditions), params)
             users = []
             for row in results:
                 user_data = {}
@@ -365,13 +393,15 @@ class User:
             
             if self.id:
                 
-                check_sql = f"SELECT id FROM users WHERE email = '{self.email}' AND id != {self.id}"
+                existing_sql = "SELECT id FROM users WHERE email = ? AND id != ?"
+                existing_params = [self.email, self.id]
             else:
                 
-                check_sql = f"SELECT id FROM users WHERE email = '{self.email}'"
+                existing_sql = "SELECT id FROM users WHERE email = ?"
+                existing_params = [self.email]
             
             try:
-                existing = db.execute_sql(check_sql)
+                existing = db.execute_sql(existing_sql, existing_params)
                 if existing:
                     raise ValueError(f"Email '{self.email}' is already in use by another user")
             except Exception as check_error:
@@ -389,20 +419,20 @@ class User:
                 
                 set_parts = []
                 if self.name:
-                    set_parts.append(f"name = '{self.name}'")
+                    set_parts.append(('name', self.name))
                 if self.email:
-                    set_parts.append(f"email = '{self.email}'")
+                    set_parts.append(('email', self.email))
                 if self.age is not None:
-                    set_parts.append(f"age = {self.age}")
-                set_parts.append(f"created_at = '{self.created_at}'")
+                    set_parts.append(('age', self.age))
+                set_parts.append(('created_at', self.created_at))
                 
                 if set_parts:
-                    set_clause = ", ".join(set_parts)
-                    sql = f"UPDATE users SET {set_clause} WHERE id = {self.id}"
-                    print(f"DEBUG: UPDATE SQL: {sql}")
+                    sql = _update_by_id_sql('users', tuple(col for col, _ in set_parts))
+                    params = [value for _, value in set_parts] + [self.id]
+                    print(f"DEBUG: UPDATE SQL: {sql} {params}")
                     
                     
-                    result = db.execute_sql(sql)
+                    result = db.execute_sql(sql, params)
                     print(f"DEBUG: UPDATE result: {result}")
                     RDBMSWrapper.save_db()
                     return self
@@ -426,11 +456,11 @@ class User:
         print(f"DEBUG: Attempting INSERT for user")
         try:
             
-            age_value = f"{self.age}" if self.age is not None else "NULL"
-            sql = f"INSERT INTO users (name, email, age, created_at) VALUES ('{self.name}', '{self.email}', {age_value}, '{self.created_at}')"
-            print(f"DEBUG: INSERT SQL: {sql}")
+            sql = "INSERT INTO users (name, email, age, created_at) VALUES (?, ?, ?, ?)"
+            params = [self.name, self.email, self.age, self.created_at]
+            print(f"DEBUG: INSERT SQL: {sql} {params}")
             
-            result = db.execute_sql(sql)
+            result = db.execute_sql(sql, params)
             print(f"DEBUG: INSERT returned: {result}")
             
             
@@ -536,74 +566,68 @@ class User:
         
         try:
             
-            existing_data = db.execute_sql("SELECT * FROM users")
-            print(f"DEBUG: Found {len(existing_data)} users to migrate")
-            
-            
-            try:
-                db.execute_sql("DROP TABLE users_new")
-            except:
-                pass
-            
-            db.execute_sql("""
-                CREATE TABLE users_new (
-                    id INTEGER PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    email TEXT UNIQUE,
-                    age INTEGER,
-                    created_at TEXT DEFAULT '2024-01-01'
-                )
-            """)
-            
-            
-            duplicate_emails = set()
-            migrated_count = 0
-            
-            for i, user in enumerate(existing_data):
-                user_id = user.get('id', user.get('ID', i+1))
-                name = user.get('name', user.get('NAME', f'User {user_id}'))
-                email = user.get('email', user.get('EMAIL', ''))
-                age = user.get('age', user.get('AGE'))
-                created_at = user.get('created_at', user.get('CREATED_AT', '2024-01-01'))
+            # one transaction: if any step fails the original users table is left untouched
+            with db.transaction():
+                existing_data = db.execute_sql("SELECT * FROM users")
+                print(f"DEBUG: Found {len(existing_data)} users to migrate")
                 
                 
-                if not email:
-                    email = f"user{user_id}@example.com"
+                try:
+                    db.execute_sql("DROP TABLE users_new")
+                except:
+                    pass
                 
+                db.execute_sql("""
+                    CREATE TABLE users_new (
+                        id INTEGER PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        email TEXT UNIQUE,
+                        age INTEGER,
+                        created_at TEXT DEFAULT '2024-01-01'
+                    )
+                """)
                 
-                if email and email in duplicate_emails:
-                    
-                    email = f"user{user_id}.dup@example.com"
                 
+                duplicate_emails = set()
+                migrated_count = 0
                 
-                try:
-                    age_value = f"{age}" if age is not None else "NULL"
-                    sql = f"""
-                        INSERT INTO users_new (id, name, email, age, created_at)
-                        VALUES ({user_id}, '{name}', '{email}', {age_value}, '{created_at}')
-                    """
-                    db.execute_sql(sql)
-                    migrated_count += 1
+                for i, user in enumerate(existing_data):
+                    user_id = user.get('id', user.get('ID', i+1))
+                    name = user.get('name', user.get('NAME', f'User {user_id}'))
+                    email = user.get('email', user.get('EMAIL', ''))
+                    age = user.get('age', user.get('AGE'))
+                    created_at = user.get('created_at', user.get('CREATED_AT', '2024-01-01'))
                     
-                    if email:
-                        duplicate_emails.add(email)
-                        
-                except Exception as e:
-                    if "duplicate" in str(e).lower() or "unique" in str(e).lower():
+                    
+                    if not email:
+                        email = f"user{user_id}@example.com"
+                    
+                    
+                    if email and email in duplicate_emails:
                         
-                        email = f"user{user_id}.{i}@example.com"
-                        sql = f"""
-                            INSERT INTO users_new (id, name, email, age, created_at)
-                            VALUES ({user_id}, '{name}', '{email}', {age_value}, '{created_at}')
-                        """
-                        db.execute_sql(sql)
+                        email = f"user{user_id}.dup@example.com"
+                    
+                    
+                    insert_sql = "INSERT INTO users_new (id, name, email, age, created_at) VALUES (?, ?, ?, ?, ?)"
+                    try:
+                        db.execute_sql(insert_sql, [user_id, name, email, age, created_at])
                         migrated_count += 1
-                    else:
-                        print(f"DEBUG: Error migrating user {user_id}: {e}")
-            
-            
-            db.execute_sql("DROP TABLE users")
-            db.execute_sql("ALTER TABLE users_new RENAME TO users")
+                        
+                        if email:
+                            duplicate_emails.add(email)
+                            
+                    except Exception as e:
+                        if "duplicate" in str(e).lower() or "unique" in str(e).lower():
+                            
+                            email = f"user{user_id}.{i}@example.com"
+                            db.execute_sql(insert_sql, [user_id, name, email, age, created_at])
+                            migrated_count += 1
+                        else:
+                            print(f"DEBUG: Error migrating user {user_id}: {e}")
+                
+                
+                db.execute_sql("DROP TABLE users")
+                db.execute_sql("ALTER TABLE users_new RENAME TO users")
             
             print(f"DEBUG: Successfully migrated {migrated_count} users to table with UNIQUE email")
             
@@ -617,7 +641,7 @@ class User:
         if self.id:
             db = RDBMSWrapper.get_db()
             try:
-                db.execute_sql(f"DELETE FROM users WHERE id = {self.id}")
+                db.execute_sql("DELETE FROM users WHERE id = ?", [self.id])
                 RDBMSWrapper.save_db()
                 return True
             except Exception as e:
@@ -667,19 +691,10 @@ class ProductManager:
     def filter(self, **kwargs):
         """Filter products by conditions"""
         try:
-            where_parts = []
-            for key, value in kwargs.items():
-                if isinstance(value, str):
-                    where_parts.append(f"{key} = '{value}'")
-                elif value is None:
-                    where_parts.append(f"{key} IS NULL")
-                else:
-                    where_parts.append(f"{key} = {value}")
+            conditions = tuple((key, value is None) for key, value in kwargs.items())
+            params = [value for value in kwargs.values() if value is not None]
             
-            where_clause = " AND ".join(where_parts) if where_parts else "1=1"
-            sql = f"SELECT * FROM products WHERE {where_clause} ORDER BY id"
-            
-            results = self.db.execute_sql(sql)
+            results = self.db.execute_sql(_filter_sql('products', conditions), params)
             products = []
             for row in results:
                 product_data = {}
@@ -738,19 +753,18 @@ class Product:
                     
                     set_parts = []
                     if self.name:
-                        set_parts.append(f"name = '{self.name}'")
+                        set_parts.append(('name', self.name))
                     if self.price is not None:
-                        set_parts.append(f"price = {self.price}")
+                        set_parts.append(('price', float(self.price)))
                     if self.in_stock is not None:
-                        in_stock_val = 'TRUE' if self.in_stock else 'FALSE'
-                        set_parts.append(f"in_stock = {in_stock_val}")
+                        set_parts.append(('in_stock', bool(self.in_stock)))
                     if self.category:
-                        set_parts.append(f"category = '{self.category}'")
+                        set_parts.append(('category', self.category))
                     
                     if set_parts:
-                        set_clause = ", ".join(set_parts)
-                        sql = f"UPDATE products SET {set_clause} WHERE id = {self.id}"
-                        db.execute_sql(sql)
+                        sql = _update_by_id_sql('products', tuple(col for col, _ in set_parts))
+                        params = [value for _, value in set_parts] + [self.id]
+                        db.execute_sql(sql, params)
                         RDBMSWrapper.save_db()
                 else:
                     
@@ -768,15 +782,12 @@ class Product:
                 new_id = max_id + 1 if max_id else 1
                 
                 
-                in_stock_val = 'TRUE' if self.in_stock else 'FALSE'
+                price = float(self.price) if self.price is not None else None
                 
-                sql = f"""
-                    INSERT INTO products (id, name, price, in_stock, category) 
-                    VALUES ({new_id}, '{self.name}', 
-                            {self.price if self.price is not None else 'NULL'}, 
-                            {in_stock_val}, '{self.category}')
-                """
-                db.execute_sql(sql)
+                db.execute_sql(
+                    "INSERT INTO products (id, name, price, in_stock, category) VALUES (?, ?, ?, ?, ?)",
+                    [new_id, self.name, price, bool(self.in_stock), self.category]
+                )
                 self.id = new_id
                 RDBMSWrapper.save_db()
             except Exception as e:
@@ -790,7 +801,7 @@ class Product:
         if self.id:
             db = RDBMSWrapper.get_db()
             try:
-                db.execute_sql(f"DELETE FROM products WHERE id = {self.id}")
+                db.execute_sql("DELETE FROM products WHERE id = ?", [self.id])
                 RDBMSWrapper.save_db()
                 return True
             except Exception as e:
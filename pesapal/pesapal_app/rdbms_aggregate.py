@@ -0,0 +1,238 @@
+# @Felix 2026
+
+"""
+Aggregate queries: COUNT, SUM, AVG, MIN and MAX with GROUP BY and HAVING.
+
+The SELECT list is parsed once into SelectItems. When the query runs, the
+matching rows are aggregated in a single pass into a hash table keyed by the
+GROUP BY values, holding one accumulator per aggregate for each group; HAVING
+and ORDER BY then work on the finished groups.
+
+Aggregates skip NULLs (COUNT(*) counts rows), and any of them may take
+DISTINCT. Over no rows, COUNT is 0 and the others are NULL. HAVING and
+ORDER BY may refer to aggregate calls, output aliases and GROUP BY columns.
+"""
+
+import operator
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .rdbms_where import coerce_for
+
+
+AGGREGATE_FUNCTIONS = ('COUNT', 'SUM', 'AVG', 'MIN', 'MAX')
+
+# FUNC([DISTINCT] column) or COUNT(*)
+_CALL_RE = re.compile(r"\b(COUNT|SUM|AVG|MIN|MAX)\s*\(\s*(DISTINCT\s+)?(\*|\w+)\s*\)", re.IGNORECASE)
+
+_ITEM_RE = re.compile(r"^(.*?)(?:\s+AS\s+(\w+))?$", re.IGNORECASE)
+
+_COLUMN_RE = re.compile(r"^\w+$")
+
+
+def call_key(function: str, column: Optional[str], distinct: bool = False) -> str:
+    """Canonical name of an aggregate call, e.g. count(distinct email)"""
+    argument = '*' if column is None else column
+    return f"{function}({'distinct ' if distinct else ''}{argument})".lower()
+
+
+def has_aggregates(select_list: str) -> bool:
+    return _CALL_RE.search(select_list) is not None
+
+
+def parse_call(text: str) -> Optional[Tuple[str, Optional[str], bool]]:
+    """(function, column or None for *, distinct) if text is a single aggregate call"""
+    match = _CALL_RE.fullmatch(text.strip())
+    if not match:
+        return None
+    function, distinct, argument = match.groups()
+    function = function.upper()
+    column = None if argument == '*' else argument
+    if column is None and (function != 'COUNT' or distinct):
+        raise ValueError(f"{function}(*) is not supported; give a column")
+    return function, column, bool(distinct)
+
+
+class SelectItem:
+    """One SELECT list entry: a plain column or an aggregate call, and its output name"""
+    __slots__ = ('name', 'function', 'column', 'distinct')
+
+    def __init__(self, name: str, function: Optional[str], column: Optional[str], distinct: bool = False):
+        self.name = name
+        self.function = function
+        self.column = column
+        self.distinct = distinct
+
+
+def parse_select_list(text: str) -> List[SelectItem]:
+    """'email, COUNT(*) AS count' -> SelectItems"""
+    items = []
+    for part in text.split(','):
+        match = _ITEM_RE.match(part.strip())
+        expression, alias = match.group(1).strip(), match.group(2)
+        call = parse_call(expression)
+        if call is not None:
+            items.append(SelectItem(alias or expression, *call))
+        elif _COLUMN_RE.match(expression):
+            items.append(SelectItem(alias or expression, None, expression))
+        else:
+            raise ValueError(f"Unsupported expression in SELECT list: {expression}")
+    return items
+
+
+def rewrite_calls(clause: str) -> Tuple[str, List[Tuple[str, Optional[str], bool]]]:
+    """Replace each aggregate call in a HAVING clause by a quoted reference to its canonical
+    name, so the WHERE parser can read it. Returns the clause and the calls found"""
+    calls = []
+
+    def replace(match):
+        call = parse_call(match.group(0))
+        calls.append(call)
+        return f'"{call_key(*call)}"'
+
+    return _CALL_RE.sub(replace, clause), calls
+
+
+# -- accumulators -----------------------------------------------------------
+#
+# One per aggregate per group: add() takes each row's value, result() gives
+# the aggregate once every row has been seen.
+
+def _number(value: Any) -> Any:
+    if type(value) is int or type(value) is float:
+        return value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    raise ValueError(f"Cannot aggregate non-numeric value {value!r}")
+
+
+class _Count:
+    __slots__ = ('count',)
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, value: Any):
+        if value is not None:
+            self.count += 1
+
+    def result(self) -> int:
+        return self.count
+
+
+class _Sum:
+    __slots__ = ('total',)
+
+    def __init__(self):
+        self.total = None
+
+    def add(self, value: Any):
+        if value is not None:
+            value = _number(value)
+            self.total = value if self.total is None else self.total + value
+
+    def result(self) -> Any:
+        return self.total
+
+
+class _Avg:
+    __slots__ = ('total', 'count')
+
+    def __init__(self):
+        self.total = 0
+        self.count = 0
+
+    def add(self, value: Any):
+        if value is not None:
+            self.total += _number(value)
+            self.count += 1
+
+    def result(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class _Extreme:
+    """MIN or MAX: values are compared as their column type, the stored value is returned"""
+    __slots__ = ('best', 'best_key', 'key', 'better')
+
+    def __init__(self, key: Callable[[Any], Any], better: Callable[[Any, Any], bool]):
+        self.best = None
+        self.best_key = None
+        self.key = key
+        self.better = better
+
+    def add(self, value: Any):
+        if value is not None:
+            key = self.key(value)
+            if self.best is None or self.better(key, self.best_key):
+                self.best = value
+                self.best_key = key
+
+    def result(self) -> Any:
+        return self.best
+
+
+class _Distinct:
+    """Feeds each distinct non-NULL value to the wrapped accumulator once"""
+    __slots__ = ('seen', 'inner')
+
+    def __init__(self, inner: Any):
+        self.seen = set()
+        self.inner = inner
+
+    def add(self, value: Any):
+        if value is not None and value not in self.seen:
+            self.seen.add(value)
+            self.inner.add(value)
+
+    def result(self) -> Any:
+        return self.inner.result()
+
+
+def accumulator_factory(function: str, distinct: bool, data_type: Optional[str]) -> Callable[[], Any]:
+    """A callable making fresh accumulators for one aggregate call"""
+    if function in ('MIN', 'MAX'):
+        key = coerce_for(data_type)
+        better = operator.lt if function == 'MIN' else operator.gt
+        make = lambda: _Extreme(key, better)
+    else:
+        make = {'COUNT': _Count, 'SUM': _Sum, 'AVG': _Avg}[function]
+    if distinct:
+        return lambda: _Distinct(make())
+    return make
+
+
+def result_type(function: str, data_type: Optional[str]) -> Optional[str]:
+    """The data type an aggregate's result is compared and sorted as"""
+    if function == 'COUNT':
+        return 'INTEGER'
+    if function == 'AVG':
+        return 'REAL'
+    if function == 'SUM':
+        return 'INTEGER' if data_type == 'INTEGER' else 'REAL'
+    return data_type
+
+
+def hash_aggregate(rows: Iterable[Any], group_key: Optional[Callable[[Any], Any]],
+                   getters: List[Callable[[Any], Any]], factories: List[Callable[[], Any]]) -> Dict[Any, List[Any]]:
+    """Aggregate rows in one pass: group key -> accumulators (one per getter/factory pair).
+
+    Without a group_key every row lands in the single group ().
+    """
+    groups: Dict[Any, List[Any]] = {}
+    for row in rows:
+        key = () if group_key is None else group_key(row)
+        accumulators = groups.get(key)
+        if accumulators is None:
+            accumulators = groups[key] = [make() for make in factories]
+        for accumulator, get in zip(accumulators, getters):
+            accumulator.add(get(row))
+    return groups
@@ -0,0 +1,138 @@
+# @Felix 2026
+
+"""
+Result cache for read-only statements.
+
+Entries are keyed by a statement's normalized SQL and parameters, and tagged
+with the write versions of the tables it read (Database bumps a table's
+version each time a write to it commits). A lookup whose versions no longer
+match is a miss, and bumping a table drops its entries straight away, so a
+cached result is never older than the data it was computed from.
+
+The cache is an LRU bounded by an estimate of the bytes its results hold;
+results larger than a quarter of that bound are not kept. Rows are copied
+in and out, so callers may modify what they get back.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+
+def params_key(params: Any) -> Optional[Hashable]:
+    """A hashable form of statement parameters, or None if they cannot be keyed"""
+    if params is None:
+        return ()
+    if isinstance(params, dict):
+        key = tuple(sorted(params.items()))
+    else:
+        key = tuple(params)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def estimate_size(rows: List[Dict[str, Any]]) -> int:
+    """Approximate bytes held by a list of row dicts (values are shared with the keys' strings)"""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in row.values():
+            size += sys.getsizeof(value)
+    return size
+
+
+class ResultCache:
+    """Thread-safe LRU of statement results, bounded by estimated size"""
+
+    def __init__(self, max_bytes: int):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        # key -> (versions, tables, rows, size)
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple, Tuple[str, ...], List[Dict], int]]" = OrderedDict()
+        self._by_table: Dict[str, Set[Tuple]] = {}
+
+    def get(self, key: Tuple, versions: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """A copy of the cached rows if present and computed at these versions, else None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != versions:
+                self._remove(key)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            rows = entry[2]
+        return [dict(row) for row in rows]
+
+    def put(self, key: Tuple, versions: Tuple, tables: Tuple[str, ...], rows: List[Dict[str, Any]]):
+        """Keep a copy of rows, computed when the tables read were at versions"""
+        size = estimate_size(rows)
+        if size > self.max_bytes // 4:
+            return
+        rows = [dict(row) for row in rows]
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (versions, tables, rows, size)
+            self.bytes += size
+            for name in tables:
+                self._by_table.setdefault(name, set()).add(key)
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, table_name: str):
+        """Drop every entry that read table_name"""
+        with self._lock:
+            keys = self._by_table.pop(table_name, None)
+            if keys:
+                for key in list(keys):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self.bytes = 0
+
+    def _remove(self, key: Tuple):
+        _, tables, _, size = self._entries.pop(key)
+        self.bytes -= size
+        for name in tables:
+            keys = self._by_table.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[name]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'invalidations': self.invalidations,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,214 @@
+# @Felix 2026
+
+"""
+Streaming readers for COPY ... FROM.
+
+CSV and JSON Lines files are read one chunk of rows at a time, so the memory a
+load needs beyond the table itself depends on the chunk size, not the file
+size. Each value is converted to its column's type as it is read:
+
+    INTEGER     ints, integral floats and numeric strings ('42', '42.0')
+    REAL        any number or numeric string
+    BOOLEAN     true/false, TRUE/FALSE, 1/0
+    TEXT, DATE  strings (other JSON values are turned into text)
+
+An empty field loads as NULL except in TEXT columns. A value that cannot be
+converted is reported with its file line number.
+"""
+
+import csv
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+FORMATS = ('csv', 'jsonl')
+
+_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+
+def detect_format(path: str) -> str:
+    """csv or jsonl, from the file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(f"Cannot tell the format of {path}; give FORMAT csv or FORMAT jsonl")
+    return _EXTENSIONS[extension]
+
+
+def _parse_integer(value: Any) -> int:
+    if type(value) is int:
+        return value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            return int(value)
+        except ValueError:
+            value = float(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    raise ValueError(value)
+
+
+def _parse_real(value: Any) -> float:
+    if isinstance(value, bool):
+        raise ValueError(value)
+    return float(value)
+
+
+_BOOLEAN_TEXT = {'TRUE': True, 'FALSE': False, '1': True, '0': False}
+
+
+def _parse_boolean(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        parsed = _BOOLEAN_TEXT.get(value.strip().upper())
+        if parsed is not None:
+            return parsed
+    elif isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    raise ValueError(value)
+
+
+def _parse_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+_PARSERS = {
+    'INTEGER': _parse_integer,
+    'REAL': _parse_real,
+    'BOOLEAN': _parse_boolean,
+    'TEXT': _parse_text,
+    'DATE': _parse_text,
+}
+
+
+def value_parser(data_type: str) -> Callable[[Any], Any]:
+    """Converter from a file value to data_type; None and (outside TEXT) '' become NULL"""
+    parse = _PARSERS.get(data_type, _parse_text)
+    if data_type == 'TEXT':
+        return lambda value: value if value is None or type(value) is str else parse(value)
+
+    def convert(value: Any) -> Any:
+        if value is None or value == '':
+            return None
+        return parse(value)
+
+    return convert
+
+
+class CopyReader:
+    """Reads the rows of one CSV or JSON Lines file for a table, converted to its column types.
+
+    columns maps each column name to its data type. names restricts the load to
+    those columns (for CSV without a header, it gives the field order; the
+    default is every column in table order). File column names match table
+    columns case-insensitively.
+    """
+
+    def __init__(self, path: str, columns: Dict[str, str], fmt: Optional[str] = None,
+                 names: Optional[List[str]] = None, header: bool = True, delimiter: str = ','):
+        self.path = path
+        self.format = (fmt or detect_format(path)).lower()
+        if self.format not in FORMATS:
+            raise ValueError(f"Unsupported COPY format: {fmt}. Use CSV or JSONL")
+        if not os.path.isfile(path):
+            raise ValueError(f"File not found: {path}")
+        if len(delimiter) != 1:
+            raise ValueError("DELIMITER must be a single character")
+
+        self.header = header
+        self.delimiter = delimiter
+        self.types = dict(columns)
+        self.parsers = {name: value_parser(data_type) for name, data_type in columns.items()}
+        self._by_lower = {name.lower(): name for name in columns}
+        self.names = [self._resolve(name) for name in names] if names else None
+        self.lines = 0
+
+    def _resolve(self, name: str) -> str:
+        column = self._by_lower.get(name.strip().lower())
+        if column is None:
+            raise ValueError(f"{self.path}: unknown column '{name.strip()}'")
+        return column
+
+    def _bad_value(self, name: str, value: Any) -> ValueError:
+        return ValueError(f"{self.path} line {self.lines}: invalid value {value!r} for column {name}")
+
+    def chunks(self, size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Lists of at most size rows (dicts keyed by column name), in file order"""
+        rows = self._csv_rows() if self.format == 'csv' else self._jsonl_rows()
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _csv_rows(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f, delimiter=self.delimiter)
+            names = self.names
+            if self.header:
+                header = next(reader, None)
+                if header is None:
+                    return
+                if names is None:
+                    names = [self._resolve(name) for name in header]
+            if names is None:
+                names = list(self.parsers)
+            if len(set(names)) != len(names):
+                raise ValueError(f"{self.path}: a column is listed more than once")
+
+            # CSV fields are always strings, so TEXT columns take them as they are
+            converted = [(name, self.parsers[name]) for name in names if self.types[name] != 'TEXT']
+            width = len(names)
+            for values in reader:
+                if not values:
+                    continue
+                if len(values) != width:
+                    self.lines = reader.line_num
+                    raise ValueError(f"{self.path} line {self.lines}: expected {width} fields, found {len(values)}")
+                row = dict(zip(names, values))
+                for name, parse in converted:
+                    try:
+                        row[name] = parse(row[name])
+                    except (TypeError, ValueError):
+                        self.lines = reader.line_num
+                        raise self._bad_value(name, row[name]) from None
+                yield row
+            self.lines = reader.line_num
+
+    def _jsonl_rows(self) -> Iterator[Dict[str, Any]]:
+        wanted = set(self.names) if self.names else None
+        with open(self.path, encoding='utf-8') as f:
+            for self.lines, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{self.path} line {self.lines}: invalid JSON ({e})") from None
+                if not isinstance(record, dict):
+                    raise ValueError(f"{self.path} line {self.lines}: expected a JSON object")
+
+                row = {}
+                for key, value in record.items():
+                    name = self._by_lower.get(key.lower())
+                    if wanted is not None and name not in wanted:
+                        continue
+                    if name is None:
+                        raise ValueError(f"{self.path} line {self.lines}: unknown column '{key}'")
+                    try:
+                        row[name] = self.parsers[name](value)
+                    except (TypeError, ValueError):
+                        raise self._bad_value(name, value) from None
+                yield row
@@ -1,10 +1,46 @@
 # @Felix 2026
 
+import bisect
+import heapq
 import json
+import os
 import re
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+import time
+from array import array
+from operator import itemgetter
+from typing import Dict, List, Any, Optional, Tuple, Callable, Union, Iterator, Iterable
+from contextlib import contextmanager
 from datetime import datetime
 from collections import defaultdict
+from itertools import islice
+
+from .rdbms_aggregate import (
+    SelectItem, accumulator_factory, call_key, has_aggregates, hash_aggregate, parse_call, parse_select_list,
+    result_type, rewrite_calls,
+)
+from . import rdbms_stats, rdbms_vector
+from .rdbms_cache import ResultCache, params_key
+from .rdbms_explain import PlanNode, Trace, counted, untraced
+from .rdbms_locks import LockManager
+from .rdbms_metrics import IO_BUCKETS, MetricsRegistry
+from .rdbms_pager import PagedFile, PagedWriter, is_paged_file
+from .rdbms_wal import WriteAheadLog, CommitScheduler
+from .rdbms_where import (
+    Node, Param, compile_expression, compile_where, parse_where, has_params, bind_params, lookup_param,
+    split_conjuncts, conjoin, equality_terms, range_terms, coerce_for, format_expression, Literal,
+)
+
+
+# one parenthesised tuple of a VALUES list, and the comma (or end of text) after it
+_VALUES_TUPLE_RE = re.compile(r"\s*\(((?:'[^']*'|[^'()])*)\)\s*(,|$)")
+
+# one value inside a tuple: quoted strings may contain commas
+_VALUE_RE = re.compile(r"(?:'[^']*'|[^',])+")
+
+# one ORDER BY term: column (or aggregate call) [ASC|DESC] [NULLS FIRST|LAST]
+_ORDER_TERM_RE = re.compile(r"^(\w+|\w+\s*\([^()]*\))(?:\s+(ASC|DESC))?(?:\s+NULLS\s+(FIRST|LAST))?$",
+                            re.IGNORECASE)
 
 
 class DataType:
@@ -15,294 +51,2540 @@ class DataType:
     BOOLEAN = "BOOLEAN"
     DATE = "DATE"
     
+    # value types validate() accepts for each data type without inspecting the value
+    EXACT_TYPES = {
+        INTEGER: (int,),
+        TEXT: (str,),
+        REAL: (int, float),
+        BOOLEAN: (bool,),
+        DATE: (str,),
+    }
+    
     @staticmethod
     def validate(data_type: str, value: Any) -> bool:
-        print(f"DEBUG DataType.validate: Checking type '{data_type}' for value '{value}' (type: {type(value)})")
-        
         if value is None:
-            print(f"DEBUG DataType.validate: Value is None, returning True")
             return True
         
         
         if data_type == DataType.INTEGER:
             
             if isinstance(value, int):
-                print(f"DEBUG DataType.validate: INTEGER - value is int: True")
                 return True
             elif isinstance(value, str):
                 
                 if value.isdigit():
-                    print(f"DEBUG DataType.validate: INTEGER - string is digits: True")
                     return True
                 
                 if value.startswith('-') and value[1:].isdigit():
-                    print(f"DEBUG DataType.validate: INTEGER - string is negative digits: True")
                     return True
                 
                 try:
                     int(value)
-                    print(f"DEBUG DataType.validate: INTEGER - string can be converted to int: True")
                     return True
                 except ValueError:
-                    print(f"DEBUG DataType.validate: INTEGER - string cannot be converted to int: False")
                     return False
             elif isinstance(value, float) and value.is_integer():
-                print(f"DEBUG DataType.validate: INTEGER - value is float but integer: True")
                 return True
-            print(f"DEBUG DataType.validate: INTEGER - all checks failed: False")
             return False
         
         elif data_type == DataType.TEXT:
-            result = isinstance(value, str)
-            print(f"DEBUG DataType.validate: TEXT - is string: {result}")
-            return result
+            return isinstance(value, str)
         elif data_type == DataType.REAL:
-            result = isinstance(value, (int, float)) or (isinstance(value, str) and value.replace('.', '', 1).isdigit())
-            print(f"DEBUG DataType.validate: REAL - is numeric: {result}")
-            return result
+            return isinstance(value, (int, float)) or (isinstance(value, str) and value.replace('.', '', 1).isdigit())
         elif data_type == DataType.BOOLEAN:
-            result = isinstance(value, bool) or value in (0, 1, '0', '1', True, False, 'TRUE', 'FALSE', 'true', 'false')
-            print(f"DEBUG DataType.validate: BOOLEAN - is boolean: {result}")
-            return result
+            return isinstance(value, bool) or value in (0, 1, '0', '1', True, False, 'TRUE', 'FALSE', 'true', 'false')
         elif data_type == DataType.DATE:
-            result = isinstance(value, str)
-            print(f"DEBUG DataType.validate: DATE - is string: {result}")
-            return result
+            return isinstance(value, str)
+        
+        return False
+
+class Index:
+    """Hash index: value -> set of row ids"""
+    kind = "HASH"
+    
+    def __init__(self, column_name: str, data_type: Optional[str] = None):
+        self.column_name = column_name
+        self.data_type = data_type
+        self.index = defaultdict(set)
+        
+        self._key = coerce_for(data_type)
+    
+    def add(self, value: Any, row_id: int):
+        self.index[self._key(value)].add(row_id)
+    
+    def remove(self, value: Any, row_id: int):
+        key = self._key(value)
+        postings = self.index.get(key)
+        if postings and row_id in postings:
+            postings.discard(row_id)
+            if not postings:
+                del self.index[key]
+    
+    def get(self, value: Any) -> Iterable[int]:
+        return self.index.get(self._key(value), ())
+    
+    def add_many(self, pairs: Iterable[Tuple[Any, int]]):
+        """Add (value, row id) pairs, e.g. a bulk insert or the rows a transaction inserted with indexing deferred"""
+        index = self.index
+        key = self._key
+        for value, row_id in pairs:
+            index[key(value)].add(row_id)
+    
+    def size(self) -> int:
+        """Number of row ids held across all keys"""
+        return sum(len(postings) for postings in self.index.values())
+    
+    def export_state(self) -> Dict[str, Any]:
+        """Picklable contents, for persisting the index with its table"""
+        return {'column': self.column_name, 'kind': self.kind, 'postings': dict(self.index)}
+    
+    def import_state(self, state: Dict[str, Any]):
+        self.index.clear()
+        self.index.update(state['postings'])
+    
+    def is_consistent(self, row_count: int) -> bool:
+        """Cheap structural check that the index covers exactly row_count rows"""
+        return self.size() == row_count
+
+
+class OrderedIndex(Index):
+    """Sorted-array index: sorted row-id arrays per key plus the distinct keys kept in sorted order.
+    
+    Equality probes stay O(1) through the postings dict, range scans bisect the
+    key array, and ordered iteration walks it without sorting the table.
+    """
+    kind = "BTREE"
+    
+    def __init__(self, column_name: str, data_type: Optional[str] = None):
+        super().__init__(column_name, data_type)
+        self.keys: List[Any] = []
+        
+        self.stray_keys: List[Any] = []
+    
+    def add(self, value: Any, row_id: int):
+        key = self._key(value)
+        postings = self.index.get(key)
+        if postings is None:
+            self.index[key] = array('q', (row_id,))
+            if key is not None:
+                self._insert_key(key)
+        elif row_id > postings[-1]:
+            postings.append(row_id)
+        else:
+            bisect.insort(postings, row_id)
+    
+    def remove(self, value: Any, row_id: int):
+        key = self._key(value)
+        postings = self.index.get(key)
+        if not postings:
+            return
+        i = bisect.bisect_left(postings, row_id)
+        if i < len(postings) and postings[i] == row_id:
+            del postings[i]
+            if not postings:
+                del self.index[key]
+                if key is not None:
+                    self._remove_key(key)
+    
+    def add_many(self, pairs: Iterable[Tuple[Any, int]]):
+        """Bulk add: new distinct keys are merged into the key array with one sort, not one insort each"""
+        index = self.index
+        new_keys = []
+        for value, row_id in pairs:
+            key = self._key(value)
+            postings = index.get(key)
+            if postings is None:
+                index[key] = array('q', (row_id,))
+                if key is not None:
+                    new_keys.append(key)
+            elif row_id > postings[-1]:
+                postings.append(row_id)
+            else:
+                bisect.insort(postings, row_id)
+        
+        if not new_keys:
+            return
+        try:
+            self.keys = sorted(self.keys + new_keys)
+        except TypeError:
+            for key in new_keys:
+                self._insert_key(key)
+    
+    def export_state(self) -> Dict[str, Any]:
+        state = super().export_state()
+        state['keys'] = self.keys
+        state['stray_keys'] = self.stray_keys
+        return state
+    
+    def import_state(self, state: Dict[str, Any]):
+        super().import_state(state)
+        self.keys = list(state['keys'])
+        self.stray_keys = list(state['stray_keys'])
+    
+    def is_consistent(self, row_count: int) -> bool:
+        distinct = len(self.keys) + len(self.stray_keys) + (None in self.index)
+        return distinct == len(self.index) and super().is_consistent(row_count)
+    
+    def _insert_key(self, key: Any):
+        try:
+            bisect.insort(self.keys, key)
+        except TypeError:
+            # e.g. a non-numeric string stored in an INTEGER column; kept out of the sorted array
+            self.stray_keys.append(key)
+    
+    def _remove_key(self, key: Any):
+        try:
+            i = bisect.bisect_left(self.keys, key)
+            if i < len(self.keys) and self.keys[i] == key:
+                del self.keys[i]
+                return
+        except TypeError:
+            pass
+        if key in self.stray_keys:
+            self.stray_keys.remove(key)
+    
+    def range(self, low: Any = None, high: Any = None, low_inclusive: bool = True,
+              high_inclusive: bool = True, descending: bool = False) -> Iterator[int]:
+        """Row ids whose key lies between low and high (None means unbounded), in key order"""
+        keys = self.keys
+        if low is None:
+            start = 0
+        elif low_inclusive:
+            start = bisect.bisect_left(keys, low)
+        else:
+            start = bisect.bisect_right(keys, low)
+        if high is None:
+            stop = len(keys)
+        elif high_inclusive:
+            stop = bisect.bisect_right(keys, high)
+        else:
+            stop = bisect.bisect_left(keys, high)
+        
+        index = self.index
+        positions = range(stop - 1, start - 1, -1) if descending else range(start, stop)
+        for i in positions:
+            yield from index[keys[i]]
+    
+    def ordered(self, descending: bool = False, nulls_first: bool = True) -> Iterator[int]:
+        """Row ids in key order; NULLs first (or last) and incomparable keys last, ties in row order"""
+        index = self.index
+        if nulls_first:
+            yield from index.get(None, ())
+        keys = reversed(self.keys) if descending else self.keys
+        for key in keys:
+            yield from index[key]
+        for key in self.stray_keys:
+            yield from index[key]
+        if not nulls_first:
+            yield from index.get(None, ())
+
+
+ORDERED_TYPES = (DataType.INTEGER, DataType.REAL, DataType.DATE)
+
+
+def make_index(column_name: str, data_type: Optional[str], method: Optional[str] = None) -> Index:
+    """Build an index for a column: BTREE/HASH when requested, ordered by default for INTEGER/REAL/DATE"""
+    if method is None:
+        method = "BTREE" if data_type in ORDERED_TYPES else "HASH"
+    method = method.upper()
+    if method == "BTREE":
+        return OrderedIndex(column_name, data_type)
+    if method == "HASH":
+        return Index(column_name, data_type)
+    raise ValueError(f"Unsupported index method: {method}. Use BTREE or HASH")
+
+
+class AccessPath:
+    """How a WHERE clause reaches its rows: an index probe, an index range scan, or a full scan.
+    
+    rows (rows the path reads) and cost are the planner's estimates when the table has statistics;
+    residual is the tree predicate was compiled from.
+    """
+    __slots__ = ('index_column', 'keys', 'bounds', 'predicate', 'rows', 'cost', 'residual')
+    
+    def __init__(self, index_column: Optional[str], keys: Optional[List[Any]],
+                 predicate: Optional[Callable[[Dict], Any]], bounds: Optional[Tuple] = None,
+                 rows: Optional[float] = None, cost: Optional[float] = None, residual: Optional[Node] = None):
+        self.index_column = index_column
+        self.keys = keys
+        self.bounds = bounds
+        self.predicate = predicate
+        self.rows = rows
+        self.cost = cost
+        self.residual = residual
+    
+    @property
+    def is_scan(self) -> bool:
+        return self.index_column is None
+
+
+class SortKey:
+    """One ORDER BY term. NULLs sort first in either direction unless NULLS LAST is given"""
+    __slots__ = ('column', 'descending', 'nulls_first')
+    
+    def __init__(self, column: str, descending: bool = False, nulls_first: bool = True):
+        self.column = column
+        self.descending = descending
+        self.nulls_first = nulls_first
+    
+    def __str__(self):
+        return self.column + (' DESC' if self.descending else '') + ('' if self.nulls_first else ' NULLS LAST')
+
+
+def parse_order_by(order_by: str) -> List[SortKey]:
+    """'a DESC, b NULLS LAST' -> SortKeys"""
+    keys = []
+    for term in order_by.split(','):
+        match = _ORDER_TERM_RE.match(term.strip())
+        if not match:
+            raise ValueError(f"Invalid ORDER BY term: {term.strip()}")
+        column, direction, nulls = match.groups()
+        descending = bool(direction) and direction.upper() == 'DESC'
+        keys.append(SortKey(column, descending, nulls is None or nulls.upper() == 'FIRST'))
+    return keys
+
+
+class _Descending:
+    """Sort key that compares in reverse, for DESC terms sorted alongside ASC ones"""
+    __slots__ = ('key',)
+    
+    def __init__(self, key: Any):
+        self.key = key
+    
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.key < self.key
+    
+    def __eq__(self, other: '_Descending') -> bool:
+        return self.key == other.key
+
+
+class Column:
+    def __init__(self, name: str, data_type: str, 
+                 is_primary: bool = False, is_unique: bool = False, 
+                 nullable: bool = True):
+        self.name = name
+        self.data_type = data_type
+        self.is_primary = is_primary
+        self.is_unique = is_unique
+        self.nullable = nullable
+
+
+class RowView:
+    """Read-only mapping over one stored row; to_dict() materialises it at the API boundary"""
+    __slots__ = ('positions', 'values', 'row_id')
+    
+    def __init__(self, positions: Dict[str, int], values: Tuple, row_id: Optional[int] = None):
+        self.positions = positions
+        self.values = values
+        self.row_id = row_id
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        pos = self.positions.get(name)
+        if pos is None:
+            return self.row_id if name == '_id' else default
+        return self.values[pos]
+    
+    def __getitem__(self, name: str) -> Any:
+        pos = self.positions.get(name)
+        if pos is None:
+            if name == '_id':
+                return self.row_id
+            raise KeyError(name)
+        return self.values[pos]
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.positions
+    
+    def __iter__(self):
+        return iter(self.positions)
+    
+    def __len__(self):
+        return len(self.positions)
+    
+    def keys(self):
+        return self.positions.keys()
+    
+    def items(self):
+        return zip(self.positions, self.values)
+    
+    def to_dict(self, columns: Optional[List[str]] = None) -> Dict:
+        """All stored columns plus '_id', or exactly the given columns"""
+        if columns is not None:
+            return {name: self.get(name) for name in columns}
+        row = dict(zip(self.positions, self.values))
+        row['_id'] = self.row_id
+        return row
+    
+    def __repr__(self):
+        return f"RowView({self.to_dict()!r})"
+
+
+class Snapshot:
+    """A reader's view of one table: the committed version it reads, and the table's lock"""
+    __slots__ = ('version', 'latch')
+    
+    def __init__(self, version: int, latch: Any):
+        self.version = version
+        self.latch = latch
+
+
+class Table:
+    """Row-store table: one tuple per row in self.rows, in schema order (None once deleted).
+    
+    Storage access goes through the small set of _storage hooks at the bottom of
+    the class so other layouts (see ColumnarTable) can reuse the query logic.
+    """
+    storage = "ROW"
+    
+    
+    VACUUM_THRESHOLD = 0.3
+    VACUUM_MIN_ROWS = 256
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.columns: List[Column] = []
+        
+        self.positions: Dict[str, int] = {}
+        self._init_storage()
+        self.row_count = 0
+        self.indexes: Dict[str, Index] = {}
+        self.unique_values: Dict[str, set] = {}
+        
+        self.unique_constraints: Dict[str, set] = {}
+        
+        self._where_cache: Dict[str, Callable] = {}
+        self._plan_cache: Dict[str, AccessPath] = {}
+        
+        # column statistics, from the first ANALYZE on; kept up to date by the row primitives
+        self.stats: Optional[rdbms_stats.TableStats] = None
+        
+        # the owning Database's metrics registry while it collects metrics; counts each access
+        self.metrics: Optional[MetricsRegistry] = None
+        
+        # row changes are appended here as WAL ops while the owning Database logs them
+        self.journal: Optional[List[List[Any]]] = None
+        
+        # MVCC: committed version, open snapshots (version -> count) and prior row images
+        self.version = 0
+        self.versions: Dict[int, List[Tuple[int, Optional[Tuple]]]] = {}
+        self._snapshots: Dict[int, int] = {}
+        self._snapshot_lock = threading.Lock()
+        self._reader = threading.local()
+        self._pruned_below = 0
+        
+        # set while a transaction writes the table: its undo log, and inserts left unindexed until needed
+        self.undo: Optional[List[Tuple]] = None
+        self.defer_indexes = False
+        self._unindexed: List[int] = []
+    
+    # storage state a deferred table leaves unset until its first use
+    DEFERRED_ATTRS = ('rows', 'vectors', 'live', 'next_rowid', '_rowids', 'indexes', 'unique_values')
+    
+    # one table faults in at a time, so concurrent readers never see a half-loaded table
+    _fault_lock = threading.Lock()
+    
+    def defer(self, loader: Callable[['Table'], None]):
+        """Drop the in-memory storage; the first access to it calls loader(self) to fill it in"""
+        self._deferred = {attr: self.__dict__.pop(attr) for attr in self.DEFERRED_ATTRS if attr in self.__dict__}
+        self._loader = loader
+    
+    @property
+    def is_loaded(self) -> bool:
+        return '_loader' not in self.__dict__ and '_loading' not in self.__dict__
+    
+    def ensure_loaded(self):
+        """Fault a deferred table's storage in now (waits if another thread is already doing it)"""
+        if self.is_loaded:
+            return
+        with Table._fault_lock:
+            loader = self.__dict__.pop('_loader', None)
+            if loader is None:
+                return
+            self._loading = True
+            self.__dict__.update(self.__dict__.pop('_deferred'))
+            try:
+                loader(self)
+            except Exception:
+                self.defer(loader)
+                raise
+            finally:
+                del self._loading
+    
+    def __getattr__(self, name: str) -> Any:
+        # only reached for attributes that are not set, i.e. the storage of a deferred table
+        if '_loader' not in self.__dict__:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        self.ensure_loaded()
+        return getattr(self, name)
+    
+    def add_column(self, column: Column):
+        # a deferred table's stored rows have the old width; load them before it changes
+        self.ensure_loaded()
+        if column.is_primary or column.is_unique:
+            self.unique_values[column.name] = set()
+            self.indexes[column.name] = make_index(column.name, column.data_type)
+        self.positions[column.name] = len(self.columns)
+        self.columns.append(column)
+        self._add_column_storage(column)
+        if self.stats is not None:
+            self.stats.add_column(column.name, column.data_type, self.row_count)
+        self._where_cache.clear()
+        self._plan_cache.clear()
+    
+    def insert(self, values: Dict[str, Any]) -> int:
+        return self.insert_many([values])[0]
+    
+    def insert_many(self, rows: Iterable[Dict[str, Any]]) -> List[int]:
+        """Validate a batch of rows as a whole, then store and index them in bulk.
+        
+        UNIQUE and PRIMARY KEY values are checked against the table and the rest of
+        the batch in the same pass; if any row is rejected, none are stored.
+        """
+        columns = self.columns
+        validate = DataType.validate
+        checks = [(col, col.name, col.data_type, col.nullable, DataType.EXACT_TYPES.get(col.data_type, ()))
+                  for col in columns]
+        unique = [(col.name, self.unique_values.get(col.name, set()), set())
+                  for col in columns if col.is_unique or col.is_primary]
+        auto = next((col for col in columns if col.is_primary and col.data_type == DataType.INTEGER), None)
+        next_key = None
+        
+        batch = []
+        for values in rows:
+            row_data = {}
+            for col, name, data_type, nullable, exact_types in checks:
+                if name in values:
+                    value = values[name]
+                    if value is None:
+                        if not nullable:
+                            raise ValueError(f"{name} cannot be null")
+                    elif type(value) not in exact_types and not validate(data_type, value):
+                        raise ValueError(f"Invalid type for {name}")
+                    row_data[name] = value
+                    if col is auto and next_key is not None and isinstance(value, int) and value >= next_key:
+                        next_key = value + 1
+                elif col is auto:
+                    if next_key is None:
+                        next_key = self._next_key(col)
+                        # keys given explicitly earlier in the batch are not indexed yet
+                        for earlier in batch:
+                            key = earlier[name]
+                            if isinstance(key, int) and key >= next_key:
+                                next_key = key + 1
+                    row_data[name] = next_key
+                    next_key += 1
+                else:
+                    row_data[name] = None
+            
+            for name, stored, seen in unique:
+                value = row_data[name]
+                if value is not None:
+                    if value in stored or value in seen:
+                        raise ValueError(f"Duplicate value '{value}' for {name}")
+                    seen.add(value)
+            batch.append(row_data)
+        
+        if self.metrics is not None:
+            self.metrics.inc('pesapal_rows_written_total', (('table', self.name), ('operation', 'insert')),
+                             len(batch))
+        if len(batch) == 1:
+            return [self._insert_row(batch[0])]
+        return self._insert_rows(batch)
+    
+    def select(self, where_clause: Union[str, Node, None] = None) -> List[Dict]:
+        """Matching rows as dicts with '_id'"""
+        return [view.to_dict() for view in self.select_views(where_clause)]
+    
+    def select_views(self, where_clause: Union[str, Node, None] = None,
+                     columns: Optional[List[str]] = None) -> List[RowView]:
+        """Matching rows as RowViews; columns lets column stores skip the rest"""
+        return list(self.iter_views(where_clause, columns))
+    
+    def iter_views(self, where_clause: Union[str, Node, None] = None, columns: Optional[List[str]] = None,
+                   snapshot: Optional[Snapshot] = None, vectorized: bool = False,
+                   node: Optional[PlanNode] = None) -> Iterator[RowView]:
+        """select_views as a generator: rows are found and read only as they are consumed.
+        
+        Reads through snapshot if given, else through the calling thread's snapshot if it has one.
+        vectorized lets a scan filter on column arrays where the storage supports it.
+        node (EXPLAIN ANALYZE) counts the rows the access path reads.
+        """
+        snapshot = snapshot or self.snapshot
+        if snapshot is not None:
+            return self._iter_snapshot_views(where_clause, columns, snapshot, vectorized, node)
+        view = self._view_factory(columns)
+        return (view(row_id, handle) for row_id, handle in self._iter_matching(where_clause, vectorized, node))
+    
+    def update(self, values: Dict[str, Any], where_clause: Union[str, Node, None] = None,
+               node: Optional[PlanNode] = None) -> int:
+        updated = 0
+        row_ids_to_update = [row_id for row_id, _ in self._matching(where_clause, node)]
+        
+        
+        for col in self.columns:
+            if (col.is_unique or col.is_primary) and col.name in values:
+                new_value = values[col.name]
+                if new_value is not None and row_ids_to_update:
+                    
+                    if len(row_ids_to_update) > 1:
+                        raise ValueError(f"Duplicate value '{new_value}' for {col.name}")
+                    
+                    row_id = row_ids_to_update[0]
+                    holders = self.indexes[col.name].get(new_value) if col.name in self.indexes else []
+                    if any(holder != row_id for holder in holders):
+                        raise ValueError(f"Duplicate value '{new_value}' for {col.name}")
+        
+        
+        changes = {col_name: value for col_name, value in values.items() if col_name in self.positions}
+        for row_id in row_ids_to_update:
+            self._update_row(row_id, changes)
+            updated += 1
+        
+        if self.metrics is not None:
+            self.metrics.inc('pesapal_rows_written_total', (('table', self.name), ('operation', 'update')), updated)
+        return updated
+    
+    def delete(self, where_clause: Union[str, Node, None] = None, node: Optional[PlanNode] = None) -> int:
+        """Tombstone the matching rows; storage is compacted by vacuum()"""
+        matches = self._matching(where_clause, node)
+        
+        for row_id, _ in matches:
+            self._delete_row(row_id)
+        
+        self._maybe_vacuum()
+        if self.metrics is not None:
+            self.metrics.inc('pesapal_rows_written_total', (('table', self.name), ('operation', 'delete')),
+                             len(matches))
+        return len(matches)
+    
+    # -- row primitives -----------------------------------------------------
+    #
+    # Every change to stored rows goes through these methods: they keep
+    # indexes and unique sets in step, and journal the change. WAL replay calls
+    # them directly with already-validated data.
+    
+    def _insert_row(self, row_data: Dict[str, Any], row_id: Optional[int] = None) -> int:
+        if self._snapshots or self.undo is not None:
+            self._remember(self.next_rowid if row_id is None else row_id, None)
+        for col_name, values in self.unique_values.items():
+            value = row_data.get(col_name)
+            if value is not None:
+                values.add(value)
+        
+        self.row_count += 1
+        row_id = self._store_row(row_data, row_id)
+        if self.stats is not None:
+            self.stats.insert(row_data)
+        
+        if self.defer_indexes:
+            self._unindexed.append(row_id)
+        else:
+            for col_name, index in self.indexes.items():
+                index.add(row_data.get(col_name), row_id)
+        
+        if self.journal is not None:
+            self.journal.append(['I', self.name, row_id, row_data])
+        if self.undo is not None:
+            self.undo.append(('I', self, row_id))
+        return row_id
+    
+    def _insert_rows(self, batch: List[Dict[str, Any]]) -> List[int]:
+        """_insert_row for a batch: rows are appended first, then each index takes all their entries at once"""
+        track = self._snapshots or self.undo is not None
+        for col_name, values in self.unique_values.items():
+            values.update(value for value in (row_data.get(col_name) for row_data in batch) if value is not None)
+        
+        if track:
+            for row_id in range(self.next_rowid, self.next_rowid + len(batch)):
+                self._remember(row_id, None)
+        row_ids = self._store_rows(batch)
+        self.row_count += len(batch)
+        if self.stats is not None:
+            self.stats.insert_many(batch)
+        
+        if self.defer_indexes:
+            self._unindexed.extend(row_ids)
+        else:
+            for col_name, index in self.indexes.items():
+                index.add_many(zip([row_data.get(col_name) for row_data in batch], row_ids))
+        
+        if self.journal is not None:
+            name = self.name
+            self.journal.extend(['I', name, row_id, row_data] for row_id, row_data in zip(row_ids, batch))
+        if self.undo is not None:
+            self.undo.extend(('I', self, row_id) for row_id in row_ids)
+        return row_ids
+    
+    def _update_row(self, row_id: int, changes: Dict[str, Any]):
+        if self._unindexed:
+            self.flush_indexes()
+        if self._snapshots or self.undo is not None:
+            self._remember(row_id, self._image(row_id))
+        old_values = {col_name: self._get_value(row_id, col_name) for col_name in changes}
+        self._set_values(row_id, changes)
+        if self.stats is not None:
+            self.stats.update(old_values, changes)
+        
+        for col_name, value in changes.items():
+            old_value = old_values[col_name]
+            
+            
+            if col_name in self.unique_values:
+                if old_value is not None and old_value in self.unique_values[col_name]:
+                    self.unique_values[col_name].remove(old_value)
+                if value is not None:
+                    self.unique_values[col_name].add(value)
+            
+            
+            if col_name in self.indexes:
+                self.indexes[col_name].remove(old_value, row_id)
+                self.indexes[col_name].add(value, row_id)
+        
+        if self.journal is not None:
+            self.journal.append(['U', self.name, row_id, changes])
+        if self.undo is not None:
+            self.undo.append(('U', self, row_id, old_values))
+    
+    def _delete_row(self, row_id: int):
+        if self._unindexed:
+            self.flush_indexes()
+        if self._snapshots or self.undo is not None:
+            self._remember(row_id, self._image(row_id))
+        if self.undo is not None:
+            self.undo.append(('D', self, row_id, {name: self._get_value(row_id, name) for name in self.positions}))
+        for col_name, index in self.indexes.items():
+            index.remove(self._get_value(row_id, col_name), row_id)
+        for col_name, values in self.unique_values.items():
+            values.discard(self._get_value(row_id, col_name))
+        if self.stats is not None:
+            self.stats.delete({name: self._get_value(row_id, name) for name in self.stats.columns})
+        
+        self._kill_slot(self._slot(row_id))
+        self.row_count -= 1
+        self.dead_rows += 1
+        
+        if self.journal is not None:
+            self.journal.append(['D', self.name, row_id])
+    
+    def _revive_row(self, row_id: int, row_data: Dict[str, Any]):
+        """Undo a delete: refill the row's tombstoned slot (only valid before a VACUUM)"""
+        if self._snapshots or self.undo is not None:
+            self._remember(row_id, None)
+        self._fill_slot(self._slot(row_id), row_data)
+        self.row_count += 1
+        self.dead_rows -= 1
+        if self.stats is not None:
+            self.stats.insert(row_data)
+        
+        for col_name, values in self.unique_values.items():
+            value = row_data.get(col_name)
+            if value is not None:
+                values.add(value)
+        for col_name, index in self.indexes.items():
+            index.add(row_data.get(col_name), row_id)
+    
+    def flush_indexes(self):
+        """Index the rows inserted while index maintenance was deferred"""
+        row_ids = self._unindexed
+        if not row_ids:
+            return
+        self._unindexed = []
+        
+        handles = list(map(self._handle, row_ids))
+        by_name = {col.name: col for col in self.columns}
+        for col_name, index in self.indexes.items():
+            index.add_many(zip(map(self._accessor(by_name[col_name]), handles), row_ids))
+    
+    def _rebuild_indexes(self):
+        """Recompute every index and unique-value set from the stored rows"""
+        self._unindexed = []
+        for col_name, index in list(self.indexes.items()):
+            self.indexes[col_name] = make_index(col_name, index.data_type, index.kind)
+        for col_name in self.unique_values:
+            self.unique_values[col_name] = set()
+        
+        by_name = {col.name: col for col in self.columns}
+        for col_name, index in self.indexes.items():
+            accessor = self._accessor(by_name[col_name])
+            for row_id, handle in self._scan_handles():
+                index.add(accessor(handle), row_id)
+        for col_name, values in self.unique_values.items():
+            accessor = self._accessor(by_name[col_name])
+            for _, handle in self._scan_handles():
+                value = accessor(handle)
+                if value is not None:
+                    values.add(value)
+    
+    def export_indexes(self) -> Dict[str, Any]:
+        """Index and unique-set contents for persistence"""
+        self.flush_indexes()
+        return {
+            'indexes': [index.export_state() for index in self.indexes.values()],
+            'unique_values': {col_name: list(values) for col_name, values in self.unique_values.items()}
+        }
+    
+    def load_indexes(self, state: Optional[Dict[str, Any]]) -> List[str]:
+        """Install persisted indexes, rebuilding from the rows only if a check fails.
+        
+        Returns the columns whose indexes had to be rebuilt.
+        """
+        by_name = {col.name: col for col in self.columns}
+        indexes: Dict[str, Index] = {}
+        rebuilt = []
+        
+        for index_state in (state or {}).get('indexes', ()):
+            col = by_name.get(index_state['column'])
+            if col is None:
+                continue
+            index = make_index(col.name, col.data_type, index_state['kind'])
+            index.import_state(index_state)
+            if not index.is_consistent(self.row_count):
+                rebuilt.append(col.name)
+            indexes[col.name] = index
+        
+        for col in self.columns:
+            if (col.is_primary or col.is_unique) and col.name not in indexes:
+                indexes[col.name] = make_index(col.name, col.data_type)
+                rebuilt.append(col.name)
+        
+        unique_values = {col_name: set(values) for col_name, values in (state or {}).get('unique_values', {}).items()}
+        if set(unique_values) != set(self.unique_values) or any(
+                len(values) > self.row_count for values in unique_values.values()):
+            rebuilt.extend(col_name for col_name in self.unique_values if col_name not in rebuilt)
+        
+        self.indexes = indexes
+        if rebuilt:
+            self._rebuild_indexes()
+        else:
+            self.unique_values = unique_values
+        self._plan_cache.clear()
+        return rebuilt
+    
+    def scan(self) -> Iterator[Tuple[int, RowView]]:
+        """(row id, row view) pairs in storage order"""
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return ((view.row_id, view) for view in self._snapshot_views(None, None, snapshot))
+        view = self._view_factory()
+        handles = self._scan_handles()
+        if self.metrics is not None:
+            handles = self.metrics.counting_access(self.name, False, handles)
+        return ((row_id, view(row_id, handle)) for row_id, handle in handles)
+    
+    def fetch(self, row_id: int) -> RowView:
+        # the handle is read before the chain: writers remember a row's image before changing it
+        handle = self._handle(row_id)
+        snapshot = self.snapshot
+        if snapshot is not None:
+            chain = self.versions.get(row_id)
+            if chain is not None and chain[-1][0] > snapshot.version:
+                return RowView(self.positions, self._image_at(chain, snapshot.version), row_id)
+        return self._view_factory()(row_id, handle)
+    
+    def _column(self, name: str) -> Column:
+        key = name.lower()
+        if '.' in key:
+            prefix, key = key.split('.', 1)
+            if prefix != self.name.lower():
+                raise ValueError(f"Unknown table '{prefix}' in column reference '{name}'")
+        
+        for col in self.columns:
+            if col.name.lower() == key:
+                return col
+        raise ValueError(f"Unknown column '{name}' in table {self.name}")
+    
+    def _resolve_column(self, name: str) -> Tuple[Callable[[Dict], Any], str]:
+        """Map a column reference from a WHERE clause to (row accessor, data type)"""
+        col = self._column(name)
+        return self._accessor(col), col.data_type
+    
+    def compile_where(self, where_clause: str) -> Callable[[Dict], Any]:
+        """Parse and compile a WHERE clause once; the predicate is cached per table"""
+        predicate = self._where_cache.get(where_clause)
+        if predicate is None:
+            predicate = compile_where(where_clause, self._resolve_column)
+            if len(self._where_cache) >= 256:
+                self._where_cache.clear()
+            self._where_cache[where_clause] = predicate
+        return predicate
+    
+    def plan(self, where: Union[str, Node]) -> AccessPath:
+        """Pick an access path for a clause string (cached) or an already bound expression tree"""
+        if not isinstance(where, str):
+            return self._build_plan(where)
+        
+        path = self._plan_cache.get(where)
+        if path is None:
+            path = self._build_plan(parse_where(where))
+            if len(self._plan_cache) >= 256:
+                self._plan_cache.clear()
+            self._plan_cache[where] = path
+        return path
+    
+    def _build_plan(self, tree: Node) -> AccessPath:
+        """Probe an index for the best `col = literal` / `col IN (...)` term and filter the rest.
+        
+        With statistics (after ANALYZE) every usable index is costed against a full scan instead.
+        """
+        conjuncts = split_conjuncts(tree)
+        if self.stats is not None:
+            return self._costed_plan(tree, conjuncts, self.stats)
+        
+        best = None
+        for position, term in enumerate(conjuncts):
+            lookup = equality_terms(term)
+            if lookup is None:
+                continue
+            column_name, values = lookup
+            col = self._indexed_column(column_name)
+            if col is None:
+                continue
+            
+            rank = (0 if col.is_primary or col.is_unique else 1, len(values))
+            if best is None or rank < best[0]:
+                best = (rank, position, col, values)
+        
+        if best is None:
+            return self._build_range_plan(tree, conjuncts)
+        
+        _, position, col, values = best
+        return self._index_path(conjuncts, [position], col, keys=self._probe_keys(col, values))
+    
+    def _build_range_plan(self, tree: Node, conjuncts: List[Node]) -> AccessPath:
+        """Range-scan an ordered index when AND terms bound one of its columns"""
+        bounded = self._bounded_columns(conjuncts)
+        if not bounded:
+            return AccessPath(None, None, compile_expression(tree, self._resolve_column), residual=tree)
+        
+        
+        col, positions, ops = max(bounded.values(), key=lambda entry: len({op[0] for op in entry[2]}))
+        bounds = self._range_bounds(col, ops)
+        if bounds is None:
+            return AccessPath(None, None, compile_expression(tree, self._resolve_column), residual=tree)
+        return self._index_path(conjuncts, positions, col, bounds=bounds)
+    
+    def _costed_plan(self, tree: Node, conjuncts: List[Node], stats: rdbms_stats.TableStats) -> AccessPath:
+        """The cheapest of a full scan and each index probe or range scan the conjuncts allow"""
+        rows = self.row_count
+        cost = rdbms_stats.scan_cost(rows)
+        best = None
+        
+        for position, term in enumerate(conjuncts):
+            lookup = equality_terms(term)
+            if lookup is None:
+                continue
+            col = self._indexed_column(lookup[0])
+            if col is None:
+                continue
+            keys = self._probe_keys(col, lookup[1])
+            column_stats = stats.columns.get(col.name)
+            if col.is_primary or col.is_unique or column_stats is None:
+                estimate = float(len(keys)) if col.is_primary or col.is_unique else rows / 10 * len(keys)
+            else:
+                estimate = sum(column_stats.equality_selectivity(key, rows) for key in keys) * rows
+            probe_cost = rdbms_stats.probe_cost(estimate, len(keys))
+            if probe_cost < cost:
+                cost, best = probe_cost, (estimate, [position], col, keys, None)
+        
+        for col, positions, ops in self._bounded_columns(conjuncts).values():
+            bounds = self._range_bounds(col, ops)
+            if bounds is None:
+                continue
+            column_stats = stats.columns.get(col.name)
+            if column_stats is None:
+                estimate = rows * rdbms_stats.DEFAULT_RANGE_SELECTIVITY
+            else:
+                low, high, low_inclusive, high_inclusive = bounds
+                estimate = column_stats.range_selectivity(low, high, low_inclusive, high_inclusive, rows) * rows
+            probe_cost = rdbms_stats.probe_cost(estimate, 1)
+            if probe_cost < cost:
+                cost, best = probe_cost, (estimate, positions, col, None, bounds)
+        
+        if best is None:
+            return AccessPath(None, None, compile_expression(tree, self._resolve_column), rows=rows, cost=cost,
+                              residual=tree)
+        estimate, positions, col, keys, bounds = best
+        return self._index_path(conjuncts, positions, col, keys, bounds, estimate, cost)
+    
+    def _indexed_column(self, column_name: str) -> Optional[Column]:
+        try:
+            col = self._column(column_name)
+        except ValueError:
+            return None
+        return col if col.name in self.indexes else None
+    
+    def _probe_keys(self, col: Column, values: List[Any]) -> List[Any]:
+        coerce = coerce_for(col.data_type)
+        return list(dict.fromkeys(coerce(value) for value in values if value is not None))
+    
+    def _bounded_columns(self, conjuncts: List[Node]) -> Dict[str, Tuple[Column, List[int], List[Tuple[str, Any]]]]:
+        """Columns with an ordered index that AND terms bound: (column, term positions, (op, value)s)"""
+        bounded: Dict[str, Tuple[Column, List[int], List[Tuple[str, Any]]]] = {}
+        for position, term in enumerate(conjuncts):
+            lookup = range_terms(term)
+            if lookup is None:
+                continue
+            column_name, ops = lookup
+            try:
+                col = self._column(column_name)
+            except ValueError:
+                continue
+            if not isinstance(self.indexes.get(col.name), OrderedIndex):
+                continue
+            if any(value is None for _, value in ops):
+                continue
+            entry = bounded.setdefault(col.name, (col, [], []))
+            entry[1].append(position)
+            entry[2].extend(ops)
+        return bounded
+    
+    def _range_bounds(self, col: Column, ops: List[Tuple[str, Any]]) -> Optional[Tuple]:
+        """(low, high, low_inclusive, high_inclusive) for range ops, or None if values do not compare"""
+        coerce = coerce_for(col.data_type)
+        low = high = None
+        low_inclusive = high_inclusive = True
+        try:
+            for op, value in ops:
+                value = coerce(value)
+                if op in ('>', '>='):
+                    inclusive = op == '>='
+                    if low is None or value > low or (value == low and not inclusive):
+                        low, low_inclusive = value, inclusive
+                else:
+                    inclusive = op == '<='
+                    if high is None or value < high or (value == high and not inclusive):
+                        high, high_inclusive = value, inclusive
+        except TypeError:
+            return None
+        return low, high, low_inclusive, high_inclusive
+    
+    def _index_path(self, conjuncts: List[Node], positions: List[int], col: Column,
+                    keys: Optional[List[Any]] = None, bounds: Optional[Tuple] = None,
+                    rows: Optional[float] = None, cost: Optional[float] = None) -> AccessPath:
+        """Reach rows through col's index, filtering with the conjuncts not at positions"""
+        residual = conjoin([term for i, term in enumerate(conjuncts) if i not in positions])
+        predicate = compile_expression(residual, self._resolve_column) if residual is not None else None
+        return AccessPath(col.name, keys, predicate, bounds, rows, cost, residual)
+    
+    def analyze(self) -> rdbms_stats.TableStats:
+        """Collect column statistics in one pass (see rdbms_stats); plans are costed with them from now on.
+        
+        The pass reads the caller's snapshot without holding writers off. Writers keep self.stats
+        current as they go, so the result is installed under the table latch: as is when no row
+        changed since the snapshot, else after a second pass over storage under the latch, since
+        the changes made meanwhile only reached the old stats.
+        """
+        columns = [(col.name, col.data_type) for col in self.columns]
+        stats = rdbms_stats.analyze(columns, (view for _, view in self.scan()))
+        with self._current_view() as current:
+            if not current:
+                view = self._view_factory()
+                rows = (view(row_id, handle) for row_id, handle in self._scan_handles())
+                stats = rdbms_stats.analyze(columns, rows)
+            self.stats = stats
+            self._plan_cache.clear()
+        return stats
+    
+    def _candidate_row_ids(self, path: AccessPath) -> Iterator[int]:
+        index = self.indexes[path.index_column]
+        if path.bounds is not None:
+            return index.range(*path.bounds)
+        if len(path.keys) == 1:
+            return iter(index.get(path.keys[0]))
+        return (row_id for key in path.keys for row_id in index.get(key))
+    
+    def _matching(self, where: Union[str, Node, None], node: Optional[PlanNode] = None) -> List[Tuple[int, Any]]:
+        """(row id, storage handle) pairs of the rows matching a WHERE clause, in storage order"""
+        matches = list(self._iter_matching(where, node=node))
+        if node is not None:
+            node.rows_out = len(matches)
+        return matches
+    
+    def _iter_matching(self, where: Union[str, Node, None], vectorized: bool = False,
+                       node: Optional[PlanNode] = None) -> Iterator[Tuple[int, Any]]:
+        """_matching as an iterator; an index probe collects its row ids up front, a scan does not.
+        
+        node, when given, counts the rows read (all of them for a vectorized filter) in its rows_in.
+        """
+        metrics = self.metrics
+        if not where:
+            handles = self._scan_handles() if node is None else counted(node, self._scan_handles())
+            return handles if metrics is None else metrics.counting_access(self.name, False, handles)
+        
+        if self._unindexed:
+            self.flush_indexes()
+        path = self.plan(where)
+        predicate = path.predicate
+        handle_for = self._handle
+        if path.is_scan:
+            row_ids = self._vector_row_ids(where) if vectorized else None
+            if row_ids is not None:
+                if node is not None:
+                    node.rows_in = self.row_count
+                if metrics is not None:
+                    metrics.access(self.name, False, self.row_count)
+                return ((row_id, handle_for(row_id)) for row_id in row_ids)
+            handles = self._scan_handles() if node is None else counted(node, self._scan_handles())
+            if metrics is not None:
+                handles = metrics.counting_access(self.name, False, handles)
+            return ((row_id, handle) for row_id, handle in handles if predicate(handle))
+        
+        row_ids = sorted(set(self._candidate_row_ids(path)))
+        if node is not None:
+            node.rows_in = len(row_ids)
+        if metrics is not None:
+            metrics.access(self.name, True, len(row_ids))
+        pairs = ((row_id, handle_for(row_id)) for row_id in row_ids)
+        if predicate is None:
+            return pairs
+        return ((row_id, handle) for row_id, handle in pairs if predicate(handle))
+    
+    def select_ordered(self, where_clause: Union[str, Node, None], column_name: str,
+                       descending: bool = False, limit: Optional[int] = None,
+                       columns: Optional[List[str]] = None, nulls_first: bool = True,
+                       node: Optional[PlanNode] = None) -> Optional[List[RowView]]:
+        """Stream rows in index order for ORDER BY column [LIMIT n]; None when no ordered index applies.
+        
+        Under a snapshot the index is read with writers held off, and only if no row has
+        changed since the snapshot was taken.
+        """
+        source = self._ordered_source(where_clause, column_name, limit)
+        if source is None:
+            return None
+        index, path = source
+        if limit is not None and limit <= 0:
+            return []
+        
+        with self._current_view() as current:
+            if not current:
+                return None
+            self.flush_indexes()
+            if path is None or path.is_scan:
+                row_ids = index.ordered(descending, nulls_first)
+            else:
+                row_ids = index.range(*path.bounds, descending=descending)
+            if node is not None:
+                row_ids = counted(node, row_ids)
+            if self.metrics is not None:
+                row_ids = self.metrics.counting_access(self.name, True, row_ids)
+            predicate = path.predicate if path is not None else None
+            
+            handle_for = self._handle
+            view = self._view_factory(columns)
+            results = []
+            for row_id in row_ids:
+                handle = handle_for(row_id)
+                if predicate is None or predicate(handle):
+                    results.append(view(row_id, handle))
+                    if limit is not None and len(results) >= limit:
+                        break
+            return results
+    
+    def _ordered_source(self, where_clause: Union[str, Node, None], column_name: str,
+                        limit: Optional[int] = None) -> Optional[Tuple[OrderedIndex, Optional[AccessPath]]]:
+        """The ordered index select_ordered reads and the WHERE clause's access path, if it applies"""
+        try:
+            col = self._column(column_name)
+        except ValueError:
+            return None
+        index = self.indexes.get(col.name)
+        if not isinstance(index, OrderedIndex):
+            return None
+        if self.snapshot is not None and limit is None:
+            # writers wait while a snapshot reads the index; only a LIMIT keeps that short
+            return None
+        
+        path = self.plan(where_clause) if where_clause else None
+        if path is not None and not path.is_scan and (path.index_column != col.name or path.bounds is None):
+            # an equality probe on another column yields few rows; sorting them is cheaper
+            return None
+        return index, path
+    
+    def explain_access(self, where_clause: Union[str, Node, None], vectorized: bool = False) -> PlanNode:
+        """Plan node for how iter_views reaches the rows matching where_clause"""
+        if not where_clause:
+            return PlanNode(f"Seq Scan on {self.name}", rows=self.row_count)
+        path = self.plan(where_clause)
+        if not path.is_scan:
+            operator = "Index Scan" if path.bounds is None else "Index Range Scan"
+            return PlanNode(f"{operator} using {path.index_column} on {self.name}", self._path_details(path),
+                            path.rows, path.cost)
+        operator = "Vector Scan" if vectorized and self.vector_applicable(where_clause) else "Seq Scan"
+        return PlanNode(f"{operator} on {self.name}", self._path_details(path), self.row_count, path.cost)
+    
+    def explain_ordered(self, where_clause: Union[str, Node, None], key: SortKey,
+                        limit: Optional[int] = None) -> Optional[PlanNode]:
+        """Plan node for select_ordered, or None where it does not apply"""
+        source = self._ordered_source(where_clause, key.column, limit)
+        if source is None:
+            return None
+        path = source[1]
+        details = [f"Order: {key}"] + (self._path_details(path) if path is not None else [])
+        estimate = self.row_count if path is None or path.is_scan else path.rows
+        return PlanNode(f"Index Order Scan using {source[0].column_name} on {self.name}", details, estimate,
+                        path.cost if path is not None else None)
+    
+    @staticmethod
+    def _path_details(path: AccessPath) -> List[str]:
+        details = []
+        name = path.index_column
+        if path.keys is not None:
+            values = [format_expression(Literal(key)) for key in path.keys]
+            if len(values) == 1:
+                details.append(f"Index Cond: {name} = {values[0]}")
+            else:
+                details.append(f"Index Cond: {name} IN ({', '.join(values)})")
+        elif path.bounds is not None:
+            low, high, low_inclusive, high_inclusive = path.bounds
+            terms = []
+            if low is not None:
+                terms.append(f"{name} {'>=' if low_inclusive else '>'} {format_expression(Literal(low))}")
+            if high is not None:
+                terms.append(f"{name} {'<=' if high_inclusive else '<'} {format_expression(Literal(high))}")
+            details.append(f"Index Cond: {' AND '.join(terms)}")
+        if path.residual is not None:
+            details.append(f"Filter: {format_expression(path.residual)}")
+        return details
+    
+    def quick_aggregate(self, function: str, column_name: Optional[str] = None) -> Tuple[bool, Any]:
+        """COUNT(*) from the row count and MIN/MAX from an ordered index, without reading rows.
+        
+        Returns (False, None) when the answer needs a scan: another aggregate, no
+        usable index, or rows changed since the calling thread's snapshot.
+        """
+        with self._current_view() as current:
+            if not current:
+                return False, None
+            if function == 'COUNT' and column_name is None:
+                return True, self.row_count
+            if function not in ('MIN', 'MAX') or column_name is None:
+                return False, None
+            
+            name = self._column(column_name).name
+            index = self.indexes.get(name)
+            if not isinstance(index, OrderedIndex) or index.stray_keys or self._unindexed:
+                return False, None
+            if not index.keys:
+                return True, None
+            postings = index.index[index.keys[0] if function == 'MIN' else index.keys[-1]]
+            return True, self._get_value(postings[0], name)
+    
+    def vector_aggregate(self, where_clause: Union[str, Node, None],
+                         calls: List[Tuple[str, Optional[str], bool]]) -> Optional[List[Any]]:
+        """Ungrouped aggregate calls computed on column arrays; None where that path does not apply"""
+        return None
+    
+    def _vector_row_ids(self, where: Union[str, Node]) -> Optional[List[int]]:
+        """Row ids matching where, filtered on column arrays; None where that path does not apply"""
+        return None
+    
+    def vector_applicable(self, where_clause: Union[str, Node, None],
+                          aggregate_columns: Optional[List[str]] = None) -> bool:
+        """Whether a vectorized scan (or, given its columns, vector_aggregate) would take where_clause"""
+        return False
+    
+    @contextmanager
+    def _current_view(self) -> Iterator[bool]:
+        """Hold writers off for a direct read of storage and indexes; yields whether they show
+        what the calling thread's snapshot sees (no rows changed since it was taken)"""
+        snapshot = self.snapshot
+        if snapshot is None:
+            yield True
+            return
+        snapshot.latch.acquire()
+        try:
+            yield not any(chain[-1][0] > snapshot.version for chain in self.versions.values())
+        finally:
+            snapshot.latch.release()
+    
+    def create_index(self, column_name: str, method: Optional[str] = None):
+        self.flush_indexes()
+        col = self._column(column_name)
+        existing = self.indexes.get(col.name)
+        if existing is not None and (method is None or existing.kind == method.upper()
+                                     or isinstance(existing, OrderedIndex)):
+            return
+        
+        index = make_index(col.name, col.data_type, method)
+        accessor = self._accessor(col)
+        for row_id, handle in self._scan_handles():
+            index.add(accessor(handle), row_id)
+        self.indexes[col.name] = index
+        self._plan_cache.clear()
+    
+    def vacuum(self) -> int:
+        """Compact away deleted rows; row ids are kept. Returns the number of slots reclaimed"""
+        reclaimed = self.dead_rows
+        if not reclaimed or self._snapshots:
+            # open cursors still read rows by slot
+            return 0
+        
+        live = list(self._live_slots())
+        rowids = array('q', (self._row_id_at(slot) for slot in live))
+        self._compact_slots(live)
+        
+        if len(rowids) == self.next_rowid - 1:
+            
+            self._rowids = None
+        else:
+            self._rowids = rowids
+        self.dead_rows = 0
+        return reclaimed
+    
+    def _maybe_vacuum(self):
+        if self._snapshots or self.undo is not None:
+            # open snapshots and undo logs address rows by slot; compact once they are gone
+            return
+        dead = self.dead_rows
+        if dead >= self.VACUUM_MIN_ROWS and dead > self.VACUUM_THRESHOLD * (dead + self.row_count):
+            self.vacuum()
+    
+    def export_rows(self) -> List[Dict]:
+        """Live rows as plain dicts for persistence"""
+        names = list(self.positions)
+        return [dict(zip(names, row)) for row in self.rows if row is not None]
+    
+    def export_rowids(self) -> List[int]:
+        """Row ids of the live rows, aligned with export_rows()"""
+        return [row_id for row_id, _ in self._scan_handles()]
+    
+    def load_rows(self, rows: List[Dict], rowids: Optional[List[int]] = None,
+                  next_rowid: Optional[int] = None):
+        """Replace the stored rows (indexes must be rebuilt afterwards)"""
+        self._init_storage()
+        for row in rows:
+            self._append_slot(row)
+        self.row_count = len(rows)
+        
+        if rowids is None:
+            self.next_rowid = len(rows) + 1
+        else:
+            self.next_rowid = max(next_rowid or 1, (rowids[-1] + 1) if rowids else 1)
+            if len(rowids) != self.next_rowid - 1:
+                self._rowids = array('q', rowids)
+    
+    # -- snapshots ----------------------------------------------------------
+    #
+    # A reader that must not block writers opens a snapshot of the committed
+    # version. While any snapshot is open, every row change first records the
+    # row's previous image (None for a new row) in self.versions, tagged with the
+    # version being written. A snapshot sees, per row, the first image tagged
+    # after its version, or the stored row when there is none. The snapshot
+    # reads a row before looking up its images, and writers record an image
+    # before changing the row, so a concurrent change is always caught.
+    
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        """The snapshot the calling thread reads this table through, if any"""
+        return getattr(self._reader, 'snapshot', None)
+    
+    def open_snapshot(self, latch: Any) -> Snapshot:
+        """Pin the committed version for reads by the calling thread (latch: the table's statement latch)"""
+        snapshot = self._reader.snapshot = self.pin_snapshot(latch)
+        return snapshot
+    
+    def close_snapshot(self):
+        snapshot = self._reader.__dict__.pop('snapshot', None)
+        if snapshot is not None:
+            self.release_snapshot(snapshot)
+    
+    def pin_snapshot(self, latch: Any) -> Snapshot:
+        """Pin the committed version without attaching it to the thread (cursors carry their own)"""
+        latch.acquire()
+        try:
+            self.ensure_loaded()
+            with self._snapshot_lock:
+                version = self.version
+                self._snapshots[version] = self._snapshots.get(version, 0) + 1
+        finally:
+            latch.release()
+        return Snapshot(version, latch)
+    
+    def release_snapshot(self, snapshot: Snapshot):
+        with self._snapshot_lock:
+            count = self._snapshots[snapshot.version] - 1
+            if count:
+                self._snapshots[snapshot.version] = count
+            else:
+                del self._snapshots[snapshot.version]
+            if not self._snapshots and self.undo is None:
+                self.versions = {}
+    
+    def commit_version(self):
+        """Publish the changes made under the table's write lock and drop images no snapshot needs"""
+        self.version += 1
+        with self._snapshot_lock:
+            if not self._snapshots:
+                if self.versions:
+                    self.versions = {}
+                return
+            oldest = min(self._snapshots)
+        if oldest > self._pruned_below:
+            versions = self.versions
+            for row_id, chain in list(versions.items()):
+                keep = [entry for entry in chain if entry[0] > oldest]
+                if not keep:
+                    del versions[row_id]
+                elif len(keep) < len(chain):
+                    versions[row_id] = keep
+            self._pruned_below = oldest
+    
+    def _remember(self, row_id: int, image: Optional[Tuple]):
+        # snapshot readers look at chains without the latch, so a chain is never published empty
+        chain = self.versions.get(row_id)
+        if chain is None:
+            self.versions[row_id] = [(self.version + 1, image)]
+        else:
+            chain.append((self.version + 1, image))
+    
+    @staticmethod
+    def _image_at(chain: List[Tuple[int, Optional[Tuple]]], version: int) -> Optional[Tuple]:
+        for entry_version, image in chain:
+            if entry_version > version:
+                return image
+        return None
+    
+    def _image_predicate(self, where: Union[str, Node]) -> Callable[[Tuple], Any]:
+        """WHERE compiled against full row tuples, the form row images are kept in"""
+        positions = self.positions
+        
+        def resolve(name):
+            col = self._column(name)
+            return itemgetter(positions[col.name]), col.data_type
+        
+        return compile_expression(parse_where(where) if isinstance(where, str) else where, resolve)
+    
+    def _snapshot_views(self, where: Union[str, Node, None], columns: Optional[List[str]],
+                        snapshot: Snapshot) -> List[RowView]:
+        """select_views as of a snapshot, without holding the table lock while rows are read"""
+        return list(self._iter_snapshot_views(where, columns, snapshot))
+    
+    def _iter_snapshot_views(self, where: Union[str, Node, None], columns: Optional[List[str]],
+                             snapshot: Snapshot, vectorized: bool = False,
+                             node: Optional[PlanNode] = None) -> Iterator[RowView]:
+        version = snapshot.version
+        versions = self.versions
+        predicate = None
+        candidates = None
+        filtered = False
+        if where:
+            # only the index probe (or array filter) needs the lock; rows changed since the snapshot
+            # join the candidates
+            snapshot.latch.acquire()
+            try:
+                path = self.plan(where)
+                predicate = path.predicate
+                row_ids = None
+                if not path.is_scan:
+                    row_ids = self._candidate_row_ids(path)
+                elif vectorized:
+                    row_ids = self._vector_row_ids(where)
+                    filtered = row_ids is not None
+                if row_ids is not None:
+                    candidates = set(row_ids)
+                    candidates.update(row_id for row_id, chain in versions.items() if chain[-1][0] > version)
+                    candidates = sorted(candidates)
+            finally:
+                snapshot.latch.release()
+        
+        if candidates is None:
+            pairs = self._all_handles()
+        else:
+            handle_for = self._live_handle
+            pairs = ((row_id, handle_for(row_id)) for row_id in candidates)
+        if filtered and node is not None:
+            # the array filter read every row
+            node.rows_in = self.row_count
+        elif node is not None:
+            pairs = counted(node, pairs)
+        metrics = self.metrics
+        if metrics is not None:
+            if filtered:
+                metrics.access(self.name, False, self.row_count)
+            else:
+                pairs = metrics.counting_access(self.name, candidates is not None, pairs)
+        
+        view = self._view_factory(columns)
+        positions = self.positions
+        image_predicate = None
+        for row_id, handle in pairs:
+            current = None
+            if handle is not None and (predicate is None or predicate(handle)):
+                current = view(row_id, handle)
+            
+            chain = versions.get(row_id)
+            if chain is not None and chain[-1][0] > version:
+                image = self._image_at(chain, version)
+                if image is None:
+                    continue
+                if where and image_predicate is None:
+                    image_predicate = self._image_predicate(where)
+                if not where or image_predicate(image):
+                    yield RowView(positions, image, row_id)
+            elif current is not None:
+                yield current
+    
+    # -- row ids ------------------------------------------------------------
+    #
+    # Row ids are allocated from next_rowid and never reused or shifted. Until the
+    # first VACUUM that drops rows, slot i holds row id i + 1; after it, _rowids
+    # maps slot -> row id (ascending, so row id -> slot is a bisect).
+    
+    def _init_storage(self):
+        self.next_rowid = 1
+        self.dead_rows = 0
+        self._rowids: Optional[array] = None
+        self._init_slots()
+    
+    def _store_row(self, row_data: Dict, row_id: Optional[int] = None) -> int:
+        if row_id is None:
+            row_id = self.next_rowid
+        elif row_id != self.next_rowid and self._rowids is None:
+            
+            self._rowids = array('q', range(1, self.next_rowid))
+        self.next_rowid = row_id + 1
+        if self._rowids is not None:
+            self._rowids.append(row_id)
+        self._append_slot(row_data)
+        return row_id
+    
+    def _store_rows(self, batch: List[Dict]) -> List[int]:
+        """_store_row for a batch, under consecutive new row ids"""
+        first = self.next_rowid
+        row_ids = range(first, first + len(batch))
+        self.next_rowid = first + len(batch)
+        if self._rowids is not None:
+            self._rowids.extend(row_ids)
+        self._append_slots(batch)
+        return list(row_ids)
+    
+    def _slot(self, row_id: int) -> int:
+        rowids = self._rowids
+        if rowids is None:
+            return row_id - 1
+        return bisect.bisect_left(rowids, row_id)
+    
+    def _row_id_at(self, slot: int) -> int:
+        return slot + 1 if self._rowids is None else self._rowids[slot]
+    
+    def _next_key(self, col: Column) -> int:
+        """Next auto-assigned INTEGER primary key: one past the largest stored key"""
+        self.flush_indexes()
+        index = self.indexes.get(col.name)
+        if isinstance(index, OrderedIndex):
+            return int(index.keys[-1]) + 1 if index.keys else 1
+        keys = [value for value in index.index if isinstance(value, int)] if index is not None else []
+        return max(keys) + 1 if keys else 1
+    
+    # -- storage hooks ------------------------------------------------------
+    
+    def _init_slots(self):
+        self.rows: List[Optional[Tuple]] = []
+    
+    def _add_column_storage(self, column: Column):
+        self.rows = [row + (None,) if row is not None else None for row in self.rows]
+    
+    def _append_slot(self, row_data: Dict):
+        self.rows.append(tuple([row_data.get(name) for name in self.positions]))
+    
+    def _append_slots(self, batch: List[Dict]):
+        names = list(self.positions)
+        self.rows.extend([tuple(map(row_data.get, names)) for row_data in batch])
+    
+    def _kill_slot(self, slot: int):
+        self.rows[slot] = None
+    
+    def _fill_slot(self, slot: int, row_data: Dict):
+        self.rows[slot] = tuple(row_data.get(name) for name in self.positions)
+    
+    def _live_slots(self) -> Iterator[int]:
+        return (slot for slot, row in enumerate(self.rows) if row is not None)
+    
+    def _compact_slots(self, live: List[int]):
+        rows = self.rows
+        self.rows = [rows[slot] for slot in live]
+    
+    def _handle(self, row_id: int) -> Any:
+        """The object predicates and accessors operate on for a row"""
+        return self.rows[self._slot(row_id)]
+    
+    def _scan_handles(self) -> Iterator[Tuple[int, Any]]:
+        rows = self.rows
+        if self._rowids is None:
+            pairs = enumerate(rows, 1)
+        else:
+            pairs = zip(self._rowids, rows)
+        if not self.dead_rows:
+            return pairs
+        return ((row_id, row) for row_id, row in pairs if row is not None)
+    
+    def _all_handles(self) -> Iterator[Tuple[int, Any]]:
+        """(row id, handle) for every slot, with None as the handle of a deleted row"""
+        if self._rowids is None:
+            return enumerate(self.rows, 1)
+        return zip(self._rowids, self.rows)
+    
+    def _live_handle(self, row_id: int) -> Any:
+        return self.rows[self._slot(row_id)]
+    
+    def _image(self, row_id: int) -> Tuple:
+        """The row's values in schema order"""
+        return self.rows[self._slot(row_id)]
+    
+    def _accessor(self, col: Column) -> Callable[[Any], Any]:
+        return itemgetter(self.positions[col.name])
+    
+    def _view_factory(self, columns: Optional[List[str]] = None) -> Callable[[int, Any], RowView]:
+        """Build RowViews from (row id, handle); row tuples are shared, not copied"""
+        positions = self.positions
+        return lambda row_id, handle: RowView(positions, handle, row_id)
+    
+    def _get_value(self, row_id: int, name: str) -> Any:
+        return self.rows[self._slot(row_id)][self.positions[name]]
+    
+    def _set_values(self, row_id: int, changes: Dict[str, Any]):
+        slot = self._slot(row_id)
+        row = list(self.rows[slot])
+        for name, value in changes.items():
+            row[self.positions[name]] = value
+        self.rows[slot] = tuple(row)
+
+
+class ColumnVector:
+    """One column of a ColumnarTable.
+    
+    INTEGER, REAL and BOOLEAN values live in a typed array (zero placeholder for
+    NULL), TEXT and DATE in a plain list; a validity bitmap (bit set = not NULL)
+    tracks NULLs for both. A typed column falls back to a list if it ever
+    receives a value the array cannot hold.
+    """
+    TYPECODES = {DataType.INTEGER: 'q', DataType.REAL: 'd', DataType.BOOLEAN: 'b'}
+    
+    def __init__(self, data_type: str):
+        self.data_type = data_type
+        self.typecode = self.TYPECODES.get(data_type)
+        self.values = array(self.typecode) if self.typecode else []
+        self.validity = bytearray()
+        self.null_count = 0
+        self._length = 0
+    
+    def __len__(self):
+        return self._length
+    
+    def _convert(self, value: Any) -> Any:
+        if self.typecode == 'q':
+            converted = int(value)
+            if converted != value and not isinstance(value, str):
+                raise ValueError(value)
+            return converted
+        if self.typecode == 'd':
+            return float(value)
+        if self.typecode == 'b':
+            converted = coerce_for(DataType.BOOLEAN)(value)
+            if not isinstance(converted, bool):
+                raise ValueError(value)
+            return int(converted)
+        return value
+    
+    def _promote(self):
+        """Switch to list storage, keeping NULLs as None"""
+        is_bool = self.typecode == 'b'
+        self.values = [
+            (bool(value) if is_bool else value) if self.is_valid(i) else None
+            for i, value in enumerate(self.values)
+        ]
+        self.typecode = None
+    
+    def _store(self, value: Any) -> Any:
+        if self.typecode is None or value is None:
+            return value
+        try:
+            return self._convert(value)
+        except (TypeError, ValueError, OverflowError):
+            self._promote()
+            return value
+    
+    def is_valid(self, i: int) -> bool:
+        return bool(self.validity[i >> 3] & (1 << (i & 7)))
+    
+    def append(self, value: Any):
+        i = self._length
+        if not i & 7:
+            self.validity.append(0)
+        stored = self._store(value)
+        if value is None:
+            self.null_count += 1
+            stored = 0 if self.typecode else None
+        else:
+            self.validity[i >> 3] |= 1 << (i & 7)
+        try:
+            self.values.append(stored)
+        except OverflowError:
+            self._promote()
+            self.values.append(value)
+        self._length = i + 1
+    
+    def extend_nulls(self, count: int):
+        for _ in range(count):
+            self.append(None)
+    
+    def get(self, i: int) -> Any:
+        if self.null_count and not self.validity[i >> 3] & (1 << (i & 7)):
+            return None
+        value = self.values[i]
+        if self.typecode == 'b':
+            return bool(value)
+        return value
+    
+    def set(self, i: int, value: Any):
+        was_valid = self.is_valid(i)
+        stored = self._store(value)
+        if value is None:
+            if was_valid:
+                self.null_count += 1
+                self.validity[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+            stored = 0 if self.typecode else None
+        else:
+            if not was_valid:
+                self.null_count -= 1
+                self.validity[i >> 3] |= 1 << (i & 7)
+        try:
+            self.values[i] = stored
+        except OverflowError:
+            self._promote()
+            self.values[i] = value
+    
+    def compact(self, keep: List[int]):
+        """Keep only the given positions (ascending), in place"""
+        old_values = [self.get(i) for i in keep]
+        self.values = array(self.typecode) if self.typecode else []
+        self.validity = bytearray()
+        self.null_count = 0
+        self._length = 0
+        for value in old_values:
+            self.append(value)
+
+
+class ColumnarTable(Table):
+    """Column-store table: one ColumnVector per column, rows addressed by slot.
+    
+    Predicates read values through per-column accessors, so a scan only touches
+    the columns its WHERE clause references, and projections only materialise the
+    requested columns.
+    """
+    storage = "COLUMNAR"
+    
+    @property
+    def rows(self) -> List[Dict]:
+        return self.export_rows()
+    
+    def export_rows(self) -> List[Dict]:
+        vectors = self.vectors
+        return [{name: vector.get(i) for name, vector in vectors.items()} for i in self._live_slots()]
+    
+    def _init_slots(self):
+        self.vectors: Dict[str, ColumnVector] = {col.name: ColumnVector(col.data_type) for col in self.columns}
         
-        print(f"DEBUG DataType.validate: Unknown data type '{data_type}', returning False")
-        return False
+        self.live = bytearray()
+    
+    def _add_column_storage(self, column: Column):
+        vector = ColumnVector(column.data_type)
+        vector.extend_nulls(len(self.live))
+        self.vectors[column.name] = vector
+    
+    def _append_slot(self, row_data: Dict):
+        for name, vector in self.vectors.items():
+            vector.append(row_data.get(name))
+        self.live.append(1)
+    
+    def _append_slots(self, batch: List[Dict]):
+        for name, vector in self.vectors.items():
+            append = vector.append
+            for row_data in batch:
+                append(row_data.get(name))
+        self.live.extend(b'\x01' * len(batch))
+    
+    def _kill_slot(self, slot: int):
+        self.live[slot] = 0
+    
+    def _fill_slot(self, slot: int, row_data: Dict):
+        for name, vector in self.vectors.items():
+            vector.set(slot, row_data.get(name))
+        self.live[slot] = 1
+    
+    def _live_slots(self) -> Iterator[int]:
+        if not self.dead_rows:
+            return iter(range(len(self.live)))
+        live = self.live
+        return (slot for slot in range(len(live)) if live[slot])
+    
+    def _compact_slots(self, live: List[int]):
+        for vector in self.vectors.values():
+            vector.compact(live)
+        self.live = bytearray(b'\x01' * len(live))
+    
+    def _handle(self, row_id: int) -> Any:
+        return self._slot(row_id)
+    
+    def _scan_handles(self) -> Iterator[Tuple[int, Any]]:
+        row_id_at = self._row_id_at
+        return ((row_id_at(slot), slot) for slot in self._live_slots())
+    
+    def _all_handles(self) -> Iterator[Tuple[int, Any]]:
+        live = self.live
+        row_id_at = self._row_id_at
+        return ((row_id_at(slot), slot if live[slot] else None) for slot in range(len(live)))
+    
+    def _live_handle(self, row_id: int) -> Any:
+        slot = self._slot(row_id)
+        return slot if self.live[slot] else None
+    
+    def _image(self, row_id: int) -> Tuple:
+        slot = self._slot(row_id)
+        return tuple([vector.get(slot) for vector in self.vectors.values()])
+    
+    def _accessor(self, col: Column) -> Callable[[Any], Any]:
+        return self.vectors[col.name].get
+    
+    def _view_factory(self, columns: Optional[List[str]] = None) -> Callable[[int, Any], RowView]:
+        """Build RowViews holding only the requested columns' values"""
+        if columns is None:
+            names = list(self.vectors)
+        else:
+            names = [name for name in dict.fromkeys(columns) if name in self.vectors]
+        positions = {name: i for i, name in enumerate(names)}
+        getters = [self.vectors[name].get for name in names]
+        return lambda row_id, i: RowView(positions, tuple([get(i) for get in getters]), row_id)
+    
+    def _get_value(self, row_id: int, name: str) -> Any:
+        return self.vectors[name].get(self._slot(row_id))
+    
+    def _set_values(self, row_id: int, changes: Dict[str, Any]):
+        slot = self._slot(row_id)
+        for name, value in changes.items():
+            self.vectors[name].set(slot, value)
+    
+    def vector_aggregate(self, where_clause: Union[str, Node, None],
+                         calls: List[Tuple[str, Optional[str], bool]]) -> Optional[List[Any]]:
+        if not rdbms_vector.available() or len(self.live) < rdbms_vector.MIN_ROWS:
+            return None
+        where = parse_where(where_clause) if isinstance(where_clause, str) else where_clause
+        with self._current_view() as current:
+            if not current:
+                return None
+            try:
+                result = rdbms_vector.aggregate(self, where, calls)
+            except rdbms_vector.Unsupported:
+                return None
+            if self.metrics is not None:
+                self.metrics.access(self.name, False, self.row_count)
+            return result
+    
+    def _vector_row_ids(self, where: Union[str, Node]) -> Optional[List[int]]:
+        if not rdbms_vector.available() or len(self.live) < rdbms_vector.MIN_ROWS:
+            return None
+        try:
+            return rdbms_vector.matching_row_ids(self, parse_where(where) if isinstance(where, str) else where)
+        except rdbms_vector.Unsupported:
+            return None
+    
+    def vector_applicable(self, where_clause: Union[str, Node, None],
+                          aggregate_columns: Optional[List[str]] = None) -> bool:
+        if not rdbms_vector.available() or len(self.live) < rdbms_vector.MIN_ROWS:
+            return False
+        where = parse_where(where_clause) if isinstance(where_clause, str) else where_clause
+        if aggregate_columns is not None:
+            with self._current_view() as current:
+                if not current:
+                    return False
+        return rdbms_vector.supports(self, where, aggregate_columns or ())
 
-class Index:
-    """Basic index implementation"""
-    def __init__(self, column_name: str):
-        self.column_name = column_name
-        self.index = defaultdict(list)
+
+TABLE_STORAGES = {"ROW": Table, "COLUMNAR": ColumnarTable, "COLUMN": ColumnarTable}
+
+
+def make_table(name: str, storage: Optional[str] = None) -> Table:
+    """Create an empty table with the requested storage engine (row store by default)"""
+    storage = (storage or "ROW").upper()
+    if storage not in TABLE_STORAGES:
+        raise ValueError(f"Unsupported storage: {storage}. Use ROW or COLUMNAR")
+    return TABLE_STORAGES[storage](name)
+
+
+class PreparedStatement:
+    """A statement parsed once by Database.prepare and executed many times with bound parameters.
     
-    def add(self, value: Any, row_id: int):
-        self.index[value].append(row_id)
+    reads/writes name the tables it locks shared/exclusive; schema statements lock the whole database.
+    batch_executor, when given, runs the statement for a whole sequence of parameter sets at once;
+    cursor_executor returns its rows as a lazy Cursor; plan_executor (EXPLAIN) returns its plan tree.
+    """
     
-    def remove(self, value: Any, row_id: int):
-        if value in self.index and row_id in self.index[value]:
-            self.index[value].remove(row_id)
+    def __init__(self, sql: str, kind: str, executor: Callable[[Any], Any], cacheable: bool = True,
+                 reads: Tuple[str, ...] = (), writes: Tuple[str, ...] = (), schema: bool = False,
+                 batch_executor: Optional[Callable[[List[Any]], int]] = None,
+                 cursor_executor: Optional[Callable[[Any], 'Cursor']] = None,
+                 plan_executor: Optional[Callable[[Any], PlanNode]] = None):
+        self.sql = sql
+        self.kind = kind
+        self.cacheable = cacheable
+        self.reads = reads
+        self.writes = writes
+        self.schema = schema
+        self._executor = executor
+        self._batch_executor = batch_executor
+        self._cursor_executor = cursor_executor
+        self._plan_executor = plan_executor
+    
+    def execute(self, params: Union[List, Tuple, Dict, None] = None) -> Any:
+        """Run the statement; params is a sequence for ?/?N placeholders or a dict for :name"""
+        return self._executor(params)
+    
+    def open_cursor(self, params: Union[List, Tuple, Dict, None] = None) -> Optional['Cursor']:
+        """The statement's rows as a Cursor, or None if it does not produce rows"""
+        if self._cursor_executor is None:
+            return None
+        return self._cursor_executor(params)
+    
+    def plan(self, params: Union[List, Tuple, Dict, None] = None) -> Optional[PlanNode]:
+        """An EXPLAIN statement's plan as a PlanNode tree, or None for other statements"""
+        if self._plan_executor is None:
+            return None
+        return self._plan_executor(params)
+    
+    def execute_many(self, param_sets: List[Any]) -> int:
+        """Run the statement once per parameter set; returns the number of rows affected"""
+        if self._batch_executor is not None:
+            return self._batch_executor(param_sets)
+        affected = 0
+        for params in param_sets:
+            result = self._executor(params)
+            if isinstance(result, int) and not isinstance(result, bool):
+                affected += result
+        return affected
     
-    def get(self, value: Any) -> List[int]:
-        return self.index.get(value, [])
+    def __repr__(self):
+        return f"<PreparedStatement {self.kind}: {self.sql}>"
 
 
-class Column:
-    def __init__(self, name: str, data_type: str, 
-                 is_primary: bool = False, is_unique: bool = False, 
-                 nullable: bool = True):
-        self.name = name
-        self.data_type = data_type
-        self.is_primary = is_primary
-        self.is_unique = is_unique
-        self.nullable = nullable
+class Cursor:
+    """Lazy result of a SELECT (execute_sql(..., cursor=True)): rows are read as they are fetched.
+    
+    It reads the table as of the moment it was opened and keeps that snapshot pinned
+    until it is exhausted or closed, so close cursors that are not read to the end.
+    """
+    arraysize = 100
+    
+    def __init__(self, rows: Iterator[Dict[str, Any]], on_close: Optional[Callable[[], None]] = None):
+        self._rows = rows
+        self._on_close = on_close
+        self.rownumber = 0
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> Dict[str, Any]:
+        try:
+            row = next(self._rows)
+        except StopIteration:
+            self.close()
+            raise
+        self.rownumber += 1
+        return row
+    
+    def fetchone(self) -> Optional[Dict[str, Any]]:
+        return next(self, None)
+    
+    def fetchmany(self, size: Optional[int] = None) -> List[Dict[str, Any]]:
+        return list(islice(self, self.arraysize if size is None else size))
+    
+    def fetchall(self) -> List[Dict[str, Any]]:
+        return list(self)
+    
+    def close(self):
+        self._rows = iter(())
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __del__(self):
+        self.close()
 
 
-class Table:
-    def __init__(self, name: str):
-        self.name = name
-        self.columns: List[Column] = []
-        self.rows = []
-        self.row_count = 0
-        self.indexes: Dict[str, Index] = {}
-        self.unique_values: Dict[str, set] = {}
-        
-        self.unique_constraints: Dict[str, set] = {}
+class Transaction:
+    """A thread's open BEGIN ... COMMIT/ROLLBACK: the locks it holds until it ends,
+    its undo log (applied in reverse on rollback), and the tables it has written"""
     
-    def add_column(self, column: Column):
-        if column.is_primary or column.is_unique:
-            self.unique_values[column.name] = set()
-            self.indexes[column.name] = Index(column.name)
-        self.columns.append(column)
+    def __init__(self):
+        self.held: List[Tuple[Any, bool]] = []
+        self.undo: List[Tuple] = []
+        self.tables: List[Table] = []
     
-    def insert(self, values: Dict[str, Any]) -> int:
-        
-        row_data = {}
-        for col in self.columns:
-            if col.name in values:
-                if not DataType.validate(col.data_type, values[col.name]):
-                    raise ValueError(f"Invalid type for {col.name}")
-                if not col.nullable and values[col.name] is None:
-                    raise ValueError(f"{col.name} cannot be null")
-                
-                
-                if col.is_unique or col.is_primary:
-                    value = values[col.name]
-                    if value is not None:
-                        
-                        unique_set = self.unique_values.get(col.name, set())
-                        if value in unique_set:
-                            raise ValueError(f"Duplicate value '{value}' for {col.name}")
-                
-                row_data[col.name] = values[col.name]
-            elif col.is_primary and col.data_type == DataType.INTEGER:
-                
-                next_id = self.row_count + 1
-                row_data[col.name] = next_id
-            else:
-                row_data[col.name] = None
-        
+    def enlist(self, table: Table):
+        """Route a table's changes into this transaction's undo log, with index maintenance deferred"""
+        if table.undo is not self.undo:
+            table.undo = self.undo
+            table.defer_indexes = True
+            self.tables.append(table)
+
+
+class Database:
+    STATEMENT_CACHE_SIZE = 256
+    WAL_SUFFIX = "-wal"
+    
+    CHECKPOINT_BYTES = 4 * 1024 * 1024
+    
+    # seconds a statement waits for a table lock before giving up (None waits forever)
+    LOCK_TIMEOUT = 30.0
+    
+    # statements execute_sql runs as they are, because they manage transactions themselves
+    # (COPY runs as a transaction of its own unless one is open)
+    DIRECT_STATEMENTS = ('BEGIN', 'COMMIT', 'ROLLBACK', 'COPY')
+    
+    # rows handed to insert_many at a time by COPY; bounds what a load holds besides the table
+    COPY_CHUNK_ROWS = 10000
+    
+    # default memory bound of the result cache (set_result_cache)
+    RESULT_CACHE_BYTES = 8 * 1024 * 1024
+    
+    # statements whose executors build their plan under EXPLAIN; the rest show as one node
+    PLANNED_STATEMENTS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE')
+    
+    def __init__(self, name: str = "pesapal_db"):
+        self.name = name
+        self.tables: Dict[str, Table] = {}
+        self._statements: Dict[str, PreparedStatement] = {}
         
-        for col in self.columns:
-            if (col.is_primary or col.is_unique) and col.name in row_data:
-                value = row_data[col.name]
-                if value is not None:
-                    if value in self.unique_values.get(col.name, set()):
-                        raise ValueError(f"Duplicate value for {col.name}")
-                    self.unique_values.setdefault(col.name, set()).add(value)
         
+        self.filename: Optional[str] = None
+        self.wal: Optional[WriteAheadLog] = None
+        self.scheduler: Optional[CommitScheduler] = None
+        self.durability: Dict[str, Any] = {'mode': 'sync', 'max_delay_ms': 2.0, 'checkpoint_interval_ms': 1000.0}
+        self.lsn = 0
+        self.locks = LockManager(self.LOCK_TIMEOUT)
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._pager: Optional[PagedFile] = None
+        self.vectorized = False
+        self.result_cache: Optional[ResultCache] = None
+        # the only directory SQL COPY may read from (set_copy_directory); None refuses file COPY
+        self.copy_directory: Optional[str] = None
+        # engine metrics (set_metrics); None keeps the statement and table access paths free of them
+        self.metrics: Optional[MetricsRegistry] = None
+        # bumped whenever a write to the table commits; the schema version on any DDL
+        self._write_versions: Dict[str, int] = {}
+        self._schema_version = 0
+    
+    @property
+    def _pending(self) -> List[List[Any]]:
+        """WAL ops made by the calling thread and not yet appended"""
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            pending = self._local.pending = []
+        return pending
+    
+    def execute_sql(self, sql: str, params: Union[List, Tuple, Dict, None] = None, cursor: bool = False) -> Any:
+        """Run one statement. With cursor=True a SELECT returns a lazy Cursor instead of a list"""
+        if self.metrics is not None:
+            return self._measured(sql, lambda statement: self._execute(statement, params, cursor))
+        return self._execute(self._statement(sql), params, cursor)
+    
+    def _execute(self, statement: PreparedStatement, params: Any, cursor: bool) -> Any:
+        if cursor:
+            result = statement.open_cursor(params)
+            if result is not None:
+                return result
+        if statement.kind in self.DIRECT_STATEMENTS:
+            return statement.execute(params)
+        if self.result_cache is not None and statement.kind == 'SELECT' and self._transaction is None:
+            return self._run_cached(statement, params)
+        return self._run(statement, statement.execute, params)
+    
+    def _run_cached(self, statement: PreparedStatement, params: Any) -> Any:
+        """Answer a SELECT from the result cache, or run it and cache its rows"""
+        key = params_key(params)
+        if key is None:
+            return self._run(statement, statement.execute, params)
+        key = (statement.sql, key)
+        versions = self._versions_of(statement.reads)
+        rows = self.result_cache.get(key, versions)
+        if rows is None:
+            # versions were read first, so the rows are at least as new as the tag they get
+            rows = self._run(statement, statement.execute, params)
+            self.result_cache.put(key, versions, statement.reads, rows)
+        return rows
+    
+    def explain(self, sql: str, params: Union[List, Tuple, Dict, None] = None, analyze: bool = False) -> PlanNode:
+        """The plan of a statement (or of an EXPLAIN [ANALYZE] statement) as a PlanNode tree.
         
-        self.row_count += 1
-        self.rows.append(row_data)
+        With analyze=True the statement runs, and keeps its changes, so that every
+        node carries the rows it read and produced, its time and its memory.
+        """
+        statement = self._statement(sql)
+        if statement.kind != 'EXPLAIN':
+            statement = self._statement(f"EXPLAIN ANALYZE {sql}" if analyze else f"EXPLAIN {sql}")
+        return self._run(statement, statement.plan, params)
+    
+    def executemany(self, sql: str, param_sets: Iterable[Union[List, Tuple, Dict]]) -> int:
+        """Execute one statement for every parameter set, parsed once and under one lock and WAL record.
         
+        INSERT validates and stores the whole batch at once (all rows or none);
+        returns the number of rows affected.
+        """
+        if self.metrics is not None:
+            return self._measured(sql, lambda statement: self._execute_many(statement, param_sets))
+        return self._execute_many(self._statement(sql), param_sets)
+    
+    def _execute_many(self, statement: PreparedStatement, param_sets: Iterable[Union[List, Tuple, Dict]]) -> int:
+        if statement.kind in self.DIRECT_STATEMENTS:
+            raise ValueError(f"{statement.kind} cannot be used with executemany")
+        return self._run(statement, statement.execute_many, list(param_sets))
+    
+    def _measured(self, sql: str, run: Callable[[PreparedStatement], Any]) -> Any:
+        """Run a statement while recording its type, latency and rows in the metrics.
         
-        for col_name, index in self.indexes.items():
-            if col_name in row_data:
-                index.add(row_data[col_name], self.row_count)
+        A cursor's latency is the time to open it; its rows are counted as they are fetched.
+        """
+        metrics = self.metrics
+        cached = sql in self._statements
+        metrics.inc('pesapal_statement_cache_lookups_total', (('result', 'hit' if cached else 'miss'),))
+        kind = 'UNKNOWN'
+        start = time.perf_counter()
+        try:
+            statement = self._statement(sql)
+            kind = statement.kind
+            result = run(statement)
+        except Exception:
+            metrics.statement(kind, time.perf_counter() - start, failed=True)
+            raise
+        metrics.statement(kind, time.perf_counter() - start)
         
-        return self.row_count
+        if isinstance(result, list):
+            metrics.inc('pesapal_rows_returned_total', (('type', kind),), len(result))
+        elif isinstance(result, Cursor):
+            result._rows = metrics.counting('pesapal_rows_returned_total', (('type', kind),), result._rows)
+        return result
     
-    def select(self, where_clause: Optional[str] = None) -> List[Dict]:
-        results = []
-        for i, row in enumerate(self.rows, 1):
-            if not where_clause or self._evaluate_where(row, where_clause):
-                results.append({**row, '_id': i})
-        return results
-    
-    def update(self, values: Dict[str, Any], where_clause: Optional[str] = None) -> int:
-        updated = 0
-        row_indices_to_update = []
+    def copy_from(self, table_name: str, path: str, format: Optional[str] = None,
+                  columns: Optional[List[str]] = None, header: bool = True, delimiter: str = ',',
+                  chunk_rows: Optional[int] = None) -> Dict[str, Any]:
+        """Bulk-load a CSV or JSON Lines file into a table (COPY table FROM 'path').
         
+        The file is streamed chunk_rows rows at a time and every value converted to its
+        column's type (see rdbms_copy). The load is one transaction, or one statement of
+        the caller's, so a bad row loads nothing; index entries are built once, at commit.
+        Returns the row count, elapsed seconds and rows per second.
+        """
+        from .rdbms_copy import CopyReader
         
-        for i, row in enumerate(self.rows):
-            if not where_clause or self._evaluate_where(row, where_clause):
-                row_indices_to_update.append(i)
+        table = self._get_table(table_name)
+        reader = CopyReader(path, {col.name: col.data_type for col in table.columns}, format,
+                            columns, header, delimiter)
+        chunk_rows = chunk_rows or self.COPY_CHUNK_ROWS
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be positive")
         
+        statement = PreparedStatement(f"COPY {table_name} FROM '{path}'", 'COPY',
+                                      lambda params: self._copy(table_name, reader, chunk_rows),
+                                      False, writes=(table_name,))
+        start = time.perf_counter()
+        if self._transaction is not None:
+            rows = self._run(statement, statement.execute, None)
+        else:
+            with self.transaction():
+                rows = self._run(statement, statement.execute, None)
+        seconds = time.perf_counter() - start
         
-        for col in self.columns:
-            if col.is_unique and col.name in values:
-                new_value = values[col.name]
-                if new_value is not None:
-                    
-                    for i in row_indices_to_update:
-                        existing_value = self.rows[i].get(col.name)
-                        if existing_value != new_value:  
-                            
-                            for j, other_row in enumerate(self.rows):
-                                if j not in row_indices_to_update:  
-                                    if other_row.get(col.name) == new_value:
-                                        raise ValueError(f"Duplicate value '{new_value}' for {col.name}")
-        
-        
-        for i in row_indices_to_update:
-            row = self.rows[i]
-            row_id = i + 1
-            
-            for col_name, value in values.items():
-                if col_name in row:
-                    
-                    old_value = row[col_name]
-                    
-                    
-                    row[col_name] = value
-                    
-                    
-                    if col_name in self.unique_values:
-                        if old_value is not None and old_value in self.unique_values[col_name]:
-                            self.unique_values[col_name].remove(old_value)
-                        if value is not None:
-                            self.unique_values[col_name].add(value)
-                    
-                    
-                    if col_name in self.indexes:
-                        self.indexes[col_name].remove(old_value, row_id)
-                        self.indexes[col_name].add(value, row_id)
-            
-            updated += 1
+        rate = rows / seconds if seconds > 0 else 0.0
+        print(f"✓ Copied {rows} rows into '{table_name}' in {seconds:.2f}s ({rate:,.0f} rows/s)")
+        return {
+            'table': table_name,
+            'format': reader.format,
+            'rows': rows,
+            'seconds': round(seconds, 3),
+            'rows_per_sec': round(rate, 1),
+        }
+    
+    def _copy(self, table_name: str, reader: Any, chunk_rows: int) -> int:
+        """Insert the reader's rows chunk by chunk, numbering missing INTEGER primary keys as it goes"""
+        table = self._get_table(table_name)
+        auto = next((col for col in table.columns if col.is_primary and col.data_type == DataType.INTEGER), None)
+        next_key = None
         
-        return updated
+        rows = 0
+        for chunk in reader.chunks(chunk_rows):
+            if auto is not None:
+                # numbered here rather than per chunk by insert_many, which would index pending rows first
+                name = auto.name
+                if next_key is None:
+                    next_key = table._next_key(auto)
+                for row in chunk:
+                    key = row.get(name)
+                    if key is None:
+                        row[name] = next_key
+                        next_key += 1
+                    elif key >= next_key:
+                        next_key = key + 1
+            table.insert_many(chunk)
+            rows += len(chunk)
+        return rows
     
-    def delete(self, where_clause: Optional[str] = None) -> int:
-        indices_to_remove = []
-        for i, row in enumerate(self.rows):
-            if not where_clause or self._evaluate_where(row, where_clause):
-                indices_to_remove.append(i)
+    def _statement(self, sql: str) -> PreparedStatement:
+        statement = self._statements.get(sql)
+        if statement is None:
+            statement = self.prepare(sql)
+            if statement.cacheable:
+                if len(self._statements) >= self.STATEMENT_CACHE_SIZE:
+                    self._statements.clear()
+                self._statements[sql] = statement
+        return statement
+    
+    def _run(self, statement: PreparedStatement, call: Callable[[Any], Any], params: Any) -> Any:
+        """Run a statement under its locks; outside a transaction its changes are committed to the WAL"""
+        txn = self._transaction
+        if txn is not None:
+            with self._locked(statement.reads, statement.writes, statement.schema):
+                undo_mark, pending_mark = len(txn.undo), len(self._pending)
+                try:
+                    return call(params)
+                except Exception:
+                    # a failed statement leaves no trace; the transaction stays open
+                    self._undo_to(txn, undo_mark, pending_mark)
+                    raise
         
-        for i in sorted(indices_to_remove, reverse=True):
-            row = self.rows.pop(i)
-            for col_name, index in self.indexes.items():
-                if col_name in row:
-                    index.remove(row[col_name], i + 1)
+        with self._locked(statement.reads, statement.writes, statement.schema):
+            try:
+                result = call(params)
+            finally:
+                lsn = self._append_pending() if self._pending else None
         
-        self.row_count = len(self.rows)
-        return len(indices_to_remove)
+        self._committed(lsn)
+        return result
     
-    def _evaluate_where(self, row: Dict, where_clause: str) -> bool:
+    @contextmanager
+    def _locked(self, reads: Iterable[str] = (), writes: Iterable[str] = (), schema: bool = False):
+        """Hold what a statement needs: write locks (or the whole schema), snapshots of the
+        tables it only reads, its tables loaded, and its writes journaled to this thread"""
+        locks = self.locks
+        txn = self._transaction
+        # inside a transaction locks accumulate until COMMIT/ROLLBACK (two-phase locking)
+        held = txn.held if txn is not None else []
+        latched = []
+        snapshots = []
         try:
+            locks.acquire_into(held, writes=writes, schema=schema)
+            for name in sorted(set(writes)):
+                latch = locks.latch(name)
+                latch.acquire(True)
+                latched.append((latch, True))
             
-            expression = where_clause.upper()
+            for name in dict.fromkeys(reads):
+                table = self.tables.get(name)
+                if table is None:
+                    continue
+                if schema or name in writes or locks.table(name).is_writer or locks.schema.is_writer:
+                    table.ensure_loaded()
+                    if table._unindexed:
+                        with locks.latched([name]):
+                            table.flush_indexes()
+                elif table.snapshot is None:
+                    table.open_snapshot(locks.latch(name))
+                    snapshots.append(table)
             
-            for col_name, value in row.items():
-                if isinstance(value, str):
-                    value_str = f"'{value}'"
+            journal = self._pending if self.wal is not None else None
+            if schema:
+                self._bind_journals()
+            for name in writes:
+                table = self.tables.get(name)
+                if table is not None:
+                    table.ensure_loaded()
+                    table.journal = journal
+                    if txn is not None:
+                        txn.enlist(table)
+            yield
+        finally:
+            for table in snapshots:
+                table.close_snapshot()
+            if schema:
+                self._schema_changed()
+            if txn is None:
+                for name in writes:
+                    table = self.tables.get(name)
+                    if table is not None:
+                        table.commit_version()
+                self._bump_versions(writes)
+            locks.release_all(latched)
+            if txn is None:
+                locks.release_all(held)
+    
+    def write_version(self, table_name: str) -> int:
+        """How many times writes to table_name have committed; never goes back"""
+        return self._write_versions.get(table_name, 0)
+    
+    def _versions_of(self, table_names: Iterable[str]) -> Tuple[int, ...]:
+        versions = self._write_versions
+        return (self._schema_version,) + tuple(versions.get(name, 0) for name in table_names)
+    
+    def _bump_versions(self, table_names: Iterable[str]):
+        """Called with the tables' write locks held, once their writes are published"""
+        versions = self._write_versions
+        cache = self.result_cache
+        for name in table_names:
+            versions[name] = versions.get(name, 0) + 1
+            if cache is not None:
+                cache.invalidate(name)
+    
+    def _schema_changed(self):
+        self._schema_version += 1
+        if self.result_cache is not None:
+            self.result_cache.clear()
+    
+    def snapshot_stats(self) -> Dict[str, Any]:
+        """Per table: committed version, open snapshots, and row images kept for them"""
+        return {
+            name: {
+                'version': table.version,
+                'open_snapshots': sum(table._snapshots.values()),
+                'row_versions': sum(len(chain) for chain in list(table.versions.values()))
+            }
+            for name, table in self.tables.items()
+        }
+    
+    @property
+    def _transaction(self) -> Optional[Transaction]:
+        return getattr(self._local, 'transaction', None)
+    
+    @property
+    def _trace(self) -> Optional[Trace]:
+        """The EXPLAIN the calling thread is running a statement under, if any"""
+        return getattr(self._local, 'trace', None)
+    
+    @property
+    def in_transaction(self) -> bool:
+        """True if the calling thread has a transaction open"""
+        return self._transaction is not None
+    
+    def begin(self):
+        """Open a transaction on the calling thread; its changes reach the WAL at commit()"""
+        if self._transaction is not None:
+            raise ValueError("A transaction is already open")
+        if self._pending:
+            self.commit()
+        self._local.transaction = Transaction()
+    
+    def rollback(self):
+        """Undo everything the calling thread's transaction changed"""
+        txn = self._transaction
+        if txn is None:
+            raise ValueError("No transaction is open")
+        try:
+            with self.locks.latched(table.name for table in txn.tables):
+                self._undo_to(txn, 0, 0)
+        finally:
+            self._end_transaction(txn)
+    
+    @contextmanager
+    def transaction(self):
+        """with db.transaction(): ... commits when the block ends, rolls back if it raises"""
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+    
+    def _end_transaction(self, txn: Transaction) -> Optional[int]:
+        """Publish the transaction's tables, log its changes as one WAL record, release its locks"""
+        self._local.transaction = None
+        try:
+            with self.locks.latched(table.name for table in txn.tables):
+                for table in txn.tables:
+                    table.undo = None
+                    table.defer_indexes = False
+                    table.flush_indexes()
+                    table.commit_version()
+                self._bump_versions(table.name for table in txn.tables)
+            return self._append_pending()
+        finally:
+            self.locks.release_all(txn.held)
+    
+    def _undo_to(self, txn: Transaction, undo_mark: int, pending_mark: int):
+        """Apply the undo log back to undo_mark and drop the WAL ops made since pending_mark"""
+        for entry in reversed(txn.undo[undo_mark:]):
+            kind = entry[0]
+            if kind == 'I':
+                entry[1]._delete_row(entry[2])
+            elif kind == 'U':
+                entry[1]._update_row(entry[2], entry[3])
+            elif kind == 'D':
+                entry[1]._revive_row(entry[2], entry[3])
+            elif kind == 'CREATE':
+                _, table_name, previous = entry
+                if previous is None:
+                    self.tables.pop(table_name, None)
                 else:
-                    value_str = str(value)
-                
-                
-                col_name_upper = col_name.upper()
-                expression = re.sub(rf'\b{re.escape(col_name_upper)}\b', value_str, expression)
-            
-            expression = expression.replace('=', '==').replace('AND', 'and').replace('OR', 'or')
-            return eval(expression, {"__builtins__": {}}, {})
-        except:
-            return False
-        
+                    self.tables[table_name] = previous
+            elif kind == 'DROP':
+                self.tables[entry[1]] = entry[2]
+            elif kind == 'RENAME':
+                _, old_name, new_name = entry
+                table = self.tables.pop(new_name)
+                table.name = old_name
+                self.tables[old_name] = table
+            elif kind == 'INDEX':
+                _, table, column_name, previous = entry
+                if previous is None:
+                    table.indexes.pop(column_name, None)
+                else:
+                    table.indexes[column_name] = previous
+                table._plan_cache.clear()
+        del txn.undo[undo_mark:]
+        del self._pending[pending_mark:]
     
-    def create_index(self, column_name: str):
-        if column_name not in self.indexes:
-            self.indexes[column_name] = Index(column_name)
-            for i, row in enumerate(self.rows, 1):
-                if column_name in row:
-                    self.indexes[column_name].add(row[column_name], i)
-
-
-class Database:
-    def __init__(self, name: str = "pesapal_db"):
-        self.name = name
-        self.tables: Dict[str, Table] = {}
+    def _record_undo(self, entry: Tuple):
+        """Log how to reverse a schema change when it happens inside a transaction"""
+        txn = self._transaction
+        if txn is not None:
+            txn.undo.append(entry)
     
-    def execute_sql(self, sql: str) -> Any:
-        sql = self._clean_sql(sql)  
-        sql_upper = sql.upper()  
+    def lock_stats(self) -> Dict[str, Any]:
+        """How often each lock was taken and how long statements waited for it"""
+        return self.locks.stats()
+    
+    def prepare(self, sql: str) -> PreparedStatement:
+        """Parse a statement once so it can be executed repeatedly without re-parsing"""
+        sql = self._clean_sql(sql)
+        sql_upper = sql.upper()
         
-        if sql_upper.startswith("CREATE TABLE"):
-            return self._parse_create_table(sql)
-        elif sql_upper.startswith("ALTER TABLE"):
-            return self._parse_alter_table(sql)  
-        elif sql_upper.startswith("INSERT INTO"):
-            return self._parse_insert(sql)
+        control = re.match(r'(BEGIN|START|COMMIT|END|ROLLBACK)(?:\s+(?:TRANSACTION|WORK))?;?$', sql_upper)
+        if control:
+            word = control.group(1)
+            if word in ('BEGIN', 'START'):
+                return PreparedStatement(sql, 'BEGIN', lambda params: self.begin())
+            if word == 'ROLLBACK':
+                return PreparedStatement(sql, 'ROLLBACK', lambda params: self.rollback())
+            return PreparedStatement(sql, 'COMMIT', lambda params: self.commit())
+        
+        if sql_upper.startswith("INSERT INTO"):
+            return self._prepare_insert(self._number_placeholders(sql))
         elif sql_upper.startswith("SELECT"):
-            return self._parse_select(sql)
+            return self._prepare_select(self._number_placeholders(sql))
         elif sql_upper.startswith("UPDATE"):
-            return self._parse_update(sql)
+            return self._prepare_update(self._number_placeholders(sql))
         elif sql_upper.startswith("DELETE"):
-            return self._parse_delete(sql)
+            return self._prepare_delete(self._number_placeholders(sql))
+        elif sql_upper.startswith("CREATE TABLE"):
+            return self._prepare_ddl(sql, 'CREATE TABLE', self._parse_create_table)
+        elif sql_upper.startswith("ALTER TABLE"):
+            return self._prepare_ddl(sql, 'ALTER TABLE', self._parse_alter_table)
         elif sql_upper.startswith("DROP TABLE"):
-            return self._parse_drop_table(sql)
+            return self._prepare_ddl(sql, 'DROP TABLE', self._parse_drop_table)
         elif sql_upper.startswith("CREATE INDEX"):
-            return self._parse_create_index(sql)
+            return self._prepare_ddl(sql, 'CREATE INDEX', self._parse_create_index)
+        elif sql_upper.startswith("COPY"):
+            return self._prepare_copy(sql)
+        elif sql_upper.startswith("VACUUM"):
+            return PreparedStatement(sql, 'VACUUM', lambda params: self._parse_vacuum(sql), False, schema=True)
+        elif sql_upper.startswith("ANALYZE"):
+            return self._prepare_analyze(sql)
+        elif sql_upper.startswith("EXPLAIN"):
+            return self._prepare_explain(sql)
         else:
             raise ValueError(f"Unsupported SQL: {sql}")
+    
+    def _prepare_copy(self, sql: str) -> PreparedStatement:
+        """COPY table [(cols)] FROM 'path' [WITH] [(FORMAT csv|jsonl, HEADER true|false, DELIMITER 'c')]"""
+        pattern = r"COPY\s+(\w+)\s*(?:\((.*?)\))?\s+FROM\s+'([^']*)'\s*(?:WITH\s*)?(?:\((.*)\))?\s*;?$"
+        match = re.match(pattern, sql, re.IGNORECASE)
+        if not match:
+            raise ValueError(f"Invalid COPY: {sql}")
+        
+        table_name, columns_sql, path, options_sql = match.groups()
+        columns = [col.strip() for col in columns_sql.split(',')] if columns_sql else None
+        options = {'format': None, 'header': True, 'delimiter': ','}
+        for option in (_VALUE_RE.findall(options_sql) if options_sql else []):
+            parts = option.strip().split(None, 1)
+            if len(parts) != 2 or parts[0].lower() not in options:
+                raise ValueError(f"Invalid COPY option: {option.strip()}. Use FORMAT, HEADER or DELIMITER")
+            key, value = parts[0].lower(), parts[1].strip()
+            if key == 'header':
+                options[key] = value.upper() in ('TRUE', 'ON', '1')
+            else:
+                options[key] = value[1:-1] if len(value) > 1 and value[0] == value[-1] == "'" else value
+        
+        return PreparedStatement(
+            sql, 'COPY',
+            lambda params: self.copy_from(table_name, self._copy_path(path), options['format'], columns,
+                                          options['header'], options['delimiter']),
+            False
+        )
+    
+    def _copy_path(self, path: str) -> str:
+        """Resolve a COPY statement's file inside the copy directory, following symlinks.
         
+        SQL reaches the engine from the web views, so a statement may only read files under
+        the directory given to set_copy_directory; copy_from itself takes any path.
+        """
+        directory = self.copy_directory
+        if directory is None:
+            raise ValueError("COPY FROM a file is disabled: no copy directory is set (Database.set_copy_directory)")
+        resolved = os.path.realpath(os.path.join(directory, path))
+        if os.path.commonpath([directory, resolved]) != directory:
+            raise ValueError(f"COPY can only read files inside {directory}: {path}")
+        return resolved
+    
+    def _prepare_ddl(self, sql: str, kind: str, parse: Callable[[str], Any]) -> PreparedStatement:
+        """Schema statements run straight through their parser and are journaled for the WAL"""
+        def execute(params):
+            result = parse(sql)
+            self._log_statement(sql)
+            return result
+        
+        return PreparedStatement(sql, kind, execute, False, schema=True)
+    
+    def _number_placeholders(self, sql: str) -> str:
+        """Rewrite bare ? placeholders to ?1, ?2, ... in textual order, skipping quoted strings"""
+        if '?' not in sql:
+            return sql
+        
+        parts = []
+        position = 0
+        in_quotes = False
+        for i, char in enumerate(sql):
+            if char == "'":
+                in_quotes = not in_quotes
+            elif char == '?' and not in_quotes and not sql[i + 1:i + 2].isdigit():
+                position += 1
+                parts.append(f"?{position}")
+                continue
+            parts.append(char)
+        return ''.join(parts)
+    
+    def _get_table(self, table_name: str) -> Table:
+        table = self.tables.get(table_name)
+        if table is None:
+            raise ValueError(f"Table {table_name} not found")
+        return table
+    
     def _parse_alter_table(self, sql: str):
-        """Parse ALTER TABLE ADD COLUMN"""
+        """Parse ALTER TABLE ADD COLUMN / ALTER TABLE RENAME TO"""
+        rename = re.match(r'ALTER TABLE\s+(\w+)\s+RENAME TO\s+(\w+)$', sql, re.IGNORECASE)
+        if rename:
+            return self._rename_table(rename.group(1), rename.group(2))
+        
         pattern = r'ALTER TABLE\s+(\w+)\s+ADD COLUMN\s+(\w+)\s+(\w+)'
         match = re.match(pattern, sql, re.IGNORECASE)
         
         if not match:
             raise ValueError(f"Invalid ALTER TABLE: {sql}")
+        if self._transaction is not None:
+            raise ValueError("ALTER TABLE ADD COLUMN cannot run inside a transaction")
         
         table_name = match.group(1)
         column_name = match.group(2)
@@ -312,6 +2594,8 @@ class Database:
             raise ValueError(f"Table {table_name} not found")
         
         table = self.tables[table_name]
+        if table._snapshots:
+            raise ValueError(f"Cannot add a column to {table_name} while open cursors are reading it")
         
         
         for col in table.columns:
@@ -322,16 +2606,29 @@ class Database:
         new_column = Column(column_name, column_type, False, False, True)
         table.add_column(new_column)
         
-        
-        for row in table.rows:
-            row[column_name] = None
-        
         print(f"✓ Added column '{column_name}' to table '{table_name}'")
         return True
     
+    def _rename_table(self, old_name: str, new_name: str):
+        """Rename a table; new_name must not belong to another table"""
+        table = self._get_table(old_name)
+        if new_name == old_name:
+            return True
+        if new_name in self.tables:
+            raise ValueError(f"Table {new_name} already exists")
+        
+        # a deferred table's rows are found in the snapshot catalog under its old name
+        table.ensure_loaded()
+        self._record_undo(('RENAME', old_name, new_name))
+        del self.tables[old_name]
+        table.name = new_name
+        self.tables[new_name] = table
+        print(f"✓ Renamed table '{old_name}' to '{new_name}'")
+        return True
+    
     def _parse_create_table(self, sql: str):
         
-        pattern = r'CREATE TABLE\s+(\w+)\s*\((.*)\)'
+        pattern = r'CREATE TABLE\s+(\w+)\s*\((.*)\)(?:\s+USING\s+(\w+))?'
         match = re.match(pattern, sql, re.IGNORECASE | re.DOTALL)
         
         if not match:
@@ -339,6 +2636,7 @@ class Database:
         
         table_name = match.group(1)
         columns_sql = match.group(2).strip()
+        storage = (match.group(3) or "ROW").upper()
         
         print(f"DEBUG: Table name: {table_name}")
         print(f"DEBUG: Columns SQL: {columns_sql}")
@@ -445,10 +2743,12 @@ class Database:
             columns.append(Column(col_name, col_type, is_primary, is_unique, nullable))
         
         
-        table = Table(table_name)
+        table = make_table(table_name, storage)
+        table.metrics = self.metrics
         for col in columns:
             table.add_column(col)
         
+        self._record_undo(('CREATE', table_name, self.tables.get(table_name)))
         self.tables[table_name] = table
         print(f"✓ Created table '{table_name}' with {len(columns)} columns")
         
@@ -456,85 +2756,510 @@ class Database:
         return {
             'table': table_name,
             'columns': len(columns),
+            'storage': table.storage,
             'schema': [{'name': col.name, 'type': col.data_type} for col in columns]
         }
     
-    def _parse_insert(self, sql: str) -> int:
+    def _prepare_insert(self, sql: str) -> PreparedStatement:
+        """INSERT INTO t (cols) VALUES (...)[, (...)...]; one tuple returns the new row's primary key
+        (its row id if the table has none), several the row count"""
+        pattern = r'INSERT INTO (\w+)\s*\((.*?)\)\s*VALUES\s*(\(.*\))\s*;?$'
+        match = re.match(pattern, sql, re.IGNORECASE | re.DOTALL)
+        if not match:
+            raise ValueError(f"Invalid INSERT: {sql}")
+        
+        table_name = match.group(1)
+        columns = [col.strip() for col in match.group(2).split(',')]
+        templates = []
+        for tuple_sql in self._split_tuples(match.group(3)):
+            values = self._parse_values(tuple_sql)
+            if len(columns) != len(values):
+                raise ValueError(f"Column count ({len(columns)}) doesn't match value count ({len(values)})")
+            templates.append(dict(zip(columns, values)))
+        
+        bound = [(template, [(col, value.key) for col, value in template.items() if isinstance(value, Param)])
+                 for template in templates]
+        
+        def rows_for(params):
+            positional = isinstance(params, (list, tuple))
+            for template, bindings in bound:
+                if not bindings:
+                    yield template
+                    continue
+                row_data = dict(template)
+                for col, key in bindings:
+                    if positional and type(key) is int and key < len(params):
+                        row_data[col] = params[key]
+                    else:
+                        row_data[col] = lookup_param(key, params)
+                yield row_data
+        
+        def execute(params):
+            table = self._get_table(table_name)
+            trace = self._trace
+            if trace is None:
+                row_ids = table.insert_many(rows_for(params))
+            else:
+                node = trace.plan = PlanNode(f"Insert on {table_name}", rows=len(templates))
+                if not trace.analyze:
+                    return None
+                with trace.step(node):
+                    row_ids = table.insert_many(rows_for(params))
+                node.rows_in = node.rows_out = len(row_ids)
+            if len(templates) != 1:
+                return len(row_ids)
+            primary = next((col.name for col in table.columns if col.is_primary), None)
+            return row_ids[0] if primary is None else table._get_value(row_ids[0], primary)
+        
+        def execute_many(param_sets):
+            table = self._get_table(table_name)
+            return len(table.insert_many(row_data for params in param_sets for row_data in rows_for(params)))
+        
+        # a literal multi-row INSERT is a one-off bulk load, not worth keeping in the statement cache
+        cacheable = len(templates) == 1 or any(bindings for _, bindings in bound)
+        return PreparedStatement(sql, 'INSERT', execute, cacheable, writes=(table_name,),
+                                 batch_executor=execute_many)
+    
+    def _split_tuples(self, values_sql: str) -> List[str]:
+        """The insides of each parenthesised tuple in '(...), (...)'"""
+        tuples = []
+        position = 0
+        while True:
+            match = _VALUES_TUPLE_RE.match(values_sql, position)
+            if not match:
+                raise ValueError(f"Invalid VALUES list: {values_sql}")
+            tuples.append(match.group(1))
+            position = match.end()
+            if not match.group(2):
+                return tuples
+    
+    def _prepare_select(self, sql: str) -> PreparedStatement:
+        pattern = (r'SELECT (.*?) FROM (\w+)(?: WHERE (.*?))?(?: GROUP BY (.*?))?(?: HAVING (.*?))?'
+                   r'(?: ORDER BY (.*?))?(?: LIMIT (\d+|\?\d+|:\w+))?$')
+        match = re.match(pattern, sql, re.IGNORECASE)
+        if not match:
+            raise ValueError(f"Invalid SELECT: {sql}")
+        
+        columns_str = match.group(1)
+        table_name = match.group(2)
+        where_clause = match.group(3)
+        group_by = match.group(4)
+        having = match.group(5)
+        order = parse_order_by(match.group(6)) if match.group(6) else None
+        limit = self._parse_value(match.group(7)) if match.group(7) else None
+        
+        where = self._prepare_where(where_clause)
+        if group_by or having or has_aggregates(columns_str):
+            return self._prepare_aggregate(sql, table_name, columns_str, where, group_by, having, order, limit)
+        
+        selected = None if columns_str == "*" else [col.strip() for col in columns_str.split(',')]
+        
+        def execute(params):
+            table = self._get_table(table_name)
+            row_limit = lookup_param(limit.key, params) if isinstance(limit, Param) else limit
+            return self._run_select(table, selected, where(params), order, row_limit)
+        
+        def open_cursor(params):
+            row_limit = lookup_param(limit.key, params) if isinstance(limit, Param) else limit
+            return self._select_cursor(table_name, selected, where(params), order, row_limit)
+        
+        return PreparedStatement(sql, 'SELECT', execute, reads=(table_name,), cursor_executor=open_cursor)
+    
+    def _prepare_aggregate(self, sql: str, table_name: str, select_list: str,
+                           where: Callable[[Any], Union[str, Node, None]], group_by: Optional[str],
+                           having: Optional[str], order: Optional[List[SortKey]], limit: Any) -> PreparedStatement:
+        """SELECT with aggregates, GROUP BY or HAVING"""
+        items = parse_select_list(select_list)
+        group_columns = [name.strip() for name in group_by.split(',')] if group_by else []
+        having_tree = None
+        having_calls = []
+        if having:
+            having_sql, having_calls = rewrite_calls(having)
+            having_tree = parse_where(having_sql)
+        bind_having = has_params(having_tree) if having_tree is not None else False
+        
+        def execute(params):
+            table = self._get_table(table_name)
+            row_limit = lookup_param(limit.key, params) if isinstance(limit, Param) else limit
+            having_clause = bind_params(having_tree, params) if bind_having else having_tree
+            return self._run_aggregate(table, items, where(params), group_columns, having_clause, having_calls,
+                                       order, row_limit)
+        
+        return PreparedStatement(sql, 'SELECT', execute, reads=(table_name,))
+    
+    def _run_aggregate(self, table: Table, items: List[SelectItem], where_clause: Union[str, Node, None],
+                       group_by: List[str], having: Optional[Node], having_calls: List[Tuple],
+                       order: Optional[List[SortKey]], limit: Optional[int]) -> List[Dict]:
+        """One output row per group, aggregated in a single pass over the matching rows.
+        
+        Without WHERE or GROUP BY, COUNT(*) and MIN/MAX of an indexed column are
+        answered from table metadata without reading rows. In vectorized mode, ungrouped
+        aggregates over column-store tables are reduced on column arrays.
+        """
+        if limit is not None:
+            limit = int(limit)
+            if limit <= 0:
+                return []
+        
+        # each group is a dict of slots: GROUP BY columns and aggregate calls, by lowercase canonical name
+        types: Dict[str, Optional[str]] = {}
+        group_names = []
+        for name in group_by:
+            col = table._column(name)
+            group_names.append(col.name)
+            types[col.name.lower()] = col.data_type
+        group_slots = [name.lower() for name in group_names]
+        calls: Dict[str, Tuple[str, Optional[str], bool]] = {}
+        
+        def add_call(function, column, distinct):
+            col = table._column(column) if column is not None else None
+            slot = call_key(function, col.name if col else None, distinct)
+            if slot not in calls:
+                calls[slot] = (function, col.name if col else None, distinct)
+                types[slot] = result_type(function, col.data_type if col else None)
+            return slot
+        
+        outputs = []
+        aliases = {}
+        for item in items:
+            if item.function is None:
+                slot = table._column(item.column).name.lower()
+                if slot not in group_slots:
+                    raise ValueError(f"Column {item.column} must appear in GROUP BY or in an aggregate function")
+            else:
+                slot = add_call(item.function, item.column, item.distinct)
+            outputs.append((item.name, slot))
+            aliases[item.name.lower()] = slot
+        
+        def slot_for(name):
+            key = name.lower()
+            if key in calls:
+                return key
+            if key in aliases:
+                return aliases[key]
+            col_slot = table._column(name).name.lower()
+            if col_slot not in group_slots:
+                raise ValueError(f"Column {name} must appear in GROUP BY or in an aggregate function")
+            return col_slot
+        
+        for call in having_calls:
+            add_call(*call)
+        terms = []
+        for key in order or ():
+            call = parse_call(key.column)
+            slot = add_call(*call) if call is not None else slot_for(key.column)
+            terms.append((slot, types[slot], key))
+        
+        # under EXPLAIN each step gets a plan node; plain EXPLAIN goes on with no groups once it is planned
+        trace = self._trace
+        run = trace is None or trace.analyze
+        step = trace.step if trace is not None and trace.analyze else untraced
+        node = None
+        
+        groups = None
+        if not where_clause and not group_names:
+            if trace is not None:
+                node = PlanNode(f"Metadata Aggregate on {table.name}", [f"Output: {', '.join(calls)}"], 1)
+            with step(node):
+                metadata = {}
+                for slot, (function, column, distinct) in calls.items():
+                    found, value = (False, None) if distinct else table.quick_aggregate(function, column)
+                    if not found:
+                        break
+                    metadata[slot] = value
+                else:
+                    groups = [metadata] if run else []
+        
+        call_slots = list(calls)
+        specs = list(calls.values())
+        if groups is None and self.vectorized and not group_names:
+            if trace is not None:
+                node = PlanNode(f"Vector Aggregate on {table.name}", [f"Output: {', '.join(calls)}"], 1)
+                if where_clause:
+                    node.details.append(f"Filter: {self._where_text(where_clause)}")
+            if run:
+                with step(node):
+                    values = table.vector_aggregate(where_clause, specs)
+                if values is not None:
+                    groups = [dict(zip(call_slots, values))]
+            elif table.vector_applicable(where_clause, [column for _, column, _ in specs if column is not None]):
+                groups = []
+        
+        if groups is None:
+            getters = [(lambda row: True) if column is None else (lambda row, name=column: row.get(name))
+                       for _, column, _ in specs]
+            factories = [accumulator_factory(function, distinct, table._column(column).data_type if column else None)
+                         for function, column, distinct in specs]
+            fetch = list(dict.fromkeys(group_names + [column for _, column, _ in specs if column is not None]))
+            
+            if not group_names:
+                group_key = None
+            elif len(group_names) == 1:
+                group_key = lambda row, name=group_names[0]: row.get(name)
+            else:
+                group_key = lambda row: tuple([row.get(name) for name in group_names])
+            
+            access = None
+            if trace is not None:
+                access = table.explain_access(where_clause, self.vectorized)
+                details = [f"Group Key: {', '.join(group_names)}"] if group_names else []
+                details.append(f"Output: {', '.join(calls)}")
+                node = PlanNode("HashAggregate" if group_names else "Aggregate", details,
+                                self._estimate_groups(table, group_names), children=[access])
+            groups = []
+            if run:
+                with step(node):
+                    views = table.iter_views(where_clause, fetch, vectorized=self.vectorized, node=access)
+                    if access is not None:
+                        views = trace.rows(access, views)
+                    aggregated = hash_aggregate(views, group_key, getters, factories)
+                    if not aggregated and not group_names:
+                        aggregated = {(): [make() for make in factories]}
+                    for values, accumulators in aggregated.items():
+                        group = dict(zip(group_slots, (values,) if len(group_names) == 1 else values))
+                        group.update(zip(call_slots, [accumulator.result() for accumulator in accumulators]))
+                        groups.append(group)
+        if node is not None and run:
+            node.rows_out = len(groups)
+        
+        if having is not None:
+            predicate = compile_expression(having, lambda name: (itemgetter(slot_for(name)), types[slot_for(name)]))
+            if trace is not None:
+                node = PlanNode("Filter", [f"Having: {format_expression(having)}"], children=[node])
+            with step(node):
+                groups = [group for group in groups if predicate(group)]
+            if trace is not None and run:
+                node.rows_out = len(groups)
+        if terms:
+            if trace is not None:
+                keys = ', '.join(str(key) for _, _, key in terms)
+                details = [f"Sort Key: {keys}"] + ([f"Keep: {limit}"] if limit is not None else [])
+                node = PlanNode("Sort" if limit is None else "Top-N Sort", details, children=[node])
+            with step(node):
+                groups = self._sort_by(groups, terms, limit)
+        elif limit is not None:
+            if trace is not None:
+                node = PlanNode("Limit", [f"Rows: {limit}"], children=[node])
+            groups = groups[:limit]
+        if trace is not None:
+            if run:
+                node.rows_out = len(groups)
+            trace.plan = node
+        return [{name: group[slot] for name, slot in outputs} for group in groups]
+    
+    @staticmethod
+    def _where_text(where_clause: Union[str, Node]) -> str:
+        return format_expression(parse_where(where_clause) if isinstance(where_clause, str) else where_clause)
+    
+    @staticmethod
+    def _estimate_groups(table: Table, group_names: List[str]) -> Optional[float]:
+        """Groups a GROUP BY should make, from the columns' distinct counts; None without statistics"""
+        if not group_names:
+            return 1
+        if table.stats is None:
+            return None
+        rows = table.row_count
+        estimate = 1
+        for name in group_names:
+            column_stats = table.stats.columns.get(name)
+            if column_stats is None:
+                return None
+            # NULL is a group of its own
+            estimate *= column_stats.distinct(rows) + (1 if column_stats.nulls else 0)
+        return min(estimate, rows)
+    
+    def _run_select(self, table: Table, selected: Optional[List[str]], where_clause: Union[str, Node, None],
+                    order: Optional[List[SortKey]], limit: Optional[int]) -> List[Dict]:
+        return list(self._select_rows(table, selected, where_clause, order, limit))
+    
+    def _select_rows(self, table: Table, selected: Optional[List[str]], where_clause: Union[str, Node, None],
+                     order: Optional[List[SortKey]], limit: Optional[int],
+                     snapshot: Optional[Snapshot] = None) -> Iterator[Dict]:
+        """A SELECT's rows as a pipeline of generators; without ORDER BY, LIMIT stops the scan early.
         
-        sql = ' '.join(sql.replace('\n', ' ').split())
+        With ORDER BY, a single column with an ordered index is read in index order;
+        otherwise rows are sorted, keeping only the first LIMIT of them on a heap.
+        """
+        if limit is not None:
+            limit = int(limit)
+            if limit <= 0:
+                return iter(())
         
-        pattern = r'INSERT INTO (\w+)\s*\((.*?)\)\s*VALUES\s*\((.*)\)'
-        match = re.match(pattern, sql, re.IGNORECASE)
-        if not match:
-            raise ValueError(f"Invalid INSERT: {sql}")
         
-        table_name = match.group(1)
-        columns_str = match.group(2)
-        values_str = match.group(3)
+        fetch_columns = self._fetch_columns(table, selected, order)
+        trace = self._trace
+        if trace is not None:
+            return self._traced_select(trace, table, selected, where_clause, fetch_columns, order, limit, snapshot)
         
-        if table_name not in self.tables:
-            raise ValueError(f"Table {table_name} not found")
+        if order:
+            
+            results = None
+            if snapshot is None and len(order) == 1:
+                key = order[0]
+                results = table.select_ordered(where_clause, key.column, key.descending, limit,
+                                               fetch_columns, key.nulls_first)
+            if results is None:
+                views = table.iter_views(where_clause, fetch_columns, snapshot, self.vectorized)
+                results = self._sort_rows(table, views, order, limit)
+            views = iter(results)
+        else:
+            views = table.iter_views(where_clause, fetch_columns, snapshot, self.vectorized)
         
-        columns = [col.strip() for col in columns_str.split(',')]
-        values = self._parse_values(values_str)
         
-        if len(columns) != len(values):
-            raise ValueError(f"Column count ({len(columns)}) doesn't match value count ({len(values)})")
+        if limit is not None:
+            views = islice(views, limit)
         
-        row_data = dict(zip(columns, values))
-        return self.tables[table_name].insert(row_data)
+        return (row.to_dict(selected) for row in views)
     
-    def _parse_select(self, sql: str) -> List[Dict]:
+    def _traced_select(self, trace: Trace, table: Table, selected: Optional[List[str]],
+                       where_clause: Union[str, Node, None], fetch_columns: Optional[List[str]],
+                       order: Optional[List[SortKey]], limit: Optional[int],
+                       snapshot: Optional[Snapshot]) -> Iterator[Dict]:
+        """_select_rows under EXPLAIN: the same steps, each with its plan node (and, for ANALYZE, traced)"""
+        analyze = trace.analyze
+        views = None
+        node = None
+        if order and snapshot is None and len(order) == 1:
+            key = order[0]
+            node = table.explain_ordered(where_clause, key, limit)
+            if node is not None and analyze:
+                with trace.step(node):
+                    views = table.select_ordered(where_clause, key.column, key.descending, limit,
+                                                 fetch_columns, key.nulls_first, node)
+                if views is None:
+                    # rows changed since the snapshot was taken; it is read and sorted instead
+                    node = None
+                else:
+                    node.rows_out = len(views)
         
-        pattern = r'SELECT (.*?) FROM (\w+)(?: WHERE (.*?))?(?: ORDER BY (.*?))?(?: LIMIT (\d+))?$'
-        match = re.match(pattern, sql, re.IGNORECASE)
-        if not match:
-            raise ValueError(f"Invalid SELECT: {sql}")
+        if node is None:
+            node = table.explain_access(where_clause, self.vectorized)
+            if analyze:
+                views = trace.rows(node, table.iter_views(where_clause, fetch_columns, snapshot, self.vectorized,
+                                                          node))
+            if order:
+                keys = ', '.join(str(key) for key in order)
+                if limit is None:
+                    node = PlanNode("Sort", [f"Sort Key: {keys}"], children=[node])
+                else:
+                    node = PlanNode("Top-N Sort", [f"Sort Key: {keys}", f"Keep: {limit}"], children=[node])
+                if analyze:
+                    with trace.step(node):
+                        views = self._sort_rows(table, views, order, limit)
+                    node.rows_out = len(views)
         
-        columns_str = match.group(1)
-        table_name = match.group(2)
-        where_clause = match.group(3)
-        order_by = match.group(4)
-        limit_str = match.group(5)
+        if limit is not None:
+            node = PlanNode("Limit", [f"Rows: {limit}"], children=[node])
+            if analyze:
+                views = trace.rows(node, islice(views, limit))
         
-        if table_name not in self.tables:
-            raise ValueError(f"Table {table_name} not found")
+        trace.plan = node
+        if not analyze:
+            return iter(())
+        return (row.to_dict(selected) for row in views)
+    
+    def _select_cursor(self, table_name: str, selected: Optional[List[str]], where_clause: Union[str, Node, None],
+                       order: Optional[List[SortKey]], limit: Optional[int]) -> Cursor:
+        """Open a Cursor over a SELECT, pinning a snapshot of the table for as long as it is read"""
+        locks = self.locks
+        with locks.hold():
+            table = self._get_table(table_name)
+            if locks.table(table_name).is_writer or locks.schema.is_writer:
+                # this thread's transaction holds the table: read it directly, own changes included
+                table.ensure_loaded()
+                if table._unindexed:
+                    with locks.latched([table_name]):
+                        table.flush_indexes()
+                return Cursor(self._select_rows(table, selected, where_clause, order, limit))
+            snapshot = table.pin_snapshot(locks.latch(table_name))
         
-        table = self.tables[table_name]
+        try:
+            rows = self._select_rows(table, selected, where_clause, order, limit, snapshot)
+        except Exception:
+            table.release_snapshot(snapshot)
+            raise
+        return Cursor(rows, lambda: table.release_snapshot(snapshot))
+    
+    def _fetch_columns(self, table: Table, selected: Optional[List[str]],
+                       order: Optional[List[SortKey]]) -> Optional[List[str]]:
+        """Stored columns a SELECT needs: the projection plus the ORDER BY columns"""
+        if selected is None:
+            return None
         
-        if columns_str == "*":
-            results = table.select(where_clause)
-        else:
-            selected = [col.strip() for col in columns_str.split(',')]
-            results = table.select(where_clause)
-            results = [{col: row.get(col) for col in selected} for row in results]
+        needed = list(selected)
+        for key in order or ():
+            try:
+                needed.append(table._column(key.column).name)
+            except ValueError:
+                pass
+        return needed
+    
+    def _sort_rows(self, table: Table, rows: Iterable[RowView], order: List[SortKey],
+                   limit: Optional[int] = None) -> List[RowView]:
+        """Rows sorted by the ORDER BY terms, comparing values as their column types"""
+        terms = []
+        for key in order:
+            try:
+                col = table._column(key.column)
+            except ValueError:
+                continue
+            terms.append((col.name, col.data_type, key))
+        return self._sort_by(rows, terms, limit)
+    
+    @staticmethod
+    def _sort_by(rows: Iterable[Any], terms: List[Tuple[str, Optional[str], SortKey]],
+                 limit: Optional[int] = None) -> List[Any]:
+        """Sort rows (anything with .get) on (name, data type, SortKey) terms; with a LIMIT, only
+        the first limit rows are selected, on a heap (O(n log k) instead of a full sort)"""
+        terms = [(name, coerce_for(data_type), DataType.EXACT_TYPES.get(data_type, ()), key)
+                 for name, data_type, key in terms]
+        rows = list(rows)
+        if not terms:
+            return rows if limit is None else rows[:limit]
         
+        # every term descending: sort in reverse; mixed directions: DESC terms compare reversed
+        reverse = all(key.descending for _, _, _, key in terms)
         
-        if order_by:
-            
-            order_parts = order_by.strip().split()
-            column = order_parts[0]
-            descending = len(order_parts) > 1 and order_parts[1].upper() == 'DESC'
-            
-            def sort_key(row):
-                value = row.get(column)
-                
+        def term_key(name: str, convert: Callable, exact: Tuple[type, ...], null_part: Tuple,
+                     wrap: Optional[type]) -> Callable:
+            def key(row):
+                value = row.get(name)
                 if value is None:
-                    return '' if not descending else 'ZZZZZZ'
-                return str(value)
+                    return null_part
+                # values already of the column's type compare as they are
+                return (1, value) if type(value) in exact else (1, convert(value))
             
-            results.sort(key=sort_key, reverse=descending)
-        
+            if wrap is None:
+                return key
+            return lambda row: wrap(key(row))
         
-        if limit_str:
-            limit = int(limit_str)
-            results = results[:limit]
+        def sort_key(coerced: bool) -> Callable[[RowView], Any]:
+            keys = []
+            for name, coerce, exact, term in terms:
+                # NULLs rank 0 or 2 around the values' 1, placed for the direction they are sorted in
+                null_part = (0,) if term.nulls_first != term.descending else (2,)
+                wrap = _Descending if term.descending and not reverse else None
+                if coerced:
+                    keys.append(term_key(name, coerce, exact, null_part, wrap))
+                else:
+                    keys.append(term_key(name, str, (str,), null_part, wrap))
+            if len(keys) == 1:
+                return keys[0]
+            return lambda row: tuple([key(row) for key in keys])
         
-        return results
+        for coerced in (True, False):
+            key = sort_key(coerced)
+            try:
+                if limit is not None and limit < len(rows):
+                    select = heapq.nlargest if reverse else heapq.nsmallest
+                    return select(limit, rows, key=key)
+                return sorted(rows, key=key, reverse=reverse)
+            except TypeError:
+                # values that do not compare under the column type (e.g. text in an INTEGER column)
+                if not coerced:
+                    raise
     
-    def _parse_update(self, sql: str) -> int:
-        
-        sql = self._clean_sql(sql)
+    def _prepare_update(self, sql: str) -> PreparedStatement:
         pattern = r'UPDATE (\w+) SET (.*?)(?: WHERE (.*))?$'
         match = re.match(pattern, sql, re.IGNORECASE)
         if not match:
@@ -544,9 +3269,6 @@ class Database:
         set_clause = match.group(2)
         where_clause = match.group(3)
         
-        if table_name not in self.tables:
-            raise ValueError(f"Table {table_name} not found")
-        
         updates = {}
         
         assignments = []
@@ -577,21 +3299,65 @@ class Database:
                 else:
                     raise ValueError(f"Invalid assignment: {assignment}")
         
-        return self.tables[table_name].update(updates, where_clause)
+        bindings = [(col, value.key) for col, value in updates.items() if isinstance(value, Param)]
+        where = self._prepare_where(where_clause)
+        
+        def execute(params):
+            table = self._get_table(table_name)
+            values = updates
+            if bindings:
+                values = dict(updates)
+                for col, key in bindings:
+                    values[col] = lookup_param(key, params)
+            where_clause = where(params)
+            trace = self._trace
+            if trace is not None:
+                return self._traced_write(trace, 'Update', table, where_clause,
+                                          lambda node: table.update(values, where_clause, node))
+            return table.update(values, where_clause)
+        
+        return PreparedStatement(sql, 'UPDATE', execute, writes=(table_name,))
     
-    def _parse_delete(self, sql: str) -> int:
+    def _prepare_delete(self, sql: str) -> PreparedStatement:
         pattern = r'DELETE FROM (\w+)(?: WHERE (.*))?'
         match = re.match(pattern, sql, re.IGNORECASE)
         if not match:
             raise ValueError("Invalid DELETE")
         
         table_name = match.group(1)
-        where_clause = match.group(2)
+        where = self._prepare_where(match.group(2))
         
-        if table_name not in self.tables:
-            raise ValueError(f"Table {table_name} not found")
+        def execute(params):
+            table = self._get_table(table_name)
+            where_clause = where(params)
+            trace = self._trace
+            if trace is not None:
+                return self._traced_write(trace, 'Delete', table, where_clause,
+                                          lambda node: table.delete(where_clause, node))
+            return table.delete(where_clause)
+        
+        return PreparedStatement(sql, 'DELETE', execute, writes=(table_name,))
+    
+    def _traced_write(self, trace: Trace, operation: str, table: Table, where_clause: Union[str, Node, None],
+                      write: Callable[[PlanNode], int]) -> int:
+        """An UPDATE or DELETE under EXPLAIN: a node for the write over one for how it finds its rows"""
+        access = table.explain_access(where_clause)
+        node = trace.plan = PlanNode(f"{operation} on {table.name}", children=[access])
+        if not trace.analyze:
+            return 0
+        with trace.step(node):
+            node.rows_out = write(access)
+        return node.rows_out
+    
+    def _prepare_where(self, where_clause: Optional[str]) -> Callable[[Any], Union[str, Node, None]]:
+        """Parse a WHERE clause up front; returns a binder that yields what Table methods accept"""
+        if not where_clause:
+            return lambda params: None
         
-        return self.tables[table_name].delete(where_clause)
+        tree = parse_where(where_clause)
+        if not has_params(tree):
+            return lambda params: where_clause
+        return lambda params: bind_params(tree, params)
     
     def _parse_drop_table(self, sql: str):
         pattern = r'DROP TABLE (\w+)'
@@ -601,47 +3367,116 @@ class Database:
         
         table_name = match.group(1)
         if table_name in self.tables:
+            self._record_undo(('DROP', table_name, self.tables[table_name]))
             del self.tables[table_name]
     
+    def _parse_vacuum(self, sql: str) -> int:
+        """Parse VACUUM [table]; returns the number of deleted row slots reclaimed"""
+        match = re.match(r'VACUUM(?:\s+(\w+))?$', sql, re.IGNORECASE)
+        if not match:
+            raise ValueError(f"Invalid VACUUM: {sql}")
+        if self._transaction is not None:
+            raise ValueError("VACUUM cannot run inside a transaction")
+        
+        if match.group(1):
+            tables = [self._get_table(match.group(1))]
+        else:
+            tables = list(self.tables.values())
+        return sum(table.vacuum() for table in tables)
+    
+    def _prepare_analyze(self, sql: str) -> PreparedStatement:
+        """ANALYZE [table]: scans snapshots; writers wait only while the stats are installed (Table.analyze)"""
+        match = re.match(r'ANALYZE(?:\s+(\w+))?;?$', sql, re.IGNORECASE)
+        if not match:
+            raise ValueError(f"Invalid ANALYZE: {sql}")
+        names = [match.group(1)] if match.group(1) else list(self.tables)
+        
+        def execute(params):
+            analyzed = {}
+            for name in names:
+                table = self._get_table(name)
+                stats = table.analyze()
+                analyzed[name] = stats.analyzed_rows
+                print(f"✓ Analyzed '{name}' ({stats.analyzed_rows} rows)")
+            return analyzed
+        
+        return PreparedStatement(sql, 'ANALYZE', execute, bool(match.group(1)), reads=tuple(names))
+    
+    def _prepare_explain(self, sql: str) -> PreparedStatement:
+        """EXPLAIN [ANALYZE] statement: its plan as rows with one 'QUERY PLAN' line each.
+        
+        Plain EXPLAIN only plans, reading its tables as the statement would but writing nothing;
+        EXPLAIN ANALYZE runs the statement under its own locks and keeps what it changes.
+        """
+        match = re.match(r'EXPLAIN\s+(ANALYZE\s+)?(.+)$', sql, re.IGNORECASE | re.DOTALL)
+        if not match:
+            raise ValueError(f"Invalid EXPLAIN: {sql}")
+        analyze = bool(match.group(1))
+        inner = self.prepare(match.group(2))
+        if inner.kind in self.DIRECT_STATEMENTS or inner.kind == 'EXPLAIN':
+            raise ValueError(f"EXPLAIN does not support {inner.kind}")
+        
+        def plan(params):
+            trace = Trace(analyze)
+            self._local.trace = trace
+            try:
+                with trace:
+                    if inner.kind in self.PLANNED_STATEMENTS:
+                        inner.execute(params)
+                    else:
+                        trace.plan = PlanNode(inner.kind)
+                        if analyze:
+                            with trace.step(trace.plan):
+                                result = inner.execute(params)
+                            trace.plan.rows_out = result if type(result) is int else 0
+            finally:
+                self._local.trace = None
+            return trace.plan or PlanNode(inner.kind)
+        
+        def execute(params):
+            return [{'QUERY PLAN': line} for line in plan(params).lines()]
+        
+        if analyze:
+            return PreparedStatement(sql, 'EXPLAIN', execute, inner.cacheable, inner.reads, inner.writes,
+                                     inner.schema, plan_executor=plan)
+        return PreparedStatement(sql, 'EXPLAIN', execute, inner.cacheable, inner.reads + inner.writes,
+                                 plan_executor=plan)
+    
     def _parse_create_index(self, sql: str):
-        pattern = r'CREATE INDEX \w+ ON (\w+)\s*\((\w+)\)'
+        """Parse CREATE INDEX name ON table (col) [USING BTREE|HASH]"""
+        pattern = r'CREATE INDEX \w+ ON (\w+)(?:\s+USING\s+(\w+))?\s*\((\w+)\)(?:\s+USING\s+(\w+))?$'
         match = re.match(pattern, sql, re.IGNORECASE)
         if not match:
             raise ValueError("Invalid CREATE INDEX")
         
         table_name = match.group(1)
-        column_name = match.group(2)
+        column_name = match.group(3)
+        method = match.group(2) or match.group(4)
         
         if table_name not in self.tables:
             raise ValueError(f"Table {table_name} not found")
         
-        self.tables[table_name].create_index(column_name)
+        table = self.tables[table_name]
+        column = table._column(column_name).name
+        self._record_undo(('INDEX', table, column, table.indexes.get(column)))
+        table.create_index(column_name, method)
     
     def _parse_values(self, values_str: str) -> List[Any]:
-        values = []
-        current = ""
-        in_quotes = False
-        
-        for char in values_str:
-            if char == "'" and not in_quotes:
-                in_quotes = True
-            elif char == "'" and in_quotes:
-                in_quotes = False
-            elif char == ',' and not in_quotes:
-                values.append(self._parse_value(current.strip()))
-                current = ""
-                continue
-            current += char
-        
-        if current:
-            values.append(self._parse_value(current.strip()))
-        return values
+        parse = self._parse_value
+        return [parse(value.strip()) for value in _VALUE_RE.findall(values_str)]
     
     def _parse_value(self, value_str: str) -> Any:
-        if value_str.upper() == "NULL":
-            return None
-        elif value_str.startswith("'") and value_str.endswith("'"):
+        # the common literals first: quoted strings and plain integers
+        if value_str.startswith("'") and value_str.endswith("'"):
             return value_str[1:-1]
+        elif value_str.isdigit() and value_str.isascii():
+            return int(value_str)
+        elif value_str.upper() == "NULL":
+            return None
+        elif value_str.startswith("?") and value_str[1:].isdigit():
+            return Param(int(value_str[1:]) - 1)
+        elif value_str.startswith(":") and value_str[1:].isidentifier():
+            return Param(value_str[1:])
         elif value_str.upper() in ("TRUE", "FALSE"):
             return value_str.upper() == "TRUE"
         elif '.' in value_str:
@@ -656,6 +3491,11 @@ class Database:
                 return value_str
     
     def join(self, table1: str, table2: str, on_clause: str, join_type: str = "INNER") -> List[Dict]:
+        """Join two tables under shared locks on both (see _join)"""
+        with self._locked(reads=(table1, table2)):
+            return self._join(table1, table2, on_clause, join_type)
+    
+    def _join(self, table1: str, table2: str, on_clause: str, join_type: str = "INNER") -> List[Dict]:
         """
         Perform JOIN operation between two tables
         
@@ -681,77 +3521,160 @@ class Database:
             raise ValueError("Invalid JOIN condition. Use format: table1.column = table2.column")
         
         t1_name, t1_col, t2_name, t2_col = match.groups()
+        if t1_name == table2 and t2_name == table1 and table1 != table2:
+            t1_col, t2_col = t2_col, t1_col
         
-        results = []
+        join_type = join_type.upper()
+        if join_type not in ("INNER", "LEFT", "RIGHT", "FULL", "CROSS"):
+            raise ValueError(f"Unsupported JOIN type: {join_type}. Use INNER, LEFT, RIGHT, FULL, or CROSS")
         
-        if join_type.upper() == "INNER":
-            
-            for row1 in t1.select():
-                for row2 in t2.select():
-                    if row1.get(t1_col) == row2.get(t2_col):
-                        merged = self._merge_rows(table1, row1, table2, row2)
-                        results.append(merged)
+        left = list(t1.scan())
+        right = list(t2.scan())
+        prefix1 = f"{table1}."
+        prefix2 = f"{table2}."
         
-        elif join_type.upper() == "LEFT":
-            
-            for row1 in t1.select():
-                matched = False
-                for row2 in t2.select():
-                    if row1.get(t1_col) == row2.get(t2_col):
-                        merged = self._merge_rows(table1, row1, table2, row2)
-                        results.append(merged)
-                        matched = True
-                
-                
-                if not matched:
-                    merged = self._merge_rows(table1, row1, table2, {})
-                    results.append(merged)
+        def merge(row1, row_id1, row2, row_id2):
+            merged = {}
+            if row1 is not None:
+                for key, value in row1.items():
+                    merged[prefix1 + key] = value
+                merged[prefix1 + '_id'] = row_id1
+            if row2 is not None:
+                for key, value in row2.items():
+                    merged[prefix2 + key] = value
+                merged[prefix2 + '_id'] = row_id2
+            return merged
+        
+        results = []
         
-        elif join_type.upper() == "RIGHT":
+        if join_type == "CROSS":
             
-            for row2 in t2.select():
-                matched = False
-                for row1 in t1.select():
-                    if row1.get(t1_col) == row2.get(t2_col):
-                        merged = self._merge_rows(table1, row1, table2, row2)
-                        results.append(merged)
-                        matched = True
-                
-                
-                if not matched:
-                    merged = self._merge_rows(table1, {}, table2, row2)
-                    results.append(merged)
+            for row_id1, row1 in left:
+                for row_id2, row2 in right:
+                    results.append(merge(row1, row_id1, row2, row_id2))
+            return results
+        
+        matches = self._join_matches(t1, t1._column(t1_col), left, t2, t2._column(t2_col), right)
+        fetch2 = t2.fetch
         
-        elif join_type.upper() == "FULL":
+        if join_type in ("INNER", "LEFT", "FULL"):
             
+            if join_type == "FULL":
+                matched_right = set()
+                for right_ids in matches.values():
+                    matched_right.update(right_ids)
+                for row_id2, row2 in right:
+                    if row_id2 not in matched_right:
+                        results.append(merge(None, None, row2, row_id2))
             
-            left_results = self.join(table1, table2, on_clause, "LEFT")
+            keep_unmatched = join_type != "INNER"
+            for row_id1, row1 in left:
+                right_ids = matches.get(row_id1)
+                if right_ids:
+                    for row_id2 in right_ids:
+                        results.append(merge(row1, row_id1, fetch2(row_id2), row_id2))
+                elif keep_unmatched:
+                    results.append(merge(row1, row_id1, None, None))
+        
+        else:
             
+            left_ids_for = defaultdict(list)
+            for row_id1, _ in left:
+                for row_id2 in matches.get(row_id1, ()):
+                    left_ids_for[row_id2].append(row_id1)
             
-            for row2 in t2.select():
-                has_match = False
-                for result in left_results:
-                    if result.get(f"{table2}.{t2_col}") == row2.get(t2_col):
-                        has_match = True
-                        break
-                
-                if not has_match:
-                    merged = self._merge_rows(table1, {}, table2, row2)
-                    results.append(merged)
+            fetch1 = t1.fetch
+            for row_id2, row2 in right:
+                left_ids = left_ids_for.get(row_id2)
+                if left_ids:
+                    for row_id1 in left_ids:
+                        results.append(merge(fetch1(row_id1), row_id1, row2, row_id2))
+                else:
+                    results.append(merge(None, None, row2, row_id2))
+        
+        return results
+    
+    def _join_matches(self, t1: Table, col1: Column, left: List[Tuple[int, Dict]],
+                      t2: Table, col2: Column, right: List[Tuple[int, Dict]]) -> Dict[int, List[int]]:
+        """Map each left row id to the ascending right row ids it joins with (NULL keys never match).
+        
+        Chooses by cost (rdbms_stats.join_strategy) between an index nested-loop join on
+        either indexed column and a hash join built on either input. Inputs are sized by
+        their non-NULL join keys, using the null fractions of analyzed tables.
+        """
+        name1, name2 = col1.name, col2.name
+        index1 = t1.indexes.get(name1)
+        index2 = t2.indexes.get(name2)
+        matches: Dict[int, List[int]] = {}
+        
+        strategy, _ = rdbms_stats.join_strategy(self._join_keys(t1, name1, len(left)),
+                                                self._join_keys(t2, name2, len(right)),
+                                                index1 is not None, index2 is not None)
+        if strategy == 'index_right':
             
-            results.extend(left_results)
+            probes = 0
+            for row_id1, row1 in left:
+                key = row1.get(name1)
+                if key is not None:
+                    probes += 1
+                    right_ids = index2.get(key)
+                    if right_ids:
+                        matches[row_id1] = sorted(right_ids)
+            if t2.metrics is not None:
+                t2.metrics.access(t2.name, True, sum(map(len, matches.values())), probes)
+            return matches
         
-        elif join_type.upper() == "CROSS":
+        if strategy == 'index_left':
             
-            for row1 in t1.select():
-                for row2 in t2.select():
-                    merged = self._merge_rows(table1, row1, table2, row2)
-                    results.append(merged)
+            probes = 0
+            for row_id2, row2 in right:
+                key = row2.get(name2)
+                if key is not None:
+                    probes += 1
+                    for row_id1 in index1.get(key):
+                        matches.setdefault(row_id1, []).append(row_id2)
+            if t1.metrics is not None:
+                t1.metrics.access(t1.name, True, sum(map(len, matches.values())), probes)
+            return matches
+        
+        coerce1 = coerce_for(col1.data_type)
+        coerce2 = coerce_for(col2.data_type)
         
+        if strategy == 'hash_right':
+            
+            buckets = defaultdict(list)
+            for row_id2, row2 in right:
+                key = row2.get(name2)
+                if key is not None:
+                    buckets[coerce2(key)].append(row_id2)
+            for row_id1, row1 in left:
+                key = row1.get(name1)
+                if key is not None:
+                    right_ids = buckets.get(coerce1(key))
+                    if right_ids:
+                        matches[row_id1] = right_ids
         else:
-            raise ValueError(f"Unsupported JOIN type: {join_type}. Use INNER, LEFT, RIGHT, FULL, or CROSS")
+            
+            buckets = defaultdict(list)
+            for row_id1, row1 in left:
+                key = row1.get(name1)
+                if key is not None:
+                    buckets[coerce1(key)].append(row_id1)
+            for row_id2, row2 in right:
+                key = row2.get(name2)
+                if key is not None:
+                    for row_id1 in buckets.get(coerce2(key), ()):
+                        matches.setdefault(row_id1, []).append(row_id2)
         
-        return results
+        return matches
+    
+    @staticmethod
+    def _join_keys(table: Table, column_name: str, rows: int) -> float:
+        """Rows of an input that have a join key, estimated from the table's null fraction"""
+        column_stats = table.stats.columns.get(column_name) if table.stats is not None else None
+        if column_stats is None:
+            return float(rows)
+        return rows * (1.0 - column_stats.null_fraction(table.row_count))
     
     def _merge_rows(self, table1: str, row1: Dict, table2: str, row2: Dict) -> Dict:
         """Merge two rows with table prefixes"""
@@ -768,6 +3691,10 @@ class Database:
         return merged
     
     def get_schema(self) -> Dict:
+        with self.locks.hold():
+            return self._schema()
+    
+    def _schema(self) -> Dict:
         return {
             'name': self.name,
             'tables': {
@@ -782,98 +3709,387 @@ class Database:
                         }
                         for col in table.columns
                     ],
-                    'row_count': table.row_count
+                    'row_count': table.row_count,
+                    'dead_rows': table.dead_rows,
+                    'storage': table.storage,
+                    'stats': table.stats.describe(table.row_count) if table.stats is not None else None
                 }
                 for name, table in self.tables.items()
             }
         }
-    def save_to_file(self, filename="db.pesapal"):
-        """Save entire database to a file"""
-        import pickle
-        import os
+    def commit(self) -> Optional[int]:
+        """Commit the calling thread's transaction (or its pending changes) as one WAL record,
+        then wait as the durability mode requires"""
+        txn = self._transaction
+        lsn = self._end_transaction(txn) if txn is not None else self._append_pending()
+        self._committed(lsn)
+        return lsn
+    
+    def _append_pending(self) -> Optional[int]:
+        """Append the calling thread's pending ops to the WAL as one record; returns its LSN"""
+        pending = self._pending
+        if not pending:
+            return None
+        
+        ops = list(pending)
+        pending.clear()
+        with self._lock:
+            if self.wal is None:
+                return None
+            lsn = self.wal.append(ops)
+            self.lsn = max(self.lsn, lsn)
+        return lsn
+    
+    def _committed(self, lsn: Optional[int]):
+        """After a commit's locks are released: checkpoint if the WAL is large, then wait for durability"""
+        if lsn is None:
+            return
+        if self.wal is not None and self.wal.size() >= self.CHECKPOINT_BYTES:
+            self.checkpoint()
+        if self.scheduler is not None:
+            self.scheduler.committed(lsn)
+    
+    def checkpoint(self) -> bool:
+        """Write a snapshot of the whole database and truncate the WAL"""
+        if self.filename is None:
+            return False
+        try:
+            self._save_snapshot(self.filename)
+            return True
+        except Exception as e:
+            print(f"✗ Error checkpointing database: {e}")
+            return False
+    
+    def set_durability(self, mode: str = "sync", max_delay_ms: float = 2.0,
+                       checkpoint_interval_ms: float = 1000.0):
+        """Choose when commits reach the disk: SYNC, GROUP (commit) or ASYNC (periodic checkpoint)"""
+        mode = mode.lower()
+        if mode not in CommitScheduler.MODES:
+            raise ValueError(f"Unsupported durability mode: {mode}. Use SYNC, GROUP or ASYNC")
         
+        self.durability = {'mode': mode, 'max_delay_ms': max_delay_ms,
+                           'checkpoint_interval_ms': checkpoint_interval_ms}
+        if self.wal is not None:
+            self.scheduler.stop()
+            self.scheduler = CommitScheduler(self.wal, checkpoint=self.checkpoint, **self.durability)
+    
+    def set_vectorized(self, enabled: bool = True):
+        """Evaluate numeric WHERE clauses and aggregates on COLUMNAR tables as NumPy arrays.
         
-        data = {
-            'name': self.name,
-            'tables': {}
-        }
+        Expressions the array path cannot handle, and row-store tables, use the row path.
+        """
+        if enabled and not rdbms_vector.available():
+            raise ValueError("Vectorized execution needs NumPy (pip install numpy)")
+        self.vectorized = enabled
+    
+    def set_copy_directory(self, directory: Optional[str]):
+        """Let SQL COPY read files inside directory (relative paths are taken from it); None disables it.
         
-        for table_name, table in self.tables.items():
-            
-            table_data = {
-                'columns': [],
-                'rows': table.rows,
-                'row_count': table.row_count
+        Off by default, since any statement that reaches execute_sql could otherwise load a
+        server file into a table. Database.copy_from is not restricted.
+        """
+        if directory is not None:
+            directory = os.path.realpath(directory)
+            if not os.path.isdir(directory):
+                raise ValueError(f"Not a directory: {directory}")
+        self.copy_directory = directory
+    
+    def set_result_cache(self, enabled: bool = True, max_bytes: Optional[int] = None):
+        """Cache SELECT results (outside transactions) until a table they read is written.
+        
+        max_bytes bounds the estimated size of the cached rows (RESULT_CACHE_BYTES by default).
+        Writes made directly through Table methods, not through execute_sql, are not seen.
+        """
+        self.result_cache = ResultCache(max_bytes or self.RESULT_CACHE_BYTES) if enabled else None
+    
+    def result_cache_stats(self) -> Dict[str, Any]:
+        """Hits, misses, invalidations, evictions and size of the result cache"""
+        if self.result_cache is None:
+            return {'enabled': False}
+        return dict(self.result_cache.stats(), enabled=True)
+    
+    def set_metrics(self, enabled: bool = True):
+        """Collect engine metrics (rdbms_metrics): statement counts and latency, rows, table accesses,
+        saves and loads. Off by default; while off, statements and table accesses skip them entirely.
+        
+        Enabling again starts from zero.
+        """
+        self.metrics = MetricsRegistry() if enabled else None
+        for table in self.tables.values():
+            table.metrics = self.metrics
+    
+    def metrics_text(self) -> str:
+        """All metrics in the Prometheus text exposition format.
+        
+        Lock and result cache counters are kept whether or not metrics are enabled, so they are
+        always included.
+        """
+        samples = []
+        for lock in [self.locks.schema] + list(self.locks.tables.values()):
+            labels = (('lock', lock.name),)
+            samples.append(('pesapal_lock_acquisitions_total', labels, lock.acquisitions))
+            samples.append(('pesapal_lock_waits_total', labels, lock.waits))
+            samples.append(('pesapal_lock_wait_seconds_total', labels, lock.wait_seconds))
+            samples.append(('pesapal_lock_max_wait_seconds', labels, lock.max_wait))
+        
+        if self.result_cache is not None:
+            stats = self.result_cache.stats()
+            samples.append(('pesapal_result_cache_lookups_total', (('result', 'hit'),), stats['hits']))
+            samples.append(('pesapal_result_cache_lookups_total', (('result', 'miss'),), stats['misses']))
+            samples.append(('pesapal_result_cache_hit_ratio', (), stats['hit_ratio']))
+            samples.append(('pesapal_result_cache_entries', (), stats['entries']))
+            samples.append(('pesapal_result_cache_bytes', (), stats['bytes']))
+            samples.append(('pesapal_result_cache_invalidations_total', (), stats['invalidations']))
+            samples.append(('pesapal_result_cache_evictions_total', (), stats['evictions']))
+        
+        return (self.metrics or MetricsRegistry()).render(samples)
+    
+    def durability_stats(self) -> Dict[str, Any]:
+        """Flush counters, including how many commits each flush absorbed"""
+        if self.scheduler is None:
+            return {'mode': self.durability['mode'], 'flushes': 0, 'commits': 0}
+        return self.scheduler.stats()
+    
+    def close(self):
+        """Make every commit durable and release the WAL"""
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+        if self.wal is not None:
+            self.wal.close()
+            self.wal = None
+        self._bind_journals()
+    
+    def _log_statement(self, sql: str):
+        """Journal a schema change so WAL replay can re-run it"""
+        if self.wal is not None:
+            self._pending.append(['S', sql])
+            self._bind_journals()
+    
+    def _bind_journals(self):
+        journal = self._pending if self.wal is not None else None
+        for table in self.tables.values():
+            table.journal = journal
+    
+    def _attach_wal(self, filename: str, wal: Optional[WriteAheadLog] = None):
+        """Send every later commit to filename's WAL"""
+        if self.wal is not None and self.filename != filename:
+            self.close()
+        if self.wal is None:
+            self.wal = wal or WriteAheadLog(filename + self.WAL_SUFFIX)
+            self.wal.last_lsn = max(self.wal.last_lsn, self.lsn)
+            self.wal.open()
+            self.scheduler = CommitScheduler(self.wal, checkpoint=self.checkpoint, **self.durability)
+        self.filename = filename
+        self._bind_journals()
+    
+    def _replay(self, wal: WriteAheadLog) -> int:
+        """Re-apply WAL records newer than the loaded snapshot; returns how many were applied"""
+        applied = 0
+        for lsn, ops in wal.records():
+            if lsn <= self.lsn:
+                continue
+            for op in ops:
+                kind = op[0]
+                if kind == 'S':
+                    self.prepare(op[1]).execute(None)
+                    continue
+                table = self._get_table(op[1])
+                if kind == 'I':
+                    table._insert_row(op[3], op[2])
+                elif kind == 'U':
+                    table._update_row(op[2], op[3])
+                elif kind == 'D':
+                    table._delete_row(op[2])
+            self.lsn = lsn
+            applied += 1
+        return applied
+    
+    def save_to_file(self, filename="db.pesapal"):
+        """Checkpoint: atomically write a snapshot of the database, then truncate its WAL"""
+        try:
+            self._save_snapshot(filename)
+            print(f"✓ Database saved to {filename}")
+            return True
+        except Exception as e:
+            print(f"✗ Error saving database: {e}")
+            return False
+    
+    def _save_snapshot(self, filename: str):
+        if self._transaction is not None:
+            raise ValueError("Cannot checkpoint inside a transaction; COMMIT or ROLLBACK first")
+        
+        # shared locks on every table: readers carry on, writers wait for the snapshot
+        with self.locks.hold(), self.locks.hold(reads=list(self.tables)), self._lock:
+            start = time.perf_counter()
+            self._append_pending()
+            catalog = {
+                'name': self.name,
+                'lsn': self.lsn,
+                'tables': {}
             }
             
+            temp_name = filename + ".tmp"
+            with open(temp_name, 'wb') as f:
+                writer = PagedWriter(f)
+                for table_name, table in self.tables.items():
+                    entry = self._catalog_entry(table)
+                    entry.update(writer.add_extent(self._table_extent(table)))
+                    catalog['tables'][table_name] = entry
+                writer.finish(catalog)
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+            os.replace(temp_name, filename)
+            
             
-            for col in table.columns:
-                table_data['columns'].append({
+            with Table._fault_lock:
+                self._open_pager(filename)
+            self._attach_wal(filename)
+            self.wal.truncate()
+            
+            if self.metrics is not None:
+                self.metrics.observe('pesapal_save_duration_seconds', (), time.perf_counter() - start, IO_BUCKETS)
+                self.metrics.inc('pesapal_save_bytes_total', (), size)
+    
+    def _catalog_entry(self, table: Table) -> Dict:
+        """Schema and counters for a table's catalog entry (everything but its extent)"""
+        if not table.is_loaded:
+            
+            entry = dict(self._pager.catalog['tables'][table.name])
+            for key in ('offset', 'length', 'crc'):
+                entry.pop(key, None)
+            return entry
+        
+        return {
+            'columns': [
+                {
                     'name': col.name,
                     'data_type': col.data_type,
                     'is_primary': col.is_primary,
                     'is_unique': col.is_unique,
                     'nullable': col.nullable
-                })
-            
-            data['tables'][table_name] = table_data
+                }
+                for col in table.columns
+            ],
+            'storage': table.storage,
+            'row_count': table.row_count,
+            'next_rowid': table.next_rowid
+        }
+    
+    def _table_extent(self, table: Table) -> bytes:
+        """Serialized rows of a table; an untouched table's extent is copied without decoding it"""
+        import pickle
         
+        if not table.is_loaded:
+            return self._pager.read_extent(self._pager.catalog['tables'][table.name])
+        return pickle.dumps({
+            'rows': table.export_rows(),
+            'rowids': table.export_rowids(),
+            **table.export_indexes()
+        }, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def _open_pager(self, filename: Optional[str]):
+        if self._pager is not None:
+            self._pager.close()
+        self._pager = PagedFile(filename) if filename is not None else None
+    
+    def _fault_in(self, table: Table):
+        """Load a deferred table's rows and persisted indexes from its extent"""
+        import pickle
         
-        try:
-            with open(filename, 'wb') as f:
-                pickle.dump(data, f)
-            print(f"✓ Database saved to {filename}")
-            return True
-        except Exception as e:
-            print(f"✗ Error saving database: {e}")
-            return False
+        start = time.perf_counter()
+        entry = self._pager.catalog['tables'][table.name]
+        extent = self._pager.read_extent(entry)
+        data = pickle.loads(extent)
+        table.load_rows(data['rows'], data['rowids'], entry.get('next_rowid'))
+        rebuilt = table.load_indexes(data)
+        if rebuilt:
+            print(f"! Rebuilt indexes on {table.name}: {', '.join(rebuilt)}")
+        if self.metrics is not None:
+            self._record_load('table', time.perf_counter() - start, len(extent))
+    
+    def _record_load(self, part: str, seconds: float, size: int):
+        labels = (('part', part),)
+        self.metrics.observe('pesapal_load_duration_seconds', labels, seconds, IO_BUCKETS)
+        self.metrics.inc('pesapal_load_bytes_total', labels, size)
+    
+    def _table_from_schema(self, table_name: str, table_data: Dict) -> Table:
+        table = make_table(table_name, table_data.get('storage'))
+        table.metrics = self.metrics
+        
+        
+        for col_data in table_data['columns']:
+            column = Column(
+                name=col_data['name'],
+                data_type=col_data['data_type'],
+                is_primary=col_data['is_primary'],
+                is_unique=col_data['is_unique'],
+                nullable=col_data['nullable']
+            )
+            table.add_column(column)
+        return table
     
     def load_from_file(self, filename="db.pesapal"):
-        """Load database from file"""
+        """Open the last snapshot, replay the WAL on top of it, and keep logging to that WAL.
+        
+        Paged files only have their catalog read here; each table's rows are
+        loaded the first time the table is used. Older pickle files load eagerly.
+        """
         import pickle
-        import os
         
-        if not os.path.exists(filename):
+        wal = WriteAheadLog(filename + self.WAL_SUFFIX)
+        if not os.path.exists(filename) and not os.path.exists(wal.path):
             print(f"✗ File {filename} not found")
             return False
         
+        self.close()
         try:
-            with open(filename, 'rb') as f:
-                data = pickle.load(f)
-            
-            
-            self.name = data['name']
-            self.tables = {}
-            
-            for table_name, table_data in data['tables'].items():
-                
-                table = Table(table_name)
-                
-                
-                for col_data in table_data['columns']:
-                    column = Column(
-                        name=col_data['name'],
-                        data_type=col_data['data_type'],
-                        is_primary=col_data['is_primary'],
-                        is_unique=col_data['is_unique'],
-                        nullable=col_data['nullable']
-                    )
-                    table.add_column(column)
+            with self.locks.hold(schema=True):
+                start = time.perf_counter()
+                size = 0
+                self._pending.clear()
+                self.tables = {}
+                self.lsn = 0
+                self._open_pager(None)
                 
+                if is_paged_file(filename):
+                    self._open_pager(filename)
+                    catalog = self._pager.catalog
+                    self.name = catalog['name']
+                    self.lsn = catalog.get('lsn', 0)
+                    size = self._pager.catalog_bytes
+                    
+                    for table_name, entry in catalog['tables'].items():
+                        table = self._table_from_schema(table_name, entry)
+                        table.row_count = entry['row_count']
+                        table.defer(self._fault_in)
+                        self.tables[table_name] = table
                 
-                table.rows = table_data['rows']
-                table.row_count = table_data['row_count']
+                elif os.path.exists(filename):
+                    with open(filename, 'rb') as f:
+                        data = pickle.load(f)
+                        size = f.tell()
+                    
+                    
+                    self.name = data['name']
+                    self.lsn = data.get('lsn', 0)
+                    
+                    for table_name, table_data in data['tables'].items():
+                        table = self._table_from_schema(table_name, table_data)
+                        table.load_rows(table_data['rows'], table_data.get('rowids'), table_data.get('next_rowid'))
+                        table._rebuild_indexes()
+                        self.tables[table_name] = table
                 
+                replayed = self._replay(wal)
+                self._attach_wal(filename, wal)
+                self._schema_changed()
+                if self.metrics is not None:
+                    self._record_load('file', time.perf_counter() - start, size)
                 
-                for col in table.columns:
-                    if col.is_primary or col.is_unique:
-                        table.create_index(col.name)
+                print(f"✓ Database loaded from {filename}" + (f" (+{replayed} WAL commits)" if replayed else ""))
+                return True
                 
-                self.tables[table_name] = table
-            
-            print(f"✓ Database loaded from {filename}")
-            return True
-            
         except Exception as e:
             print(f"✗ Error loading database: {e}")
             return False
@@ -900,6 +4116,10 @@ class REPL:
                 
                 if cmd.upper() == "EXIT":
                     break
+                elif cmd.upper() == "SAVE":
+                    self.save_to_file(self.db.filename or "db.pesapal")
+                elif cmd.upper() == "LOAD":
+                    self.load_from_file(self.db.filename or "db.pesapal")
                 elif cmd.upper() == "HELP":
                     self._show_help()
                 elif cmd.upper() == "SCHEMA":
@@ -926,18 +4146,28 @@ class REPL:
     def _show_help(self):
         print("""
 SQL Commands:
-  CREATE TABLE name (col TYPE [PRIMARY KEY|UNIQUE|NOT NULL], ...)
-  INSERT INTO name (col1, col2) VALUES (val1, val2)
-  SELECT * FROM name [WHERE condition]
+  CREATE TABLE name (col TYPE [PRIMARY KEY|UNIQUE|NOT NULL], ...) [USING ROW|COLUMNAR]
+  INSERT INTO name (col1, col2) VALUES (val1, val2)[, (val1, val2) ...]
+  SELECT * FROM name [WHERE condition] [ORDER BY col [ASC|DESC] [NULLS FIRST|LAST], ...] [LIMIT n]
+  SELECT col, COUNT(*)|SUM|AVG|MIN|MAX([DISTINCT] col) [AS alias] FROM name [WHERE ...] [GROUP BY cols] [HAVING ...]
   UPDATE name SET col=val [WHERE condition]
   DELETE FROM name [WHERE condition]
   DROP TABLE name
-  CREATE INDEX idx ON name(col)
+  ALTER TABLE name ADD COLUMN col TYPE | RENAME TO new_name
+  CREATE INDEX idx ON name(col) [USING BTREE|HASH]
+  VACUUM [name]
+  ANALYZE [name]  - Collect column statistics for the planner
+  EXPLAIN [ANALYZE] statement  - Show the plan (ANALYZE runs it: rows, time, memory per step)
+  BEGIN / COMMIT / ROLLBACK
+  COPY name [(cols)] FROM 'file' [(FORMAT csv|jsonl, HEADER true|false, DELIMITER ',')]
+                - file must be inside the copy directory (Database.set_copy_directory)
 
 Special:
   HELP    - This help
   EXIT    - Quit REPL
   SCHEMA  - Show database schema
+  SAVE    - Checkpoint to db.pesapal
+  LOAD    - Reload from db.pesapal
         """)
     
     def _show_schema(self):
@@ -957,87 +4187,11 @@ Special:
                 print(f"  {col['name']}: {col['type']}{constr_str}")
 
 
-
+    
     def save_to_file(self, filename="db.pesapal"):
-        """Save entire database to a file"""
-        import pickle
-        
-        data = {
-            'name': self.name,
-            'tables': {}
-        }
-        
-        for table_name, table in self.tables.items():
-            
-            table_data = {
-                'columns': [],
-                'rows': table.rows,
-                'row_count': table.row_count
-            }
-            
-            
-            for col in table.columns:
-                table_data['columns'].append({
-                    'name': col.name,
-                    'data_type': col.data_type,
-                    'is_primary': col.is_primary,
-                    'is_unique': col.is_unique,
-                    'nullable': col.nullable
-                })
-            
-            data['tables'][table_name] = table_data
-        
-        
-        with open(filename, 'wb') as f:
-            pickle.dump(data, f)
-        
-        print(f"✓ Database saved to {filename}")
+        """Checkpoint the REPL's database (see Database.save_to_file)"""
+        return self.db.save_to_file(filename)
     
     def load_from_file(self, filename="db.pesapal"):
-        """Load database from file"""
-        import pickle
-        import os
-        
-        if not os.path.exists(filename):
-            print(f"✗ File {filename} not found")
-            return False
-        
-        try:
-            with open(filename, 'rb') as f:
-                data = pickle.load(f)
-            
-            self.name = data['name']
-            self.tables = {}
-            
-            for table_name, table_data in data['tables'].items():
-                
-                table = Table(table_name)
-                
-                
-                for col_data in table_data['columns']:
-                    column = Column(
-                        name=col_data['name'],
-                        data_type=col_data['data_type'],
-                        is_primary=col_data['is_primary'],
-                        is_unique=col_data['is_unique'],
-                        nullable=col_data['nullable']
-                    )
-                    table.add_column(column)
-                
-                
-                table.rows = table_data['rows']
-                table.row_count = table_data['row_count']
-                
-                
-                for col in table.columns:
-                    if col.is_primary or col.is_unique:
-                        table.create_index(col.name)
-                
-                self.tables[table_name] = table
-            
-            print(f"✓ Database loaded from {filename}")
-            return True
-            
-        except Exception as e:
-            print(f"✗ Error loading database: {e}")
-            return False
\ No newline at end of file
+        """Reopen the REPL's database from disk (see Database.load_from_file)"""
+        return self.db.load_from_file(filename)
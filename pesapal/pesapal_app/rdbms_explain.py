@@ -0,0 +1,219 @@
+# @Felix 2026
+
+"""
+Query plans for EXPLAIN and EXPLAIN ANALYZE.
+
+A plan is a tree of PlanNodes, one per operator, with the table accesses at
+the leaves. The executor builds it while a Trace is installed on the calling
+thread, taking the same branches it takes to run the statement, so the plan
+shown is the plan that runs. Under plain EXPLAIN it stops once the plan is
+built and nothing is read or written; under EXPLAIN ANALYZE the statement
+runs (its changes are kept) and each operator's rows pass through the Trace.
+
+Estimates come from the planner: for a table access, the rows it reads and,
+with statistics (see rdbms_stats), its cost. Actuals are rows in (for a table
+access, the rows it read from storage or an index; for any other operator,
+the rows its inputs produced), rows out, wall time and the peak memory
+allocated while the operator ran. Time and memory include the operator's
+inputs and the tracing overhead, so compare operators of one plan rather
+than traced and untraced runs; memory counts allocations of every thread
+(tracemalloc is process-wide).
+"""
+
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class PlanNode:
+    """One operator of a plan; its actuals stay None unless it ran under EXPLAIN ANALYZE"""
+
+    def __init__(self, operator: str, details: Optional[List[str]] = None, rows: Optional[float] = None,
+                 cost: Optional[float] = None, children: Optional[List['PlanNode']] = None):
+        self.operator = operator
+        self.details = details or []
+        self.rows = rows
+        self.cost = cost
+        self.children = children or []
+        self.rows_in: Optional[int] = None
+        self.rows_out: Optional[int] = None
+        self.seconds: Optional[float] = None
+        self.memory: Optional[int] = None
+
+    def input_rows(self) -> Optional[int]:
+        """Rows the operator consumed: counted for table accesses, its inputs' rows out otherwise"""
+        if self.rows_in is not None or not self.children:
+            return self.rows_in
+        counts = [child.rows_out for child in self.children]
+        return None if None in counts else sum(counts)
+
+    def lines(self) -> List[str]:
+        """The plan as indented text, one operator (then its details) per line"""
+        lines: List[str] = []
+        self._render(lines, 0)
+        return lines
+
+    def _render(self, lines: List[str], depth: int):
+        prefix = ' ' * (6 * depth - 4) + '->  ' if depth else ''
+        lines.append(prefix + self.operator + self._annotation())
+        indent = ' ' * (6 * depth + 2)
+        lines.extend(indent + detail for detail in self.details)
+        for child in self.children:
+            child._render(lines, depth + 1)
+
+    def _annotation(self) -> str:
+        text = ''
+        estimate = []
+        if self.rows is not None:
+            estimate.append(f"rows={round(self.rows)}")
+        if self.cost is not None:
+            estimate.append(f"cost={self.cost:.1f}")
+        if estimate:
+            text += f"  (est. {' '.join(estimate)})"
+        if self.rows_out is not None:
+            actual = []
+            rows_in = self.input_rows()
+            if rows_in is not None:
+                actual.append(f"in={rows_in}")
+            actual.append(f"out={self.rows_out}")
+            if self.seconds is not None:
+                actual.append(f"time={self.seconds * 1000:.3f} ms")
+            if self.memory is not None:
+                actual.append(f"memory={format_bytes(self.memory)}")
+            text += f"  (actual {' '.join(actual)})"
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        node: Dict[str, Any] = {'operator': self.operator, 'details': list(self.details)}
+        if self.rows is not None:
+            node['estimated_rows'] = round(self.rows)
+        if self.cost is not None:
+            node['estimated_cost'] = round(self.cost, 1)
+        if self.rows_out is not None:
+            node['actual'] = {
+                'rows_in': self.input_rows(),
+                'rows_out': self.rows_out,
+                'ms': round(self.seconds * 1000, 3) if self.seconds is not None else None,
+                'memory_bytes': self.memory,
+            }
+        node['children'] = [child.to_dict() for child in self.children]
+        return node
+
+    def __repr__(self):
+        return f"<PlanNode {self.operator}>"
+
+
+def format_bytes(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KiB"
+    return f"{size / (1024 * 1024):.1f} MiB"
+
+
+def counted(node: PlanNode, items: Iterable[Any]) -> Iterator[Any]:
+    """Pass items through, counting them in node.rows_in (rows a table access reads)"""
+    node.rows_in = node.rows_in or 0
+    for item in items:
+        node.rows_in += 1
+        yield item
+
+
+# traces measuring memory; tracemalloc runs while there is at least one (unless it was
+# already running, in which case it is left on)
+_memory_users = 0
+_memory_started = False
+_memory_lock = threading.Lock()
+
+
+class Trace:
+    """Installed on a thread while a statement runs under EXPLAIN; the executor puts its plan in .plan.
+
+    With analyze False the executor returns once the plan is built. With analyze True it runs
+    the statement, passing each operator's rows through rows() or its work through step().
+    """
+
+    def __init__(self, analyze: bool = False):
+        self.analyze = analyze
+        self.plan: Optional[PlanNode] = None
+        # one [memory at entry, highest peak seen] per operator call in progress
+        self._frames: List[List[int]] = []
+        self._measuring = False
+
+    def __enter__(self) -> 'Trace':
+        global _memory_users, _memory_started
+        if self.analyze:
+            with _memory_lock:
+                if not _memory_users and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _memory_started = True
+                _memory_users += 1
+            self._measuring = True
+        return self
+
+    def __exit__(self, *exc_info):
+        global _memory_users, _memory_started
+        if self._measuring:
+            self._measuring = False
+            with _memory_lock:
+                _memory_users -= 1
+                if not _memory_users and _memory_started:
+                    tracemalloc.stop()
+                    _memory_started = False
+
+    def rows(self, node: PlanNode, rows: Iterable[Any]) -> Iterator[Any]:
+        """Pass rows through, counting them in node.rows_out and timing the production of each"""
+        node.rows_out = node.rows_out or 0
+        node.seconds = node.seconds or 0.0
+        clock = time.perf_counter
+        rows = iter(rows)
+        end = object()
+        while True:
+            self._enter()
+            start = clock()
+            try:
+                row = next(rows, end)
+            finally:
+                self._exit(node, clock() - start)
+            if row is end:
+                return
+            node.rows_out += 1
+            yield row
+
+    @contextmanager
+    def step(self, node: PlanNode) -> Iterator[PlanNode]:
+        """Time and measure the work of a blocking operator (the caller sets node.rows_out)"""
+        node.seconds = node.seconds or 0.0
+        self._enter()
+        start = time.perf_counter()
+        try:
+            yield node
+        finally:
+            self._exit(node, time.perf_counter() - start)
+
+    def _enter(self):
+        # the peak is reset for each call, so the caller's peak so far is kept in its frame first
+        current, peak = tracemalloc.get_traced_memory()
+        frames = self._frames
+        if frames and peak > frames[-1][1]:
+            frames[-1][1] = peak
+        tracemalloc.reset_peak()
+        frames.append([current, current])
+
+    def _exit(self, node: PlanNode, seconds: float):
+        base, seen = self._frames.pop()
+        peak = max(seen, tracemalloc.get_traced_memory()[1])
+        if self._frames and peak > self._frames[-1][1]:
+            self._frames[-1][1] = peak
+        node.seconds += seconds
+        node.memory = max(node.memory or 0, peak - base)
+
+
+_NOT_TRACED = nullcontext()
+
+
+def untraced(node: Optional[PlanNode]) -> nullcontext:
+    """Trace.step's stand-in when a statement is not being analyzed"""
+    return _NOT_TRACED
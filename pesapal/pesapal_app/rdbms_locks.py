@@ -0,0 +1,218 @@
+# @Felix 2026
+
+"""
+Reader-writer locks for concurrent access to a Database.
+
+Every statement first takes the schema lock (shared, or exclusive for DDL
+and VACUUM), then one lock per table it touches: shared to read, exclusive
+to write. Table locks are always taken in table-name order, so statements
+that touch several tables cannot deadlock each other, and writers on
+different tables run in parallel.
+
+Each table also has a latch, which a write statement holds exclusively only
+while it runs. Snapshot readers take it briefly to pin a version and probe
+indexes, so they wait for the statement in progress but never for a
+transaction that keeps its table lock until COMMIT.
+
+Locks are reentrant per thread, and writers are preferred: once a writer is
+waiting, new readers queue behind it so a steady stream of SELECTs cannot
+starve an UPDATE. Every lock counts its acquisitions and the time callers
+spent waiting for it.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class RWLock:
+    """Writer-preferring, per-thread reentrant shared/exclusive lock with wait-time counters"""
+
+    def __init__(self, name: str, timeout: Optional[float] = None):
+        self.name = name
+        self.timeout = timeout
+
+        self._cond = threading.Condition(threading.Lock())
+        self._readers: Dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+        self._upgrading: Optional[int] = None
+
+        self.acquisitions = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self, exclusive: bool = False):
+        me = threading.get_ident()
+        with self._cond:
+            self.acquisitions += 1
+            if self._writer == me:
+                if exclusive:
+                    self._writer_depth += 1
+                else:
+                    self._readers[me] = self._readers.get(me, 0) + 1
+                return
+
+            if not exclusive:
+                if me not in self._readers:
+                    self._wait(lambda: self._writer is None and not self._writers_waiting)
+                self._readers[me] = self._readers.get(me, 0) + 1
+                return
+
+            if me in self._readers:
+                # upgrade: possible only while no other reader is also waiting to upgrade
+                if self._upgrading is not None:
+                    raise ValueError(f"Lock upgrade deadlock on {self.name}")
+                self._upgrading = me
+                try:
+                    self._wait(lambda: self._writer is None and len(self._readers) == 1)
+                finally:
+                    self._upgrading = None
+            else:
+                self._writers_waiting += 1
+                try:
+                    self._wait(lambda: self._writer is None and not self._readers)
+                finally:
+                    self._writers_waiting -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    @property
+    def is_writer(self) -> bool:
+        """True if the calling thread holds this lock exclusively"""
+        return self._writer == threading.get_ident()
+
+    def _wait(self, ready):
+        if ready():
+            return
+        start = time.perf_counter()
+        try:
+            if not self._cond.wait_for(ready, self.timeout):
+                raise ValueError(f"Lock wait timeout on {self.name}")
+        finally:
+            waited = time.perf_counter() - start
+            self.waits += 1
+            self.wait_seconds += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def release(self, exclusive: bool = False):
+        me = threading.get_ident()
+        with self._cond:
+            if exclusive:
+                if self._writer != me:
+                    raise ValueError(f"{self.name} is not held exclusively by this thread")
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+            else:
+                depth = self._readers.get(me, 0) - 1
+                if depth < 0:
+                    raise ValueError(f"{self.name} is not held by this thread")
+                if depth:
+                    self._readers[me] = depth
+                else:
+                    del self._readers[me]
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'acquisitions': self.acquisitions,
+            'waits': self.waits,
+            'wait_ms': round(self.wait_seconds * 1000, 3),
+            'max_wait_ms': round(self.max_wait * 1000, 3),
+        }
+
+
+class LockManager:
+    """The schema lock plus one RWLock per table, created on first use"""
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self.schema = RWLock('schema', timeout)
+        self.tables: Dict[str, RWLock] = {}
+        self.latches: Dict[str, RWLock] = {}
+        self._guard = threading.Lock()
+
+    def table(self, name: str) -> RWLock:
+        lock = self.tables.get(name)
+        if lock is None:
+            with self._guard:
+                lock = self.tables.setdefault(name, RWLock(f"table {name}", self.timeout))
+        return lock
+
+    def latch(self, name: str) -> RWLock:
+        latch = self.latches.get(name)
+        if latch is None:
+            with self._guard:
+                latch = self.latches.setdefault(name, RWLock(f"latch {name}", self.timeout))
+        return latch
+
+    @contextmanager
+    def latched(self, names: Iterable[str]) -> Iterator[None]:
+        """Hold the named tables' latches exclusively, shutting out snapshot readers while rows change"""
+        held: List[Tuple[RWLock, bool]] = []
+        try:
+            for name in sorted(set(names)):
+                latch = self.latch(name)
+                latch.acquire(True)
+                held.append((latch, True))
+            yield
+        finally:
+            self.release_all(held)
+
+    @contextmanager
+    def hold(self, reads: Iterable[str] = (), writes: Iterable[str] = (), schema: bool = False) -> Iterator[None]:
+        """Hold the schema lock (exclusive if schema) and shared/exclusive locks on the named tables"""
+        held: List[Tuple[RWLock, bool]] = []
+        try:
+            self.acquire_into(held, reads, writes, schema)
+            yield
+        finally:
+            self.release_all(held)
+
+    def acquire_into(self, held: List[Tuple[RWLock, bool]], reads: Iterable[str] = (),
+                     writes: Iterable[str] = (), schema: bool = False):
+        """Acquire the locks a statement needs that held does not already cover, appending each to held.
+
+        A transaction keeps one held list for its whole life, so later statements
+        only take what is new (or upgrade shared to exclusive).
+        """
+        strongest: Dict[RWLock, bool] = {}
+        for lock, exclusive in held:
+            strongest[lock] = strongest.get(lock, False) or exclusive
+
+        wanted = [(self.schema, schema)]
+        if not schema and not strongest.get(self.schema):
+            modes = dict.fromkeys(reads, False)
+            modes.update(dict.fromkeys(writes, True))
+            wanted.extend((self.table(name), modes[name]) for name in sorted(modes))
+
+        for lock, exclusive in wanted:
+            if lock in strongest and (strongest[lock] or not exclusive):
+                continue
+            lock.acquire(exclusive)
+            held.append((lock, exclusive))
+            strongest[lock] = exclusive
+
+    @staticmethod
+    def release_all(held: List[Tuple[RWLock, bool]]):
+        while held:
+            lock, exclusive = held.pop()
+            lock.release(exclusive)
+
+    def stats(self) -> Dict[str, Any]:
+        """Acquisition and wait counters for the schema lock, each table lock, and in total"""
+        locks = [self.schema] + list(self.tables.values())
+        return {
+            'schema': self.schema.stats(),
+            'tables': {name: lock.stats() for name, lock in self.tables.items()},
+            'total': {
+                'acquisitions': sum(lock.acquisitions for lock in locks),
+                'waits': sum(lock.waits for lock in locks),
+                'wait_ms': round(sum(lock.wait_seconds for lock in locks) * 1000, 3),
+                'max_wait_ms': round(max(lock.max_wait for lock in locks) * 1000, 3),
+            }
+        }
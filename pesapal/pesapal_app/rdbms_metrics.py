@@ -0,0 +1,190 @@
+# @Felix 2026
+
+"""
+Engine metrics, exposed in the Prometheus text format.
+
+A MetricsRegistry holds counters and fixed-bucket histograms keyed by metric
+name and label values. The Database records into one only while metrics are
+enabled (Database.set_metrics); while they are off the engine checks a single
+attribute per statement and per table access, and nothing else.
+
+What is recorded: statements by type (count, errors, latency), rows returned
+by statements and written to each table, each table access as an index
+probe or a full scan with the rows it read, and snapshot save/load times and
+sizes. Lock waits and cache hit ratios are kept by the lock manager and the
+caches themselves and are added when the metrics are rendered.
+"""
+
+import bisect
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# latency bucket bounds in seconds, for statements
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                   2.5, 5.0, 10.0)
+
+# bucket bounds in seconds for saves and loads, which read or write whole files
+IO_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+
+# name -> (type, help); samples are rendered in this order
+METRICS: Dict[str, Tuple[str, str]] = {
+    'pesapal_statements_total': ('counter', 'Statements executed, by statement type.'),
+    'pesapal_statement_errors_total': ('counter', 'Statements that raised an error, by statement type.'),
+    'pesapal_statement_duration_seconds': ('histogram', 'Statement latency, by statement type.'),
+    'pesapal_rows_returned_total': ('counter', 'Rows returned to callers, by statement type.'),
+    'pesapal_rows_written_total': ('counter', 'Rows inserted, updated or deleted, by table and operation.'),
+    'pesapal_rows_scanned_total': ('counter', 'Rows read from tables by index probes and full scans.'),
+    'pesapal_index_probes_total': ('counter', 'Table accesses through an index, by table.'),
+    'pesapal_full_scans_total': ('counter', 'Table accesses that read every row, by table.'),
+    'pesapal_statement_cache_lookups_total': ('counter', 'Prepared statement cache lookups, by result.'),
+    'pesapal_result_cache_lookups_total': ('counter', 'Result cache lookups, by result.'),
+    'pesapal_result_cache_hit_ratio': ('gauge', 'Fraction of result cache lookups that were hits.'),
+    'pesapal_result_cache_entries': ('gauge', 'Results held by the result cache.'),
+    'pesapal_result_cache_bytes': ('gauge', 'Estimated size of the results held by the result cache.'),
+    'pesapal_result_cache_invalidations_total': ('counter', 'Cached results dropped because a table changed.'),
+    'pesapal_result_cache_evictions_total': ('counter', 'Cached results dropped to stay within the size bound.'),
+    'pesapal_lock_acquisitions_total': ('counter', 'Lock acquisitions, by lock.'),
+    'pesapal_lock_waits_total': ('counter', 'Lock acquisitions that had to wait, by lock.'),
+    'pesapal_lock_wait_seconds_total': ('counter', 'Time spent waiting for locks, by lock.'),
+    'pesapal_lock_max_wait_seconds': ('gauge', 'Longest single wait for a lock, by lock.'),
+    'pesapal_save_duration_seconds': ('histogram', 'Time to write a snapshot (checkpoint).'),
+    'pesapal_save_bytes_total': ('counter', 'Bytes of snapshot files written.'),
+    'pesapal_load_duration_seconds': ('histogram', 'Time to open a snapshot (file) or read a deferred table (table).'),
+    'pesapal_load_bytes_total': ('counter', 'Bytes read from snapshot files, by part.'),
+}
+
+_ORDER = {name: position for position, name in enumerate(METRICS)}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Observation counts per bucket (the last bucket is +Inf), with their sum"""
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        # bucket i counts values <= bounds[i]; the cumulative counts are summed when rendered
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms, keyed by (metric name, labels)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: Labels, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def statement(self, kind: str, seconds: float, failed: bool = False):
+        labels = (('type', kind),)
+        with self._lock:
+            key = ('pesapal_statements_total', labels)
+            self._counters[key] = self._counters.get(key, 0) + 1
+            if failed:
+                key = ('pesapal_statement_errors_total', labels)
+                self._counters[key] = self._counters.get(key, 0) + 1
+            key = ('pesapal_statement_duration_seconds', labels)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def access(self, table: str, index: bool, rows: int, accesses: int = 1):
+        """Count table accesses (index probes or full scans) and the rows they read"""
+        labels = (('table', table),)
+        name = 'pesapal_index_probes_total' if index else 'pesapal_full_scans_total'
+        with self._lock:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0) + accesses
+            key = ('pesapal_rows_scanned_total', labels)
+            self._counters[key] = self._counters.get(key, 0) + rows
+
+    def counting_access(self, table: str, index: bool, items: Iterable[Any]) -> Iterator[Any]:
+        """Pass a table access's rows through, counting it once they stop being read"""
+        count = 0
+        try:
+            for item in items:
+                count += 1
+                yield item
+        finally:
+            self.access(table, index, count)
+
+    def counting(self, name: str, labels: Labels, items: Iterable[Any]) -> Iterator[Any]:
+        """Pass items through, adding how many were read to a counter once they stop being read"""
+        count = 0
+        try:
+            for item in items:
+                count += 1
+                yield item
+        finally:
+            self.inc(name, labels, count)
+
+    def render(self, samples: Iterable[Tuple[str, Labels, float]] = ()) -> str:
+        """The registry, plus samples collected elsewhere, in the Prometheus text exposition format"""
+        grouped: Dict[str, List[str]] = {}
+        with self._lock:
+            counters = list(self._counters.items())
+            histograms = [(key, h.bounds, list(h.counts), h.sum, h.count) for key, h in self._histograms.items()]
+        for (name, labels), value in counters:
+            grouped.setdefault(name, []).append(_sample(name, labels, value))
+        for name, labels, value in samples:
+            grouped.setdefault(name, []).append(_sample(name, labels, value))
+        for (name, labels), bounds, counts, total, count in sorted(histograms):
+            lines = grouped.setdefault(name, [])
+            cumulative = 0
+            for bound, bucket in zip(bounds + (float('inf'),), counts):
+                cumulative += bucket
+                lines.append(_sample(name + '_bucket', labels + (('le', _number(bound)),), cumulative))
+            lines.append(_sample(name + '_sum', labels, total))
+            lines.append(_sample(name + '_count', labels, count))
+
+        out: List[str] = []
+        for name in sorted(grouped, key=lambda n: (_ORDER.get(n, len(_ORDER)), n)):
+            kind, help_text = METRICS.get(name, ('untyped', ''))
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(grouped[name] if kind == 'histogram' else sorted(grouped[name]))
+        return '\n'.join(out) + '\n'
+
+
+def _sample(name: str, labels: Labels, value: float) -> str:
+    if not labels:
+        return f"{name} {_number(value)}"
+    text = ','.join(f'{key}="{_escape(str(label))}"' for key, label in labels)
+    return f"{name}{{{text}}} {_number(value)}"
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value: Optional[float]) -> str:
+    if value is None:
+        return 'NaN'
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
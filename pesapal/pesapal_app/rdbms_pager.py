@@ -0,0 +1,115 @@
+# @Felix 2026
+
+"""
+Paged database file format.
+
+    page 0          header: magic, format version, page size, catalog extent
+    pages 1..       one extent per table (its serialized rows), page aligned
+    last pages      the catalog: JSON describing the database and every table,
+                    including where its extent lives and a CRC32 of it
+
+Opening a file maps it with mmap and parses only the header and catalog, so
+startup cost does not depend on how much data the tables hold. A table's
+extent is read (and checked) the first time the table is used.
+"""
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from typing import Any, Dict
+
+
+MAGIC = b'PESAPAL\x00'
+FORMAT_VERSION = 1
+PAGE_SIZE = 4096
+
+# magic, version, page size, catalog offset, catalog length, catalog crc32
+_HEADER = struct.Struct('<8sHIQQI')
+
+
+def is_paged_file(path: str) -> bool:
+    """True if path starts with the paged-format magic (older files are plain pickles)"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class PagedWriter:
+    """Streams table extents into a new file, then writes the catalog and header"""
+
+    def __init__(self, f):
+        self.f = f
+        self.f.write(b'\x00' * PAGE_SIZE)
+
+    def _align(self):
+        position = self.f.tell()
+        padding = -position % PAGE_SIZE
+        if padding:
+            self.f.write(b'\x00' * padding)
+        return position + padding
+
+    def add_extent(self, data: bytes) -> Dict[str, int]:
+        """Write one page-aligned extent; returns its catalog entry fields"""
+        offset = self._align()
+        self.f.write(data)
+        return {'offset': offset, 'length': len(data), 'crc': zlib.crc32(data)}
+
+    def finish(self, catalog: Dict[str, Any]):
+        payload = json.dumps(catalog, separators=(',', ':'), default=str).encode('utf-8')
+        offset = self._align()
+        self.f.write(payload)
+        self._align()
+
+        self.f.seek(0)
+        self.f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, PAGE_SIZE, offset, len(payload), zlib.crc32(payload)))
+        self.f.seek(0, os.SEEK_END)
+
+
+class PagedFile:
+    """Read-only, memory-mapped view of a paged database file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        magic, version, page_size, offset, length, crc = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a paged database file")
+        if version > FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} uses file format version {version}; this build reads up to {FORMAT_VERSION}")
+
+        self.version = version
+        self.page_size = page_size
+        payload = self._map[offset:offset + length]
+        if zlib.crc32(payload) != crc:
+            self.close()
+            raise ValueError(f"{path}: catalog checksum mismatch")
+        self.catalog: Dict[str, Any] = json.loads(payload)
+        self.catalog_bytes = length
+
+    def read_extent(self, entry: Dict[str, Any]) -> bytes:
+        """The bytes of one table extent, verified against its catalog CRC"""
+        offset, length = entry['offset'], entry['length']
+        data = self._map[offset:offset + length]
+        if zlib.crc32(data) != entry['crc']:
+            raise ValueError(f"{self.path}: extent at page {offset // self.page_size} is corrupt")
+        return data
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,323 @@
+# @Felix 2026
+
+"""
+Table statistics and the cost model the planner uses them with.
+
+ANALYZE scans a table once and records, per column: a HyperLogLog sketch of
+its distinct values, its NULL count, min and max, and an equi-depth
+histogram and most-common-values list built from a sample of rows. After that the table keeps its stats
+up to date as rows change: inserts add to the sketch and widen min/max,
+NULL counts follow every change, and the histogram is kept until the next
+ANALYZE (estimates scale it by the current row count). Tables that were
+never analyzed have no stats and cost nothing to maintain.
+
+Estimates are deliberately simple: equality selects 1/distinct of the
+non-NULL rows left over by the most common values (which use their sampled
+frequency), ranges
+are interpolated within histogram buckets, and costs count rows touched,
+with a row fetched through an index costing more than one read by a scan.
+"""
+
+import bisect
+import random
+from collections import Counter
+from math import log
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .rdbms_where import coerce_for
+
+
+# cost of reading and testing one row in a full scan
+SEQ_ROW_COST = 1.0
+
+# cost of one row reached through an index: row id sort, random fetch, residual test
+# (about 3x a scanned row on the row store, measured beyond the output both paths build)
+INDEX_ROW_COST = 3.0
+
+# cost of one index lookup (per key probed)
+INDEX_PROBE_COST = 1.0
+
+# hash join: inserting a build row, and probing with a row from the other side
+HASH_BUILD_COST = 1.5
+HASH_PROBE_COST = 1.0
+
+# histogram buckets per column, and rows ANALYZE samples to build them
+HISTOGRAM_BUCKETS = 32
+SAMPLE_ROWS = 30000
+
+# most common values kept per column, with their frequencies
+COMMON_VALUES = 16
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# rows ANALYZE folds into the stats at a time
+_ANALYZE_CHUNK = 10000
+
+# selectivity assumed for a range when a column has neither histogram nor numeric min/max
+DEFAULT_RANGE_SELECTIVITY = 1 / 3
+
+
+class HyperLogLog:
+    """Distinct-count sketch: 2**precision one-byte registers, ~1.6% error at precision 12"""
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any):
+        self.add_many((value,))
+
+    def add_many(self, values: Iterable[Any]):
+        registers = self.registers
+        shift = 64 - self.precision
+        rest = (1 << shift) - 1
+        for value in values:
+            # splitmix64 finaliser over Python's hash, which is the identity for small ints
+            h = hash(value) & _MASK64
+            h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+            h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+            h ^= h >> 31
+            rank = shift - (h & rest).bit_length() + 1
+            index = h >> shift
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        raw = (0.7213 / (1 + 1.079 / m)) * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # small range correction: linear counting
+            return round(m * log(m / zeros))
+        return round(raw)
+
+
+class ColumnStats:
+    """Statistics of one column; min/max and the histogram are in the column's comparison type"""
+
+    def __init__(self, name: str, data_type: Optional[str]):
+        self.name = name
+        self.data_type = data_type
+        self.coerce = coerce_for(data_type)
+        self.sketch = HyperLogLog()
+        self.nulls = 0
+        self.min: Any = None
+        self.max: Any = None
+        self.histogram: List[Any] = []
+        # most common values (comparison keys) -> fraction of non-NULL values
+        self.common: Dict[Any, float] = {}
+
+    def add(self, value: Any):
+        self.add_many([value])
+
+    def add_many(self, values: List[Any]):
+        present = [value for value in values if value is not None]
+        self.nulls += len(values) - len(present)
+        if not present:
+            return
+        self.sketch.add_many(present)
+        try:
+            keys = list(map(self.coerce, present))
+            low, high = min(keys), max(keys)
+        except TypeError:
+            return
+        if self.min is None or low < self.min:
+            self.min = low
+        if self.max is None or high > self.max:
+            self.max = high
+
+    def remove(self, value: Any):
+        # the sketch and min/max cannot shrink; they stay upper bounds until the next ANALYZE
+        if value is None:
+            self.nulls -= 1
+
+    def build_histogram(self, sample: List[Any], buckets: int = HISTOGRAM_BUCKETS):
+        """From sampled values: equi-depth bucket bounds (each bucket holds ~1/buckets of the
+        non-NULL values) and the values clearly more common than average"""
+        try:
+            keys = sorted(self.coerce(value) for value in sample if value is not None)
+        except TypeError:
+            keys = []
+        self.histogram = []
+        self.common = {}
+        if not keys:
+            return
+        last = len(keys) - 1
+        self.histogram = [keys[round(i * last / buckets)] for i in range(buckets + 1)]
+
+        counts = Counter(keys)
+        # when every distinct value fits in the list, all of them are kept
+        threshold = 2 if len(counts) <= COMMON_VALUES else max(2, 1.25 * len(keys) / len(counts))
+        for key, count in counts.most_common(COMMON_VALUES):
+            if count < threshold:
+                break
+            self.common[key] = count / len(keys)
+
+    def distinct(self, rows: int) -> int:
+        return max(1, min(self.sketch.estimate(), rows - self.nulls)) if rows > self.nulls else 0
+
+    def null_fraction(self, rows: int) -> float:
+        return min(1.0, self.nulls / rows) if rows else 0.0
+
+    def equality_selectivity(self, value: Any, rows: int) -> float:
+        """Estimated fraction of rows where column = value"""
+        if value is None or not rows:
+            return 0.0
+        distinct = self.distinct(rows)
+        if not distinct:
+            return 0.0
+        non_null = 1.0 - self.null_fraction(rows)
+        common = self.common
+        try:
+            key = self.coerce(value)
+            if self.min is not None and (key < self.min or key > self.max):
+                return 0.0
+            if key in common:
+                return non_null * common[key]
+        except TypeError:
+            pass
+        # the values that are not common share what the common ones leave
+        rest = max(0.0, 1.0 - sum(common.values()))
+        return non_null * rest / max(1, distinct - len(common))
+
+    def _position(self, key: Any, after: bool = False) -> float:
+        """Estimated fraction of non-NULL values below key (at or below it if after)"""
+        bounds = self.histogram
+        if not bounds:
+            low, high = self.min, self.max
+            if isinstance(low, (int, float)) and isinstance(high, (int, float)) and high > low:
+                return min(1.0, max(0.0, (key - low) / (high - low)))
+            return 0.5
+        if key < bounds[0] or (key == bounds[0] and not after):
+            return 0.0
+        if key > bounds[-1] or (key == bounds[-1] and after):
+            return 1.0
+        bucket = (bisect.bisect_right if after else bisect.bisect_left)(bounds, key) - 1
+        low, high = bounds[bucket], bounds[bucket + 1]
+        within = 0.5
+        if isinstance(key, (int, float)) and isinstance(low, (int, float)) and high > low:
+            within = (key - low) / (high - low)
+        return (bucket + within) / (len(bounds) - 1)
+
+    def range_selectivity(self, low: Any, high: Any, low_inclusive: bool, high_inclusive: bool,
+                          rows: int) -> float:
+        """Estimated fraction of rows between low and high (either bound may be None)"""
+        if not rows:
+            return 0.0
+        if not self.histogram and not isinstance(self.min, (int, float)):
+            return DEFAULT_RANGE_SELECTIVITY
+        try:
+            start = self._position(low, not low_inclusive) if low is not None else 0.0
+            stop = self._position(high, high_inclusive) if high is not None else 1.0
+        except TypeError:
+            return DEFAULT_RANGE_SELECTIVITY
+        # a bound inside one value's run still matches at least one distinct value
+        fraction = max(stop - start, 1 / max(1, self.distinct(rows)))
+        return min(1.0, fraction) * (1.0 - self.null_fraction(rows))
+
+    def describe(self, rows: int) -> Dict[str, Any]:
+        return {
+            'distinct': self.distinct(rows),
+            'null_fraction': round(self.null_fraction(rows), 4),
+            'min': self.min,
+            'max': self.max,
+            'histogram': list(self.histogram),
+            'most_common': [[key, round(fraction, 4)] for key, fraction in self.common.items()],
+        }
+
+
+class TableStats:
+    """Per-column stats of a table, and how many row changes they have absorbed since ANALYZE"""
+
+    def __init__(self, columns: List[Tuple[str, Optional[str]]], rows: int):
+        self.columns: Dict[str, ColumnStats] = {name: ColumnStats(name, data_type) for name, data_type in columns}
+        self.analyzed_rows = rows
+        self.modified = 0
+
+    def add_column(self, name: str, data_type: Optional[str], rows: int):
+        """A column added to the table, NULL in its existing rows"""
+        stats = self.columns[name] = ColumnStats(name, data_type)
+        stats.nulls = rows
+
+    def insert(self, row: Dict[str, Any]):
+        self.insert_many([row])
+
+    def insert_many(self, rows: List[Any]):
+        self.modified += len(rows)
+        for name, stats in self.columns.items():
+            stats.add_many([row.get(name) for row in rows])
+
+    def delete(self, row: Dict[str, Any]):
+        self.modified += 1
+        for name, stats in self.columns.items():
+            stats.remove(row.get(name))
+
+    def update(self, old_values: Dict[str, Any], changes: Dict[str, Any]):
+        self.modified += 1
+        for name, value in changes.items():
+            stats = self.columns.get(name)
+            if stats is not None:
+                stats.remove(old_values.get(name))
+                stats.add(value)
+
+    def describe(self, rows: int) -> Dict[str, Any]:
+        return {
+            'analyzed_rows': self.analyzed_rows,
+            'modified_since_analyze': self.modified,
+            'columns': {name: stats.describe(rows) for name, stats in self.columns.items()},
+        }
+
+
+def analyze(columns: List[Tuple[str, Optional[str]]], rows: Any, sample_rows: int = SAMPLE_ROWS,
+            buckets: int = HISTOGRAM_BUCKETS) -> TableStats:
+    """Stats from one pass over rows (mappings): full counts, histograms from a reservoir sample"""
+    stats = TableStats(columns, 0)
+    column_stats = list(stats.columns.values())
+    sample: List[Any] = []
+    rand = random.Random(0)
+    seen = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if seen < sample_rows:
+            sample.append(row)
+        else:
+            slot = rand.randrange(seen + 1)
+            if slot < sample_rows:
+                sample[slot] = row
+        seen += 1
+        if len(chunk) == _ANALYZE_CHUNK:
+            stats.insert_many(chunk)
+            chunk = []
+    stats.insert_many(chunk)
+    for col in column_stats:
+        col.build_histogram([row.get(col.name) for row in sample], buckets)
+    stats.analyzed_rows = seen
+    stats.modified = 0
+    return stats
+
+
+def scan_cost(rows: int) -> float:
+    return rows * SEQ_ROW_COST
+
+
+def probe_cost(estimated_rows: float, lookups: int) -> float:
+    return lookups * INDEX_PROBE_COST + estimated_rows * INDEX_ROW_COST
+
+
+def join_strategy(left_keys: float, right_keys: float, left_indexed: bool, right_indexed: bool) -> Tuple[str, float]:
+    """Cheapest way to match two inputs given how many non-NULL join keys each has.
+
+    Returns ('index_right', cost) to probe the right table's index with each left row,
+    'index_left' for the reverse, or 'hash_right'/'hash_left' naming the hash join build side.
+    """
+    # in order of preference on equal cost: an index over a hash table, then the right side
+    options = []
+    if right_indexed:
+        options.append(('index_right', left_keys * INDEX_PROBE_COST))
+    if left_indexed:
+        options.append(('index_left', right_keys * INDEX_PROBE_COST))
+    options.append(('hash_right', right_keys * HASH_BUILD_COST + left_keys * HASH_PROBE_COST))
+    options.append(('hash_left', left_keys * HASH_BUILD_COST + right_keys * HASH_PROBE_COST))
+    return min(options, key=lambda option: option[1])
@@ -0,0 +1,425 @@
+# @Felix 2026
+
+"""
+Vectorized execution over column-store tables, used when NumPy is installed.
+
+The INTEGER, REAL and BOOLEAN ColumnVectors of a ColumnarTable keep their
+values in typed arrays, which NumPy views without copying. A WHERE tree over
+such columns is compiled into functions that turn one batch of slots into
+boolean masks, and SUM/AVG/MIN/MAX/COUNT reduce the masked arrays directly.
+
+Masks follow the row compiler's three-valued logic: every boolean expression
+yields a pair of masks (known true, known false), so NULLs, NOT and IN lists
+holding NULL give the same rows as the row path. Anything else (TEXT and DATE
+columns, LIKE, non-numeric literals, a column that fell back to list storage)
+raises Unsupported and the caller takes the row path.
+
+The arrays are views of live storage: callers must keep writers out (hold the
+table's latch) while these functions run. Nothing they return refers to the
+arrays.
+"""
+
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .rdbms_where import (
+    Node, Literal, ColumnRef, Compare, Arith, Negate, And, Or, Not, IsNull, InList, Between, coerce_for,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional: without NumPy every query takes the row path
+    np = None
+
+
+# slots evaluated at a time; bounds the temporary masks and arrays a query holds
+BATCH_ROWS = 1 << 16
+
+# below this many slots the row path is as fast, so it is used
+MIN_ROWS = 4096
+
+_DTYPES = {'q': 'int64', 'd': 'float64', 'b': 'int8'}
+
+_COMPARE = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+_FLIPPED = {'=': '=', '!=': '!=', '<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+
+class Unsupported(Exception):
+    """The expression or a column it reads cannot be evaluated on arrays"""
+
+
+def available() -> bool:
+    return np is not None
+
+
+# -- batches ----------------------------------------------------------------
+
+class _Batch:
+    """Array views of slots [start, stop) of a ColumnarTable"""
+
+    def __init__(self, table: Any, start: int, stop: int):
+        self.table = table
+        self.start = start
+        self.stop = stop
+        self.size = stop - start
+        self._columns: Dict[str, Tuple[Any, Any]] = {}
+
+    def column(self, name: str) -> Tuple[Any, Any]:
+        """(values, valid): valid is a mask, or np.True_ when the column holds no NULLs"""
+        cached = self._columns.get(name)
+        if cached is not None:
+            return cached
+        vector = self.table.vectors[name]
+        values = np.frombuffer(vector.values, dtype=_DTYPES[vector.typecode])[self.start:self.stop]
+        valid = np.True_
+        if vector.null_count:
+            # BATCH_ROWS is a multiple of 8, so a batch starts on a bitmap byte
+            bits = np.frombuffer(vector.validity, dtype=np.uint8)[self.start >> 3:(self.stop + 7) >> 3]
+            valid = np.unpackbits(bits, bitorder='little')[:self.size].view(bool)
+        self._columns[name] = cached = (values, valid)
+        return cached
+
+    def live(self) -> Any:
+        if not self.table.dead_rows:
+            return np.True_
+        return np.frombuffer(self.table.live, dtype=np.uint8)[self.start:self.stop].view(bool)
+
+
+def _batches(table: Any):
+    length = len(table.live)
+    for start in range(0, length, BATCH_ROWS):
+        yield _Batch(table, start, min(start + BATCH_ROWS, length))
+
+
+def _mask(value: Any, size: int) -> Any:
+    """A full-length boolean array from a mask or a scalar"""
+    if isinstance(value, np.ndarray):
+        return value
+    return np.full(size, bool(value))
+
+
+# -- compiler ---------------------------------------------------------------
+
+class _VectorCompiler:
+    """Turns a WHERE tree into closures over a _Batch.
+
+    Value nodes give (values, valid) and boolean nodes give (true, false);
+    each part is an array or a scalar that broadcasts over the batch.
+    """
+
+    def __init__(self, table: Any):
+        self.table = table
+
+    def column(self, name: str) -> Tuple[str, str]:
+        """The stored name and type of a column that can be read as an array"""
+        try:
+            col = self.table._column(name)
+        except ValueError:
+            raise Unsupported(name)
+        vector = self.table.vectors[col.name]
+        if vector.typecode is None:
+            raise Unsupported(name)
+        return col.name, col.data_type
+
+    def value_type(self, node: Node) -> Optional[str]:
+        return self.column(node.name)[1] if isinstance(node, ColumnRef) else None
+
+    @staticmethod
+    def literal(value: Any, data_type: Optional[str] = None) -> Any:
+        if value is None:
+            return None
+        value = coerce_for(data_type)(value)
+        if not isinstance(value, (bool, int, float)):
+            raise Unsupported(repr(value))
+        return value
+
+    # value expressions
+
+    def value(self, node: Node) -> Callable[[_Batch], Tuple[Any, Any]]:
+        if isinstance(node, Literal):
+            # NumPy scalars, so ~ on anything derived from them stays a boolean NOT
+            value = self.literal(node.value)
+            try:
+                constant = (np.asarray(0), np.False_) if value is None else (np.asarray(value), np.True_)
+            except OverflowError:
+                raise Unsupported(repr(value))
+            return lambda batch: constant
+        if isinstance(node, ColumnRef):
+            name = self.column(node.name)[0]
+            return lambda batch: batch.column(name)
+        if isinstance(node, Negate):
+            operand = self.value(node.operand)
+
+            def negate(batch):
+                values, valid = operand(batch)
+                return -values, valid
+            return negate
+        if isinstance(node, Arith):
+            return self._arith(node)
+        raise Unsupported(type(node).__name__)
+
+    def _arith(self, node: Arith) -> Callable[[_Batch], Tuple[Any, Any]]:
+        left = self.value(node.left)
+        right = self.value(node.right)
+        op = node.op
+
+        def arith(batch):
+            a, a_valid = left(batch)
+            b, b_valid = right(batch)
+            valid = a_valid & b_valid
+            if op == '+':
+                return a + b, valid
+            if op == '-':
+                return a - b, valid
+            if op == '*':
+                return a * b, valid
+            # division by zero is NULL, as on the row path
+            nonzero = b != 0
+            safe = np.where(nonzero, b, 1)
+            result = np.true_divide(a, safe) if op == '/' else np.mod(a, safe)
+            return result, valid & nonzero
+        return arith
+
+    # boolean expressions
+
+    def condition(self, node: Node) -> Callable[[_Batch], Tuple[Any, Any]]:
+        if isinstance(node, Compare):
+            return self._compare(node)
+        if isinstance(node, And):
+            items = [self.condition(item) for item in node.items]
+
+            def conjunction(batch):
+                true, false = items[0](batch)
+                for item in items[1:]:
+                    item_true, item_false = item(batch)
+                    true = true & item_true
+                    false = false | item_false
+                return true, false
+            return conjunction
+        if isinstance(node, Or):
+            items = [self.condition(item) for item in node.items]
+
+            def disjunction(batch):
+                true, false = items[0](batch)
+                for item in items[1:]:
+                    item_true, item_false = item(batch)
+                    true = true | item_true
+                    false = false & item_false
+                return true, false
+            return disjunction
+        if isinstance(node, Not):
+            operand = self.condition(node.operand)
+
+            def negation(batch):
+                true, false = operand(batch)
+                return false, true
+            return negation
+        if isinstance(node, IsNull):
+            operand = self.value(node.operand)
+            negated = node.negated
+
+            def is_null(batch):
+                valid = operand(batch)[1]
+                return (valid, ~valid) if negated else (~valid, valid)
+            return is_null
+        if isinstance(node, InList):
+            return self._in_list(node)
+        if isinstance(node, Between):
+            return self._between(node)
+        if isinstance(node, (ColumnRef, Literal)):
+            # a bare value is tested for truth
+            operand = self.value(node)
+
+            def truth(batch):
+                values, valid = operand(batch)
+                nonzero = values != 0
+                return valid & nonzero, valid & ~nonzero
+            return truth
+        raise Unsupported(type(node).__name__)
+
+    def _compare(self, node: Compare) -> Callable[[_Batch], Tuple[Any, Any]]:
+        left, right, op = node.left, node.right, node.op
+        if isinstance(left, Literal) and isinstance(right, ColumnRef):
+            left, right, op = right, left, _FLIPPED[op]
+        if isinstance(left, ColumnRef) and isinstance(right, Literal):
+            # the literal takes the column's type, as on the row path
+            literal = self.literal(right.value, self.value_type(left))
+            if literal is None:
+                return lambda batch: (np.False_, np.False_)
+            right = Literal(literal)
+
+        left_fn = self.value(left)
+        right_fn = self.value(right)
+        fn = _COMPARE[op]
+
+        def compare(batch):
+            a, a_valid = left_fn(batch)
+            b, b_valid = right_fn(batch)
+            valid = a_valid & b_valid
+            result = fn(a, b)
+            return valid & result, valid & ~result
+        return compare
+
+    def _in_list(self, node: InList) -> Callable[[_Batch], Tuple[Any, Any]]:
+        if not all(isinstance(item, Literal) for item in node.items):
+            raise Unsupported("IN with non-literal items")
+        data_type = self.value_type(node.operand)
+        values = [self.literal(item.value, data_type) for item in node.items]
+        # a NULL in the list turns every miss from false into unknown
+        miss_known = not any(value is None for value in values)
+        members = np.array([value for value in values if value is not None])
+        operand = self.value(node.operand)
+        negated = node.negated
+
+        def membership(batch):
+            values, valid = operand(batch)
+            found = np.isin(values, members) if members.size else np.zeros(batch.size, dtype=bool)
+            hit = valid & found
+            miss = valid & ~found if miss_known else np.False_
+            return (miss, hit) if negated else (hit, miss)
+        return membership
+
+    def _between(self, node: Between) -> Callable[[_Batch], Tuple[Any, Any]]:
+        if not (isinstance(node.low, Literal) and isinstance(node.high, Literal)):
+            raise Unsupported("BETWEEN with non-literal bounds")
+        data_type = self.value_type(node.operand)
+        low = self.literal(node.low.value, data_type)
+        high = self.literal(node.high.value, data_type)
+        if low is None or high is None:
+            return lambda batch: (np.False_, np.False_)
+        operand = self.value(node.operand)
+        negated = node.negated
+
+        def between(batch):
+            values, valid = operand(batch)
+            inside = (values >= low) & (values <= high)
+            if negated:
+                inside = ~inside
+            return valid & inside, valid & ~inside
+        return between
+
+
+def compile_filter(table: Any, where: Optional[Node]) -> Callable[[_Batch], Any]:
+    """Mask of the live slots in a batch that match where (raises Unsupported)"""
+    if where is None:
+        return lambda batch: _mask(batch.live(), batch.size)
+    condition = _VectorCompiler(table).condition(where)
+
+    def matches(batch):
+        return _mask(condition(batch)[0] & batch.live(), batch.size)
+    return matches
+
+
+def supports(table: Any, where: Optional[Node], columns: Iterable[str] = ()) -> bool:
+    """Whether where and aggregates over columns compile, without reading any rows"""
+    try:
+        compile_filter(table, where)
+        compiler = _VectorCompiler(table)
+        for column in columns:
+            compiler.column(column)
+    except Unsupported:
+        return False
+    return True
+
+
+def matching_row_ids(table: Any, where: Node) -> List[int]:
+    """Row ids of the live rows of a ColumnarTable matching where, ascending"""
+    matches = compile_filter(table, where)
+    slots = [np.flatnonzero(matches(batch)) + batch.start for batch in _batches(table)]
+    slots = np.concatenate(slots) if slots else np.zeros(0, dtype=np.int64)
+    if table._rowids is None:
+        return (slots + 1).tolist()
+    return np.frombuffer(table._rowids, dtype=np.int64)[slots].tolist()
+
+
+# -- aggregates -------------------------------------------------------------
+
+def _python(value: Any, typecode: str) -> Any:
+    """A NumPy scalar as the Python value the column stores"""
+    if typecode == 'q':
+        return int(value)
+    if typecode == 'b':
+        return bool(value)
+    return float(value)
+
+
+class _Reduction:
+    """One aggregate call folded over batches"""
+
+    def __init__(self, function: str, column: Optional[str], distinct: bool, typecode: Optional[str]):
+        self.function = function
+        self.column = column
+        self.distinct = distinct
+        self.typecode = typecode
+        self.count = 0
+        self.total = 0
+        self.best = None
+        self.seen = []
+
+    def add(self, batch: _Batch, mask: Any):
+        if self.column is None:
+            self.count += int(np.count_nonzero(mask))
+            return
+        values, valid = batch.column(self.column)
+        values = values[mask & valid]
+        if not values.size:
+            return
+        if self.distinct:
+            self.seen.append(np.unique(values))
+            return
+        self._fold(values)
+
+    def _fold(self, values: Any):
+        self.count += values.size
+        function = self.function
+        if function in ('SUM', 'AVG'):
+            total = values.sum(dtype=np.float64 if self.typecode == 'd' else np.int64)
+            self.total += total.item()
+        elif function == 'MIN':
+            low = values.min().item()
+            self.best = low if self.best is None else min(self.best, low)
+        elif function == 'MAX':
+            high = values.max().item()
+            self.best = high if self.best is None else max(self.best, high)
+
+    def result(self) -> Any:
+        if self.seen:
+            self._fold(np.unique(np.concatenate(self.seen)))
+            self.seen = []
+        function = self.function
+        if function == 'COUNT':
+            return self.count
+        if not self.count:
+            return None
+        if function == 'AVG':
+            return self.total / self.count
+        if function == 'SUM':
+            return self.total
+        return _python(self.best, self.typecode)
+
+
+def aggregate(table: Any, where: Optional[Node], calls: List[Tuple[str, Optional[str], bool]]) -> List[Any]:
+    """Results of ungrouped aggregate calls (function, column or None for *, distinct) over the
+    live rows of a ColumnarTable matching where (raises Unsupported)"""
+    compiler = _VectorCompiler(table)
+    reductions = []
+    for function, column, distinct in calls:
+        typecode = None
+        if column is not None:
+            column = compiler.column(column)[0]
+            typecode = table.vectors[column].typecode
+        reductions.append(_Reduction(function, column, distinct, typecode))
+    matches = compile_filter(table, where)
+    for batch in _batches(table):
+        mask = matches(batch)
+        for reduction in reductions:
+            reduction.add(batch, mask)
+    return [reduction.result() for reduction in reductions]
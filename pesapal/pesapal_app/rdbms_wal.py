@@ -0,0 +1,237 @@
+# @Felix 2026
+
+"""
+Write-ahead log.
+
+Every commit appends one line holding the logical changes it made (row
+inserts, updates and deletes by row id, plus DDL statements):
+
+    <lsn> <crc32 of payload, hex> <json payload>\n
+
+A checkpoint writes a full snapshot that records the last LSN it contains
+and then truncates the log, so recovery is "load the snapshot, replay every
+record with a higher LSN". A torn or corrupt tail (crash mid-append) ends
+replay and is cut off before the next append. When a record is fsync'd is
+up to the CommitScheduler.
+"""
+
+import json
+import os
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class WriteAheadLog:
+    """Append-only log of committed logical changes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.last_lsn = 0
+        self.durable_lsn = 0
+
+        self._valid_bytes = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def records(self) -> Iterator[Tuple[int, List[Any]]]:
+        """(lsn, ops) for every intact record, in log order; stops at the first damaged line"""
+        self._valid_bytes = 0
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    lsn_text, crc_text, payload = line[:-1].split(b' ', 2)
+                    if zlib.crc32(payload) != int(crc_text, 16):
+                        break
+                    lsn = int(lsn_text)
+                    ops = json.loads(payload)
+                except ValueError:
+                    break
+
+                self._valid_bytes += len(line)
+                self.last_lsn = max(self.last_lsn, lsn)
+                yield lsn, ops
+
+    def open(self):
+        """Open for appending, dropping any damaged tail left by a crash"""
+        if self._file is not None:
+            return
+        if os.path.exists(self.path):
+            if not self._valid_bytes:
+                for _ in self.records():
+                    pass
+            if os.path.getsize(self.path) != self._valid_bytes:
+                os.truncate(self.path, self._valid_bytes)
+        self._file = open(self.path, 'ab')
+
+    def append(self, ops: List[Any]) -> int:
+        """Write one commit record to the OS (not yet fsync'd); returns its LSN"""
+        payload = json.dumps(ops, separators=(',', ':'), default=str).encode('utf-8')
+        with self._lock:
+            self.open()
+            lsn = self.last_lsn + 1
+            self._file.write(b'%d %08x ' % (lsn, zlib.crc32(payload)) + payload + b'\n')
+            self._file.flush()
+            self.last_lsn = lsn
+        return lsn
+
+    def sync(self) -> int:
+        """fsync everything appended so far; returns the number of commits this made durable"""
+        with self._lock:
+            if self._file is None:
+                return 0
+            self._file.flush()
+            target = self.last_lsn
+            fd = self._file.fileno()
+
+        # appends may continue while the disk flush runs; they join the next sync
+        os.fsync(fd)
+        with self._lock:
+            absorbed = max(0, target - self.durable_lsn)
+            self.durable_lsn = max(self.durable_lsn, target)
+        return absorbed
+
+    def size(self) -> int:
+        return self._file.tell() if self._file is not None else self._valid_bytes
+
+    def truncate(self):
+        """Drop every record (called once a checkpoint covers them)"""
+        with self._lock:
+            self.open()
+            self._file.flush()
+            self._file.truncate(0)
+            os.fsync(self._file.fileno())
+            self._valid_bytes = 0
+            self.durable_lsn = self.last_lsn
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._file.close()
+                self._file = None
+
+
+class CommitScheduler:
+    """Decides when committed WAL records reach the disk.
+
+    sync   - every commit fsyncs before returning (concurrent commits that land
+             before the fsync starts ride along with it).
+    group  - commits wait for a background flusher that gathers commits for up to
+             max_delay_ms and makes them all durable with one fsync.
+    async  - commits return as soon as the record is handed to the OS; a background
+             thread checkpoints every checkpoint_interval_ms. A crash of the machine
+             (not just the process) can lose up to one interval of commits.
+
+    stats() reports how many commits each flush absorbed.
+    """
+    MODES = ("sync", "group", "async")
+
+    def __init__(self, wal: WriteAheadLog, mode: str = "sync", max_delay_ms: float = 2.0,
+                 checkpoint_interval_ms: float = 1000.0, checkpoint: Optional[Callable[[], Any]] = None):
+        mode = mode.lower()
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported durability mode: {mode}. Use SYNC, GROUP or ASYNC")
+        self.wal = wal
+        self.mode = mode
+        self.max_delay = max_delay_ms / 1000.0
+        self.checkpoint_interval = checkpoint_interval_ms / 1000.0
+        self.checkpoint = checkpoint
+
+        self.flushes = 0
+        self.commits = 0
+        self.max_batch = 0
+        self.recent_batches = deque(maxlen=100)
+
+        self._cond = threading.Condition()
+        self._waiting = 0
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def committed(self, lsn: int):
+        """Called once a commit's record is appended; returns when the mode's guarantee holds"""
+        if self.mode == "sync":
+            if self.wal.durable_lsn < lsn:
+                absorbed = self.wal.sync()
+                with self._cond:
+                    self._record(absorbed)
+        elif self.mode == "group":
+            with self._cond:
+                self._start()
+                self._waiting += 1
+                self._cond.notify_all()
+                while self.wal.durable_lsn < lsn and not self._stopped:
+                    self._cond.wait()
+        else:
+            self._start()
+
+    def _record(self, absorbed: int):
+        if absorbed:
+            self.flushes += 1
+            self.commits += absorbed
+            self.max_batch = max(self.max_batch, absorbed)
+            self.recent_batches.append(absorbed)
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            target = self._group_loop if self.mode == "group" else self._checkpoint_loop
+            self._thread = threading.Thread(target=target, name=f"wal-{self.mode}", daemon=True)
+            self._thread.start()
+
+    def _group_loop(self):
+        while True:
+            with self._cond:
+                while not self._waiting and not self._stopped:
+                    self._cond.wait()
+                if self._stopped and not self._waiting:
+                    return
+            time.sleep(self.max_delay)
+
+            with self._cond:
+                self._waiting = 0
+            absorbed = self.wal.sync()
+            with self._cond:
+                self._record(absorbed)
+                self._cond.notify_all()
+
+    def _checkpoint_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait(self.checkpoint_interval)
+                stopped = self._stopped
+            pending = self.wal.last_lsn - self.wal.durable_lsn
+            if pending:
+                if self.checkpoint is not None:
+                    self.checkpoint()
+                else:
+                    self.wal.sync()
+                with self._cond:
+                    self._record(pending)
+            if stopped:
+                return
+
+    def stop(self):
+        """Make everything durable and stop the background thread"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._record(self.wal.sync())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'mode': self.mode,
+            'flushes': self.flushes,
+            'commits': self.commits,
+            'commits_per_flush': round(self.commits / self.flushes, 2) if self.flushes else 0.0,
+            'max_batch': self.max_batch,
+            'recent_batches': list(self.recent_batches),
+        }
@@ -0,0 +1,876 @@
+# @Felix 2026
+
+"""
+WHERE clause engine.
+
+A clause is tokenized and parsed once into a small expression tree, then
+compiled into a Python predicate (a chain of closures) that can be reused
+for every row of a scan. Predicates follow SQL three-valued logic: they
+return True, False or None (unknown), so callers can simply test the
+result for truthiness.
+"""
+
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<string>'(?:[^']|'')*')
+  | (?P<number>\d+\.\d*|\.\d+|\d+)
+  | (?P<param>\?\d*|:[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<qident>"[^"]+")
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)
+  | (?P<op><=|>=|<>|!=|==|=|<|>|\+|-|\*|/|%)
+  | (?P<punct>[(),])
+""", re.VERBOSE)
+
+KEYWORDS = {'AND', 'OR', 'NOT', 'IS', 'NULL', 'IN', 'BETWEEN', 'LIKE', 'TRUE', 'FALSE'}
+
+
+def tokenize(text: str) -> List[Tuple[str, Any]]:
+    """Split a clause into (kind, value) tokens"""
+    tokens = []
+    positional = 0
+    pos = 0
+    length = len(text)
+    while pos < length:
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise ValueError(f"Unexpected character {text[pos]!r} in WHERE clause at position {pos}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        pos = match.end()
+
+        if kind == 'ws':
+            continue
+        if kind == 'string':
+            tokens.append(('literal', value[1:-1].replace("''", "'")))
+        elif kind == 'number':
+            tokens.append(('literal', float(value) if '.' in value else int(value)))
+        elif kind == 'param':
+            if value == '?':
+                tokens.append(('param', positional))
+                positional += 1
+            elif value.startswith('?'):
+                tokens.append(('param', int(value[1:]) - 1))
+            else:
+                tokens.append(('param', value[1:]))
+        elif kind == 'qident':
+            tokens.append(('ident', value[1:-1]))
+        elif kind == 'ident':
+            upper = value.upper()
+            if upper in KEYWORDS:
+                tokens.append(('kw', upper))
+            else:
+                tokens.append(('ident', value))
+        else:
+            tokens.append((kind, value))
+
+    tokens.append(('end', None))
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Expression tree
+# ---------------------------------------------------------------------------
+
+class Node:
+    __slots__ = ()
+
+
+class Literal(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class ColumnRef(Node):
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class Param(Node):
+    """Placeholder bound at execution time: an int for ``?``/``?N``, a str for ``:name``"""
+    __slots__ = ('key',)
+
+    def __init__(self, key: Any):
+        self.key = key
+
+
+class Compare(Node):
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op: str, left: Node, right: Node):
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+class Arith(Node):
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op: str, left: Node, right: Node):
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+class Negate(Node):
+    __slots__ = ('operand',)
+
+    def __init__(self, operand: Node):
+        self.operand = operand
+
+
+class And(Node):
+    __slots__ = ('items',)
+
+    def __init__(self, items: List[Node]):
+        self.items = items
+
+
+class Or(Node):
+    __slots__ = ('items',)
+
+    def __init__(self, items: List[Node]):
+        self.items = items
+
+
+class Not(Node):
+    __slots__ = ('operand',)
+
+    def __init__(self, operand: Node):
+        self.operand = operand
+
+
+class IsNull(Node):
+    __slots__ = ('operand', 'negated')
+
+    def __init__(self, operand: Node, negated: bool = False):
+        self.operand = operand
+        self.negated = negated
+
+
+class InList(Node):
+    __slots__ = ('operand', 'items', 'negated')
+
+    def __init__(self, operand: Node, items: List[Node], negated: bool = False):
+        self.operand = operand
+        self.items = items
+        self.negated = negated
+
+
+class Between(Node):
+    __slots__ = ('operand', 'low', 'high', 'negated')
+
+    def __init__(self, operand: Node, low: Node, high: Node, negated: bool = False):
+        self.operand = operand
+        self.low = low
+        self.high = high
+        self.negated = negated
+
+
+class Like(Node):
+    __slots__ = ('operand', 'pattern', 'negated')
+
+    def __init__(self, operand: Node, pattern: Node, negated: bool = False):
+        self.operand = operand
+        self.pattern = pattern
+        self.negated = negated
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+_COMPARE_OPS = {'=': '=', '==': '=', '!=': '!=', '<>': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+
+
+class _Parser:
+    """Recursive descent parser for the WHERE dialect"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    def parse(self) -> Node:
+        node = self._or()
+        if self._peek()[0] != 'end':
+            raise ValueError(f"Unexpected token {self._peek()[1]!r} in WHERE clause: {self.text}")
+        return node
+
+    def _peek(self) -> Tuple[str, Any]:
+        return self.tokens[self.pos]
+
+    def _next(self) -> Tuple[str, Any]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def _accept_kw(self, keyword: str) -> bool:
+        kind, value = self.tokens[self.pos]
+        if kind == 'kw' and value == keyword:
+            self.pos += 1
+            return True
+        return False
+
+    def _expect(self, kind: str, value: Any = None):
+        token = self._next()
+        if token[0] != kind or (value is not None and token[1] != value):
+            expected = value if value is not None else kind
+            raise ValueError(f"Expected {expected!r} in WHERE clause: {self.text}")
+        return token
+
+    def _or(self) -> Node:
+        items = [self._and()]
+        while self._accept_kw('OR'):
+            items.append(self._and())
+        return items[0] if len(items) == 1 else Or(items)
+
+    def _and(self) -> Node:
+        items = [self._not()]
+        while self._accept_kw('AND'):
+            items.append(self._not())
+        return items[0] if len(items) == 1 else And(items)
+
+    def _not(self) -> Node:
+        if self._accept_kw('NOT'):
+            return Not(self._not())
+        return self._predicate()
+
+    def _predicate(self) -> Node:
+        left = self._additive()
+        kind, value = self._peek()
+
+        if kind == 'op' and value in _COMPARE_OPS:
+            self.pos += 1
+            return Compare(_COMPARE_OPS[value], left, self._additive())
+
+        if self._accept_kw('IS'):
+            negated = self._accept_kw('NOT')
+            self._expect('kw', 'NULL')
+            return IsNull(left, negated)
+
+        negated = self._accept_kw('NOT')
+        if self._accept_kw('IN'):
+            self._expect('punct', '(')
+            items = [self._additive()]
+            while self._peek() == ('punct', ','):
+                self.pos += 1
+                items.append(self._additive())
+            self._expect('punct', ')')
+            return InList(left, items, negated)
+        if self._accept_kw('BETWEEN'):
+            low = self._additive()
+            self._expect('kw', 'AND')
+            high = self._additive()
+            return Between(left, low, high, negated)
+        if self._accept_kw('LIKE'):
+            return Like(left, self._additive(), negated)
+        if negated:
+            raise ValueError(f"Expected IN, BETWEEN or LIKE after NOT in WHERE clause: {self.text}")
+
+        return left
+
+    def _additive(self) -> Node:
+        node = self._term()
+        while self._peek() in (('op', '+'), ('op', '-')):
+            op = self._next()[1]
+            node = Arith(op, node, self._term())
+        return node
+
+    def _term(self) -> Node:
+        node = self._unary()
+        while self._peek() in (('op', '*'), ('op', '/'), ('op', '%')):
+            op = self._next()[1]
+            node = Arith(op, node, self._unary())
+        return node
+
+    def _unary(self) -> Node:
+        if self._peek() == ('op', '-'):
+            self.pos += 1
+            operand = self._unary()
+            if isinstance(operand, Literal) and isinstance(operand.value, (int, float)):
+                return Literal(-operand.value)
+            return Negate(operand)
+        return self._primary()
+
+    def _primary(self) -> Node:
+        kind, value = self._next()
+        if kind == 'literal':
+            return Literal(value)
+        if kind == 'ident':
+            return ColumnRef(value)
+        if kind == 'param':
+            return Param(value)
+        if kind == 'kw':
+            if value == 'NULL':
+                return Literal(None)
+            if value in ('TRUE', 'FALSE'):
+                return Literal(value == 'TRUE')
+        if kind == 'punct' and value == '(':
+            node = self._or()
+            self._expect('punct', ')')
+            return node
+        if kind == 'end':
+            raise ValueError(f"Unexpected end of WHERE clause: {self.text}")
+        raise ValueError(f"Unexpected token {value!r} in WHERE clause: {self.text}")
+
+
+@lru_cache(maxsize=512)
+def parse_where(clause: str) -> Node:
+    """Parse a WHERE clause into an expression tree (cached, trees are never mutated)"""
+    return _Parser(clause).parse()
+
+
+# ---------------------------------------------------------------------------
+# Tree walking and parameter binding
+# ---------------------------------------------------------------------------
+
+def iter_nodes(node: Node):
+    """Yield every node of a tree, parents first"""
+    yield node
+    for slot in node.__slots__:
+        child = getattr(node, slot)
+        if isinstance(child, Node):
+            yield from iter_nodes(child)
+        elif isinstance(child, list):
+            for item in child:
+                yield from iter_nodes(item)
+
+
+def has_params(node: Node) -> bool:
+    return any(isinstance(item, Param) for item in iter_nodes(node))
+
+
+def lookup_param(key: Any, params: Any) -> Any:
+    """Fetch the value for a placeholder key from a sequence or mapping of parameters"""
+    if params is None:
+        raise ValueError("Statement has parameters but none were supplied")
+    if isinstance(key, int):
+        if isinstance(params, dict):
+            raise ValueError(f"Positional parameter {key + 1} needs a sequence of parameters, not a dict")
+        try:
+            return params[key]
+        except IndexError:
+            raise ValueError(f"Missing value for parameter {key + 1}")
+    try:
+        return params[key]
+    except (KeyError, TypeError, IndexError):
+        raise ValueError(f"Missing value for parameter :{key}")
+
+
+def bind_params(node: Node, params: Any) -> Node:
+    """Return a copy of the tree with every Param replaced by a Literal"""
+    if isinstance(node, Param):
+        return Literal(lookup_param(node.key, params))
+    if isinstance(node, (Literal, ColumnRef)):
+        return node
+
+    bound = object.__new__(type(node))
+    for slot in node.__slots__:
+        child = getattr(node, slot)
+        if isinstance(child, Node):
+            child = bind_params(child, params)
+        elif isinstance(child, list):
+            child = [bind_params(item, params) for item in child]
+        setattr(bound, slot, child)
+    return bound
+
+
+def split_conjuncts(node: Node) -> List[Node]:
+    """Top-level AND terms of a tree"""
+    return list(node.items) if isinstance(node, And) else [node]
+
+
+def conjoin(nodes: List[Node]) -> Optional[Node]:
+    """Inverse of split_conjuncts; None when there is nothing left to check"""
+    if not nodes:
+        return None
+    return nodes[0] if len(nodes) == 1 else And(nodes)
+
+
+def equality_terms(node: Node) -> Optional[Tuple[str, List[Any]]]:
+    """(column, literal values) when a term is ``col = literal`` or ``col IN (literals)``"""
+    if isinstance(node, Compare) and node.op == '=':
+        if isinstance(node.left, ColumnRef) and isinstance(node.right, Literal):
+            return node.left.name, [node.right.value]
+        if isinstance(node.right, ColumnRef) and isinstance(node.left, Literal):
+            return node.right.name, [node.left.value]
+    elif isinstance(node, InList) and not node.negated and isinstance(node.operand, ColumnRef):
+        if all(isinstance(item, Literal) for item in node.items):
+            return node.operand.name, [item.value for item in node.items]
+    return None
+
+
+def range_terms(node: Node) -> Optional[Tuple[str, List[Tuple[str, Any]]]]:
+    """(column, [(op, literal), ...]) when a term bounds a column: ``col < lit``, ``col BETWEEN a AND b``..."""
+    if isinstance(node, Compare) and node.op in ('<', '<=', '>', '>='):
+        if isinstance(node.left, ColumnRef) and isinstance(node.right, Literal):
+            return node.left.name, [(node.op, node.right.value)]
+        if isinstance(node.right, ColumnRef) and isinstance(node.left, Literal):
+            return node.right.name, [(_FLIPPED[node.op], node.left.value)]
+    elif isinstance(node, Between) and not node.negated and isinstance(node.operand, ColumnRef):
+        if isinstance(node.low, Literal) and isinstance(node.high, Literal):
+            return node.operand.name, [('>=', node.low.value), ('<=', node.high.value)]
+    return None
+
+
+def format_expression(node: Node) -> str:
+    """SQL text of a tree, as EXPLAIN shows it; anything but a name or a value is parenthesised as an operand"""
+    if isinstance(node, Literal):
+        value = node.value
+        if value is None:
+            return 'NULL'
+        if isinstance(value, bool):
+            return 'TRUE' if value else 'FALSE'
+        if isinstance(value, str):
+            return "'" + value.replace("'", "''") + "'"
+        return repr(value)
+    if isinstance(node, ColumnRef):
+        return node.name
+    if isinstance(node, Param):
+        return f"?{node.key + 1}" if isinstance(node.key, int) else f":{node.key}"
+    if isinstance(node, (Compare, Arith)):
+        return f"{_operand(node.left)} {node.op} {_operand(node.right)}"
+    if isinstance(node, Negate):
+        return f"-{_operand(node.operand)}"
+    if isinstance(node, (And, Or)):
+        joiner = ' AND ' if isinstance(node, And) else ' OR '
+        return joiner.join(_operand(item) for item in node.items)
+    if isinstance(node, Not):
+        return f"NOT {_operand(node.operand)}"
+    negated = 'NOT ' if getattr(node, 'negated', False) else ''
+    if isinstance(node, IsNull):
+        return f"{_operand(node.operand)} IS {negated}NULL"
+    if isinstance(node, InList):
+        return f"{_operand(node.operand)} {negated}IN ({', '.join(format_expression(item) for item in node.items)})"
+    if isinstance(node, Between):
+        return f"{_operand(node.operand)} {negated}BETWEEN {_operand(node.low)} AND {_operand(node.high)}"
+    if isinstance(node, Like):
+        return f"{_operand(node.operand)} {negated}LIKE {_operand(node.pattern)}"
+    raise ValueError(f"Cannot format {type(node).__name__}")
+
+
+def _operand(node: Node) -> str:
+    text = format_expression(node)
+    return text if isinstance(node, (Literal, ColumnRef, Param)) else f"({text})"
+
+
+# ---------------------------------------------------------------------------
+# Typed coercion
+# ---------------------------------------------------------------------------
+
+def _to_int(value: Any) -> Any:
+    if type(value) is int:
+        return value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return value
+    return value
+
+
+def _to_real(value: Any) -> Any:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _to_bool(value: Any) -> Any:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    if isinstance(value, str) and value.upper() in ('TRUE', 'FALSE', '1', '0'):
+        return value.upper() in ('TRUE', '1')
+    return value
+
+
+def _to_text(value: Any) -> Any:
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    return value if isinstance(value, str) else str(value)
+
+
+COERCERS: Dict[str, Callable[[Any], Any]] = {
+    'INTEGER': _to_int,
+    'REAL': _to_real,
+    'BOOLEAN': _to_bool,
+    'TEXT': _to_text,
+    'DATE': _to_text,
+}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def coerce_for(data_type: Optional[str]) -> Callable[[Any], Any]:
+    return COERCERS.get(data_type or '', _identity)
+
+
+def _loose_pair(a: Any, b: Any) -> Tuple[Any, Any]:
+    """Bring two untyped operands to comparable types (number vs numeric string)"""
+    if isinstance(a, str) and isinstance(b, (int, float)):
+        return _to_real(a), b
+    if isinstance(b, str) and isinstance(a, (int, float)):
+        return a, _to_real(b)
+    return a, b
+
+
+_OPERATORS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+_FLIPPED = {'=': '=', '!=': '!=', '<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+_ARITH = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+}
+
+
+# ---------------------------------------------------------------------------
+# Compiler
+# ---------------------------------------------------------------------------
+
+Resolver = Callable[[str], Tuple[Callable[[Any], Any], Optional[str]]]
+
+
+def _const(value: Any) -> Callable[[Any], Any]:
+    return lambda row: value
+
+
+def _like_regex(pattern: str):
+    regex = ''.join('.*' if ch == '%' else '.' if ch == '_' else re.escape(ch) for ch in pattern)
+    return re.compile(regex + r'\Z', re.IGNORECASE | re.DOTALL)
+
+
+_like_cache = lru_cache(maxsize=256)(_like_regex)
+
+
+class _Compiler:
+    """Turns an expression tree into closures over a row accessor"""
+
+    def __init__(self, resolve: Resolver):
+        self.resolve = resolve
+
+    def value_type(self, node: Node) -> Optional[str]:
+        if isinstance(node, ColumnRef):
+            return self.resolve(node.name)[1]
+        return None
+
+    def compile(self, node: Node) -> Callable[[Any], Any]:
+        method = getattr(self, f'_compile_{type(node).__name__.lower()}')
+        return method(node)
+
+    def _literal_value(self, node: Node, data_type: Optional[str]) -> Any:
+        value = node.value
+        if value is None:
+            return None
+        return coerce_for(data_type)(value)
+
+    def _compile_literal(self, node: Literal):
+        return _const(node.value)
+
+    def _compile_columnref(self, node: ColumnRef):
+        return self.resolve(node.name)[0]
+
+    def _compile_param(self, node: Param):
+        raise ValueError("Statement parameters must be bound before the WHERE clause is compiled")
+
+    def _compile_negate(self, node: Negate):
+        operand = self.compile(node.operand)
+
+        def negate(row):
+            value = operand(row)
+            if value is None:
+                return None
+            try:
+                return -value
+            except TypeError:
+                return None
+        return negate
+
+    def _compile_arith(self, node: Arith):
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+        fn = _ARITH[node.op]
+
+        def arith(row):
+            a = left(row)
+            b = right(row)
+            if a is None or b is None:
+                return None
+            try:
+                return fn(a, b)
+            except (TypeError, ZeroDivisionError):
+                try:
+                    a, b = _loose_pair(a, b)
+                    return fn(a, b)
+                except (TypeError, ZeroDivisionError):
+                    return None
+        return arith
+
+    def _compile_compare(self, node: Compare):
+        left, right, op = node.left, node.right, node.op
+
+        if isinstance(left, Literal) and isinstance(right, Literal):
+            return _const(self._compare_values(op, left.value, right.value))
+        if isinstance(left, Literal) and isinstance(right, ColumnRef):
+            left, right, op = right, left, _FLIPPED[op]
+
+        if isinstance(left, ColumnRef) and isinstance(right, Literal):
+            return self._compile_column_literal(op, left, right)
+
+        left_fn = self.compile(left)
+        right_fn = self.compile(right)
+        left_coerce = coerce_for(self.value_type(left))
+        right_coerce = coerce_for(self.value_type(right))
+        fn = _OPERATORS[op]
+
+        def compare(row):
+            a = left_fn(row)
+            b = right_fn(row)
+            if a is None or b is None:
+                return None
+            try:
+                return fn(left_coerce(a), right_coerce(b))
+            except TypeError:
+                try:
+                    a, b = _loose_pair(a, b)
+                    return fn(a, b)
+                except TypeError:
+                    return None
+        return compare
+
+    def _compile_column_literal(self, op: str, column: ColumnRef, literal: Literal):
+        accessor, data_type = self.resolve(column.name)
+        lit = self._literal_value(literal, data_type)
+        if lit is None:
+            return _const(None)
+
+        coerce = coerce_for(data_type)
+        lit_cls = lit.__class__
+
+        if op == '=':
+            def compare(row):
+                value = accessor(row)
+                if value is None:
+                    return None
+                if value.__class__ is not lit_cls:
+                    value = coerce(value)
+                return value == lit
+            return compare
+
+        fn = _OPERATORS[op]
+
+        def compare(row):
+            value = accessor(row)
+            if value is None:
+                return None
+            if value.__class__ is not lit_cls:
+                value = coerce(value)
+            try:
+                return fn(value, lit)
+            except TypeError:
+                return None
+        return compare
+
+    @staticmethod
+    def _compare_values(op: str, a: Any, b: Any) -> Optional[bool]:
+        if a is None or b is None:
+            return None
+        try:
+            return _OPERATORS[op](*_loose_pair(a, b))
+        except TypeError:
+            return None
+
+    def _compile_and(self, node: And):
+        items = [self.compile(item) for item in node.items]
+
+        def conjunction(row):
+            result = True
+            for item in items:
+                value = item(row)
+                if value is None:
+                    result = None
+                elif not value:
+                    return False
+            return result
+        return conjunction
+
+    def _compile_or(self, node: Or):
+        items = [self.compile(item) for item in node.items]
+
+        def disjunction(row):
+            result = False
+            for item in items:
+                value = item(row)
+                if value is None:
+                    result = None
+                elif value:
+                    return True
+            return result
+        return disjunction
+
+    def _compile_not(self, node: Not):
+        operand = self.compile(node.operand)
+
+        def negation(row):
+            value = operand(row)
+            return None if value is None else not value
+        return negation
+
+    def _compile_isnull(self, node: IsNull):
+        operand = self.compile(node.operand)
+        if node.negated:
+            return lambda row: operand(row) is not None
+        return lambda row: operand(row) is None
+
+    def _compile_inlist(self, node: InList):
+        operand = self.compile(node.operand)
+        data_type = self.value_type(node.operand)
+        coerce = coerce_for(data_type)
+        negated = node.negated
+
+        if all(isinstance(item, Literal) for item in node.items):
+            values = [self._literal_value(item, data_type) for item in node.items]
+            has_null = any(value is None for value in values)
+            members = frozenset(value for value in values if value is not None)
+
+            def membership(row):
+                value = operand(row)
+                if value is None:
+                    return None
+                found = coerce(value) in members
+                if found:
+                    return not negated
+                return None if has_null else negated
+            return membership
+
+        items = [self.compile(item) for item in node.items]
+
+        def membership(row):
+            value = operand(row)
+            if value is None:
+                return None
+            unknown = False
+            for item in items:
+                result = self._compare_values('=', coerce(value), item(row))
+                if result:
+                    return not negated
+                if result is None:
+                    unknown = True
+            return None if unknown else negated
+        return membership
+
+    def _compile_between(self, node: Between):
+        operand = self.compile(node.operand)
+        data_type = self.value_type(node.operand)
+        coerce = coerce_for(data_type)
+        negated = node.negated
+
+        if isinstance(node.low, Literal) and isinstance(node.high, Literal):
+            low = self._literal_value(node.low, data_type)
+            high = self._literal_value(node.high, data_type)
+            if low is None or high is None:
+                return _const(None)
+
+            def between(row):
+                value = operand(row)
+                if value is None:
+                    return None
+                try:
+                    return (low <= coerce(value) <= high) != negated
+                except TypeError:
+                    return None
+            return between
+
+        low_fn = self.compile(node.low)
+        high_fn = self.compile(node.high)
+
+        def between(row):
+            value = operand(row)
+            if value is None:
+                return None
+            value = coerce(value)
+            lower = self._compare_values('>=', value, low_fn(row))
+            upper = self._compare_values('<=', value, high_fn(row))
+            if lower is None or upper is None:
+                return None
+            return (lower and upper) != negated
+        return between
+
+    def _compile_like(self, node: Like):
+        operand = self.compile(node.operand)
+        negated = node.negated
+
+        if isinstance(node.pattern, Literal):
+            if node.pattern.value is None:
+                return _const(None)
+            regex = _like_cache(str(node.pattern.value))
+
+            def like(row):
+                value = operand(row)
+                if value is None:
+                    return None
+                return (regex.match(_to_text(value)) is not None) != negated
+            return like
+
+        pattern_fn = self.compile(node.pattern)
+
+        def like(row):
+            value = operand(row)
+            pattern = pattern_fn(row)
+            if value is None or pattern is None:
+                return None
+            return (_like_cache(_to_text(pattern)).match(_to_text(value)) is not None) != negated
+        return like
+
+
+def compile_expression(node: Node, resolve: Resolver) -> Callable[[Any], Any]:
+    """Compile an expression tree against a column resolver.
+
+    ``resolve(name)`` must return ``(accessor, data_type)`` where ``accessor``
+    extracts the column value from whatever row object the caller scans.
+    """
+    return _Compiler(resolve).compile(node)
+
+
+def compile_where(clause: str, resolve: Resolver) -> Callable[[Any], Any]:
+    """Parse and compile a WHERE clause into a reusable predicate"""
+    return compile_expression(parse_where(clause), resolve)
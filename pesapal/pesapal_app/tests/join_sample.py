@@ -22,14 +22,10 @@ def ensure_join_sample_data(db):
                 (4, 'Diana Prince', 'diana@example.com', 28)
             ]
             
-            for user_id, name, email, age in sample_users:
-                try:
-                    db.execute_sql(f"""
-                        INSERT INTO users (id, name, email, age) 
-                        VALUES ({user_id}, '{name}', '{email}', {age})
-                    """)
-                except:
-                    pass
+            try:
+                db.executemany("INSERT INTO users (id, name, email, age) VALUES (?, ?, ?, ?)", sample_users)
+            except:
+                pass
         except:
             pass
         
@@ -53,14 +49,14 @@ def ensure_join_sample_data(db):
                 (5, 5, 'Headphones', 1, '2024-01-18', 149.99)
             ]
             
-            for order_id, user_id, product, quantity, date, price in sample_orders:
-                try:
-                    db.execute_sql(f"""
-                        INSERT INTO orders (id, user_id, product_name, quantity, order_date, total_price) 
-                        VALUES ({order_id}, {user_id}, '{product}', {quantity}, '{date}', {price})
-                    """)
-                except:
-                    pass
+            try:
+                db.executemany(
+                    "INSERT INTO orders (id, user_id, product_name, quantity, order_date, total_price) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    sample_orders
+                )
+            except:
+                pass
         except:
             pass
         
@@ -0,0 +1,45 @@
+# @Felix 2026
+
+"""Shared setup for the engine tests"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Any, List
+
+from ..rdbms_core import Database
+
+
+class EngineTestCase(unittest.TestCase):
+    """A fresh in-memory Database per test, plus a scratch directory for database files"""
+
+    def setUp(self):
+        self.db = Database('test')
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self.addCleanup(self.db.close)
+
+    def sql(self, sql: str, params: Any = None, **kwargs) -> Any:
+        return self.db.execute_sql(sql, params, **kwargs)
+
+    def path(self, name: str = 'db.pesapal') -> str:
+        return os.path.join(self.dir, name)
+
+    def reopen(self, filename: str) -> Database:
+        """A second Database loaded from filename, closed when the test ends"""
+        db = Database('test')
+        self.assertTrue(db.load_from_file(filename))
+        self.addCleanup(db.close)
+        return db
+
+    def ids(self, sql: str, params: Any = None) -> List[int]:
+        return [row['id'] for row in self.sql(sql, params)]
+
+    def create_users(self, rows: int = 0, storage: str = 'ROW'):
+        """users(id, name, email UNIQUE, age) with rows users u1..uN, age i % 10"""
+        self.sql(f"CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT NOT NULL, email TEXT UNIQUE, "
+                 f"age INTEGER) USING {storage}")
+        if rows:
+            self.db.executemany("INSERT INTO users (name, email, age) VALUES (?, ?, ?)",
+                                [(f"u{i}", f"u{i}@x", i % 10) for i in range(1, rows + 1)])
@@ -0,0 +1,41 @@
+# @Felix 2026
+
+from .support import EngineTestCase
+
+
+class AggregateTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.sql("CREATE TABLE t (id INTEGER PRIMARY KEY, g TEXT, v INTEGER)")
+        self.db.executemany("INSERT INTO t (g, v) VALUES (?, ?)", [('a', 1), ('a', None), ('b', 3), ('b', 5), ('c', None)])
+
+    def test_whole_table_aggregates(self):
+        self.assertEqual(self.sql("SELECT COUNT(*) AS n, COUNT(v) AS c, SUM(v) AS s, AVG(v) AS a, MIN(v), MAX(v) FROM t"),
+                         [{'n': 5, 'c': 3, 's': 9, 'a': 3.0, 'MIN(v)': 1, 'MAX(v)': 5}])
+        self.assertEqual(self.sql("SELECT COUNT(*) AS n, SUM(v) AS s FROM t WHERE v > 100"), [{'n': 0, 's': None}])
+
+    def test_group_by_and_having(self):
+        self.assertEqual(self.sql("SELECT g, COUNT(*) AS n, SUM(v) AS s FROM t GROUP BY g ORDER BY g"),
+                         [{'g': 'a', 'n': 2, 's': 1}, {'g': 'b', 'n': 2, 's': 8}, {'g': 'c', 'n': 1, 's': None}])
+        self.assertEqual(self.sql("SELECT g, SUM(v) AS s FROM t GROUP BY g HAVING SUM(v) > 2 ORDER BY s DESC LIMIT 1"),
+                         [{'g': 'b', 's': 8}])
+
+    def test_null_keys_form_one_group(self):
+        self.db.executemany("INSERT INTO t (g, v) VALUES (?, ?)", [(None, 4), (None, None)])
+        self.assertEqual(self.sql("SELECT g, COUNT(*) AS n, COUNT(v) AS c, SUM(v) AS s FROM t GROUP BY g ORDER BY g"),
+                         [{'g': None, 'n': 2, 'c': 1, 's': 4}, {'g': 'a', 'n': 2, 'c': 1, 's': 1},
+                          {'g': 'b', 'n': 2, 'c': 2, 's': 8}, {'g': 'c', 'n': 1, 'c': 0, 's': None}])
+        self.assertEqual(self.sql("SELECT g FROM t WHERE v IS NULL GROUP BY g ORDER BY g"),
+                         [{'g': None}, {'g': 'a'}, {'g': 'c'}])
+
+    def test_having_on_aggregates_not_selected(self):
+        self.assertEqual(self.sql("SELECT g FROM t GROUP BY g HAVING COUNT(v) = 2"), [{'g': 'b'}])
+        self.assertEqual(self.sql("SELECT g, MIN(v) AS lo FROM t GROUP BY g HAVING MAX(v) >= 1 AND COUNT(*) > 1 "
+                                  "ORDER BY g"), [{'g': 'a', 'lo': 1}, {'g': 'b', 'lo': 3}])
+
+    def test_invalid_aggregates(self):
+        with self.assertRaises(ValueError):
+            self.sql("SELECT g, v FROM t GROUP BY g")
+        with self.assertRaises(ValueError):
+            self.sql("SELECT SUM(g) FROM t")
@@ -0,0 +1,88 @@
+# @Felix 2026
+
+import json
+import os
+
+from .support import EngineTestCase
+
+
+class BulkInsertTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users()
+
+    def test_multi_row_insert_and_executemany(self):
+        self.assertEqual(self.sql("INSERT INTO users (name, age) VALUES ('a', 1), ('b', NULL), (?, ?)", ['c', 3]), 3)
+        count = self.db.executemany("INSERT INTO users (name, email, age) VALUES (?, ?, ?)",
+                                    [(f"n{i}", f"n{i}@x", i) for i in range(100)])
+        self.assertEqual(count, 100)
+        self.assertEqual(self.ids("SELECT * FROM users WHERE email = 'n99@x'"), [103])
+        self.assertEqual(self.db.executemany("UPDATE users SET age = ? WHERE id = ?", [(0, 1), (0, 2)]), 2)
+
+    def test_a_bad_row_inserts_nothing(self):
+        with self.assertRaises(ValueError):
+            self.sql("INSERT INTO users (name, email) VALUES ('a', 'x@x'), ('b', 'x@x')")
+        with self.assertRaises(ValueError):
+            self.db.executemany("INSERT INTO users (name, age) VALUES (?, ?)", [('a', 1), (None, 2)])
+        with self.assertRaises(ValueError):
+            self.sql("INSERT INTO users (name) VALUES ('a', 'b')")
+        self.assertEqual(self.sql("SELECT * FROM users"), [])
+
+
+class CopyTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users()
+        self.db.set_copy_directory(self.dir)
+
+    def write(self, name: str, text: str) -> str:
+        with open(self.path(name), 'w') as f:
+            f.write(text)
+        return self.path(name)
+
+    def test_copy_csv_and_jsonl(self):
+        path = self.write('users.csv', 'name,email,age\nann,ann@x,31\nbob,,\n"c, d",cd@x,7\n')
+        self.assertEqual(self.sql(f"COPY users FROM '{path}' (FORMAT csv)")['rows'], 3)
+        lines = [json.dumps({'name': f"j{i}", 'age': i}) for i in range(10)]
+        stats = self.db.copy_from('users', self.write('users.jsonl', '\n'.join(lines)), chunk_rows=3)
+        self.assertEqual(stats['rows'], 10)
+        self.assertEqual(self.sql("SELECT name, email, age FROM users WHERE id <= 3"),
+                         [{'name': 'ann', 'email': 'ann@x', 'age': 31}, {'name': 'bob', 'email': '', 'age': None},
+                          {'name': 'c, d', 'email': 'cd@x', 'age': 7}])
+        self.assertEqual(self.ids("SELECT * FROM users WHERE age = 9 AND name = 'j9'"), [13])
+
+    def test_a_bad_row_loads_nothing(self):
+        path = self.write('bad.csv', 'name,age\nok,1\nbad,notanumber\n')
+        with self.assertRaises(ValueError):
+            self.sql(f"COPY users FROM '{path}'")
+        self.assertEqual(self.sql("SELECT * FROM users"), [])
+        with self.assertRaises(ValueError):
+            self.sql(f"COPY users FROM '{self.path('missing.csv')}'")
+        with self.assertRaises(ValueError):
+            self.sql(f"COPY users FROM '{path}' (FORMAT xml)")
+
+    def test_sql_copy_reads_only_the_copy_directory(self):
+        imports = self.path('imports')
+        os.mkdir(imports)
+        with open(os.path.join(imports, 'users.csv'), 'w') as f:
+            f.write('name\ninside\n')
+        outside = self.write('outside.csv', 'name\noutside\n')
+        os.symlink(outside, os.path.join(imports, 'link.csv'))
+
+        self.db.set_copy_directory(None)
+        with self.assertRaises(ValueError):
+            self.sql(f"COPY users FROM '{os.path.join(imports, 'users.csv')}'")
+
+        self.db.set_copy_directory(imports)
+        self.assertEqual(self.sql("COPY users FROM 'users.csv'")['rows'], 1)
+        for path in (outside, '../outside.csv', 'link.csv', '/etc/hostname'):
+            with self.subTest(path=path), self.assertRaises(ValueError):
+                self.sql(f"COPY users FROM '{path}'")
+        self.assertEqual([row['name'] for row in self.sql("SELECT name FROM users")], ['inside'])
+
+        # the Python API is not confined
+        self.assertEqual(self.db.copy_from('users', outside)['rows'], 1)
+        with self.assertRaises(ValueError):
+            self.db.set_copy_directory(outside)
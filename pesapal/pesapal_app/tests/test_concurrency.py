@@ -0,0 +1,150 @@
+# @Felix 2026
+
+import threading
+
+from .support import EngineTestCase
+
+
+class TableLockTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(5)
+        self.sql("CREATE TABLE products (id INTEGER PRIMARY KEY, name TEXT)")
+
+    def hold_users(self):
+        """Update users in a transaction on another thread, rolled back once the returned event is set"""
+        held, release = threading.Event(), threading.Event()
+
+        def holder():
+            with self.assertRaises(RuntimeError), self.db.transaction():
+                self.sql("UPDATE users SET age = 100")
+                held.set()
+                release.wait(5)
+                raise RuntimeError("roll back")
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        held.wait(5)
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        return release
+
+    def test_writers_on_other_tables_and_readers_do_not_wait(self):
+        self.hold_users()
+        self.assertEqual(self.sql("INSERT INTO products (name) VALUES ('p')"), 1)
+        # readers see the last committed state, not the open transaction's
+        self.assertEqual(self.sql("SELECT * FROM users WHERE age = 100"), [])
+
+    def test_writers_on_the_same_table_wait(self):
+        release = self.hold_users()
+        done = threading.Event()
+        writer = threading.Thread(target=lambda: (self.sql("DELETE FROM users WHERE id = 1"), done.set()))
+        writer.start()
+        self.assertFalse(done.wait(0.2))
+        release.set()
+        writer.join(5)
+        self.assertTrue(done.is_set())
+        self.assertEqual(self.db.lock_stats()['tables']['users']['waits'], 1)
+
+    def test_failed_statement_releases_its_locks(self):
+        with self.assertRaises(ValueError):
+            self.sql("UPDATE users SET email = 'u2@x' WHERE id = 1")
+        self.assertEqual(self.sql("UPDATE users SET age = 0 WHERE id = 1"), 1)
+
+    def test_concurrent_writers(self):
+        errors = []
+
+        def writer(k):
+            try:
+                for i in range(50):
+                    self.sql("INSERT INTO users (name, email, age) VALUES (?, ?, ?)", [f"w{k}", f"w{k}_{i}@x", i])
+                    self.sql("INSERT INTO products (name) VALUES (?)", [f"p{k}_{i}"])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(k,)) for k in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.sql("SELECT * FROM users")), 205)
+        self.assertEqual(len(set(self.ids("SELECT * FROM products"))), 200)
+
+
+class SnapshotTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(10)
+
+    def in_snapshot(self, sql, write):
+        """Run sql on another thread, reading a snapshot of users taken before write() ran"""
+        opened, written, result = threading.Event(), threading.Event(), []
+
+        def reader():
+            with self.db._locked(reads=('users',)):
+                opened.set()
+                written.wait(5)
+                result.append(self.sql(sql))
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        opened.wait(5)
+        try:
+            write()
+        finally:
+            written.set()
+            thread.join(5)
+        return result[0]
+
+    def test_reads_see_their_snapshot(self):
+        def write():
+            self.sql("UPDATE users SET age = 100 WHERE id > 1")
+            self.sql("DELETE FROM users WHERE id = 5")
+            self.sql("INSERT INTO users (name) VALUES ('late')")
+            self.assertEqual(self.db.snapshot_stats()['users']['open_snapshots'], 1)
+
+        rows = self.in_snapshot("SELECT age FROM users", write)
+        self.assertEqual([row['age'] for row in rows], [i % 10 for i in range(1, 11)])
+        self.assertEqual(self.db.snapshot_stats()['users']['open_snapshots'], 0)
+        self.assertEqual(len(self.sql("SELECT * FROM users WHERE age = 100")), 8)
+
+        # versions kept for the closed snapshot are dropped by the next write
+        self.sql("UPDATE users SET age = 1 WHERE id = 1")
+        self.assertEqual(self.db.snapshot_stats()['users']['row_versions'], 0)
+
+    def test_index_lookups_see_the_snapshot(self):
+        self.sql("CREATE INDEX ia ON users (age)")
+        rows = self.in_snapshot("SELECT id FROM users WHERE age = 3",
+                                lambda: self.sql("UPDATE users SET age = 4 WHERE age = 3"))
+        self.assertEqual(rows, [{'id': 3}])
+        self.assertEqual(self.ids("SELECT * FROM users WHERE age = 3"), [])
+
+    def test_order_by_limit_reads_the_index_under_a_snapshot(self):
+        sql = "SELECT id FROM users ORDER BY id DESC LIMIT 2"
+        plan = [row['QUERY PLAN'] for row in self.sql("EXPLAIN ANALYZE " + sql)]
+        self.assertTrue(plan[2].startswith("  ->  Index Order Scan using id on users"), plan)
+        self.assertIn("actual in=2 out=2", plan[2])
+
+        # a transaction on another thread changes rows; the snapshot must not see them
+        changed, release = threading.Event(), threading.Event()
+
+        def writer():
+            with self.assertRaises(RuntimeError), self.db.transaction():
+                self.sql("DELETE FROM users WHERE id = 10")
+                self.sql("INSERT INTO users (id, name) VALUES (50, 'uncommitted')")
+                changed.set()
+                release.wait(5)
+                raise RuntimeError("roll back")
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        changed.wait(5)
+        try:
+            self.assertEqual(self.ids(sql), [10, 9])
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(self.ids(sql), [10, 9])
@@ -0,0 +1,62 @@
+# @Felix 2026
+
+from .support import EngineTestCase
+
+
+class CursorTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(100)
+
+    def count_scanned(self):
+        """Count the rows the users scan reads into self.scanned"""
+        table = self.db.tables['users']
+        scan = table._all_handles
+        self.scanned = 0
+
+        def counting():
+            for pair in scan():
+                self.scanned += 1
+                yield pair
+
+        table._all_handles = counting
+
+    def test_fetch_methods(self):
+        cursor = self.sql("SELECT id FROM users WHERE age = 3", cursor=True)
+        self.assertEqual(cursor.fetchone(), {'id': 3})
+        self.assertEqual(cursor.fetchmany(2), [{'id': 13}, {'id': 23}])
+        self.assertEqual(len(cursor.fetchall()), 7)
+        self.assertEqual((cursor.fetchone(), cursor.rownumber), (None, 10))
+
+    def test_limit_stops_the_scan_early(self):
+        self.count_scanned()
+        self.assertEqual(self.ids("SELECT * FROM users WHERE age = 3 LIMIT 2"), [3, 13])
+        self.assertEqual(self.scanned, 13)
+        with self.sql("SELECT * FROM users", cursor=True) as cursor:
+            cursor.fetchmany(5)
+        self.assertEqual(self.scanned, 18)
+
+    def test_closed_cursor_returns_nothing(self):
+        cursor = self.sql("SELECT * FROM users", cursor=True)
+        cursor.close()
+        self.assertEqual(cursor.fetchall(), [])
+        self.assertEqual(self.db.snapshot_stats()['users']['open_snapshots'], 0)
+        with self.assertRaises(ValueError):
+            self.sql("SELECT * FROM nope", cursor=True)
+
+    def test_cursor_reads_its_snapshot(self):
+        cursor = self.sql("SELECT id, age FROM users WHERE id <= 10", cursor=True)
+        self.assertEqual(cursor.fetchone()['id'], 1)
+        self.sql("UPDATE users SET age = 100 WHERE id > 1")
+        self.sql("DELETE FROM users WHERE id = 5")
+        self.assertEqual([row['age'] for row in cursor.fetchall()], [i % 10 for i in range(2, 11)])
+        self.assertEqual(self.db.snapshot_stats()['users']['open_snapshots'], 0)
+
+    def test_vacuum_waits_for_open_snapshots(self):
+        cursor = self.sql("SELECT * FROM users", cursor=True)
+        self.sql("DELETE FROM users WHERE id < 5")
+        self.assertEqual(self.sql("VACUUM users"), 0)
+        self.assertEqual(len(cursor.fetchall()), 100)
+        cursor.close()
+        self.assertEqual(self.sql("VACUUM users"), 4)
@@ -0,0 +1,61 @@
+# @Felix 2026
+
+from .support import EngineTestCase
+
+
+class ExplainTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(100)
+        self.sql("CREATE INDEX ia ON users (age) USING BTREE")
+
+    def plan(self, sql, params=None):
+        return [row['QUERY PLAN'] for row in self.sql(sql, params)]
+
+    def test_explain_shows_the_access_path(self):
+        self.assertEqual(self.plan("EXPLAIN SELECT * FROM users WHERE id = ?", [5])[0].split('  ')[0],
+                         "Index Scan using id on users")
+        lines = self.plan("EXPLAIN SELECT * FROM users WHERE age > 7 ORDER BY age LIMIT 3")
+        self.assertTrue(lines[2].startswith("  ->  Index Order Scan using age on users"), lines)
+        lines = self.plan("EXPLAIN SELECT * FROM users WHERE age > 7 LIMIT 3")
+        self.assertEqual(lines[0], "Limit")
+        self.assertTrue(lines[2].startswith("  ->  Index Range Scan using age on users"), lines)
+        self.assertTrue(self.plan("EXPLAIN SELECT * FROM users WHERE name = 'u1'")[0].startswith("Seq Scan on users"))
+
+    def test_explain_does_not_run_writes(self):
+        before, version = self.sql("SELECT * FROM users"), self.db.write_version('users')
+        for sql in ("DELETE FROM users WHERE age = 3", "UPDATE users SET age = 50 WHERE id < 10",
+                    "INSERT INTO users (name, email) VALUES ('new', 'new@x')"):
+            with self.subTest(sql=sql):
+                self.assertTrue(self.plan("EXPLAIN " + sql))
+                self.assertEqual(self.sql("SELECT * FROM users"), before)
+                self.assertEqual(self.db.write_version('users'), version)
+
+    def test_explain_analyze_keeps_the_changes_of_writes(self):
+        self.db.save_to_file(self.path())
+        version = self.db.write_version('users')
+        node = self.db.explain("DELETE FROM users WHERE age = 3", analyze=True)
+        self.assertEqual((node.operator, node.rows_out), ("Delete on users", 10))
+        self.assertEqual(self.sql("SELECT * FROM users WHERE age = 3"), [])
+
+        lines = self.plan("EXPLAIN ANALYZE UPDATE users SET age = 50 WHERE id < 10")
+        self.assertTrue(lines[0].startswith("Update on users"), lines)
+        self.plan("EXPLAIN ANALYZE INSERT INTO users (name, email) VALUES ('new', 'new@x')")
+        self.assertEqual(self.db.write_version('users'), version + 3)
+
+        expected = self.sql("SELECT * FROM users")
+        self.assertEqual(len(expected), 91)
+        self.assertEqual(len([row for row in expected if row['age'] == 50]), 8)
+        # the changes were logged like any other write
+        self.assertEqual(self.reopen(self.path()).execute_sql("SELECT * FROM users"), expected)
+
+    def test_explain_analyze_of_an_aggregate(self):
+        lines = self.plan("EXPLAIN ANALYZE SELECT age, COUNT(*) AS n FROM users WHERE age > 7 GROUP BY age")
+        self.assertTrue(lines[0].startswith("HashAggregate"), lines)
+        self.assertIn("actual in=20 out=2", lines[0])
+
+    def test_invalid_explain(self):
+        for sql in ("EXPLAIN", "EXPLAIN BOGUS STUFF", "EXPLAIN SELECT * FROM nope"):
+            with self.assertRaises(ValueError):
+                self.sql(sql)
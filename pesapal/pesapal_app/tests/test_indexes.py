@@ -0,0 +1,83 @@
+# @Felix 2026
+
+import random
+
+from ..rdbms_core import OrderedIndex
+from .support import EngineTestCase
+
+
+class IndexAccessPathTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(200)
+        self.table = self.db.tables['users']
+
+    def test_equality_and_in_use_indexes(self):
+        for where in ("id = 5", "email = 'u7@x'", "id IN (1, 5, 999)", "age = 3 AND id = 53"):
+            self.assertIsNotNone(self.table.plan(where).index_column, where)
+        self.assertIsNone(self.table.plan("age = 3").index_column)
+        self.assertEqual(self.ids("SELECT * FROM users WHERE id IN (1, 5, 999)"), [1, 5])
+        self.assertEqual(self.ids("SELECT * FROM users WHERE email = 'u7@x' AND age > 5"), [7])
+        self.assertEqual(self.ids("SELECT * FROM users WHERE age = 3 AND id = 53"), [53])
+
+    def test_indexes_follow_writes(self):
+        self.sql("DELETE FROM users WHERE id < 10")
+        self.assertEqual(self.sql("SELECT * FROM users WHERE id = 5"), [])
+        self.sql("UPDATE users SET email = 'new@x' WHERE id = 11")
+        self.assertEqual(self.ids("SELECT * FROM users WHERE email = 'new@x'"), [11])
+        self.assertEqual(self.sql("SELECT * FROM users WHERE email = 'u11@x'"), [])
+
+    def test_unique_violation(self):
+        with self.assertRaises(ValueError):
+            self.sql("UPDATE users SET email = 'u12@x' WHERE id = 11")
+        with self.assertRaises(ValueError):
+            self.sql("INSERT INTO users (name, email) VALUES ('dup', 'u3@x')")
+
+    def test_create_index_on_missing_column(self):
+        with self.assertRaises(ValueError):
+            self.sql("CREATE INDEX ix ON users (nope)")
+
+
+class OrderedIndexTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        rnd = random.Random(1)
+        self.sql("CREATE TABLE t (id INTEGER PRIMARY KEY, age INTEGER, score REAL)")
+        table = self.db.tables['t']
+        for _ in range(1000):
+            table.insert({'age': rnd.choice([None] + list(range(60))), 'score': rnd.random() * 100})
+        self.sql("CREATE INDEX ia ON t (age) USING BTREE")
+        self.rows = self.sql("SELECT * FROM t")
+
+    def expected(self, keep, key=None, descending=False, limit=None):
+        rows = [row for row in self.rows if keep(row)]
+        if key is not None:
+            nulls = [row for row in rows if row[key] is None]
+            rest = sorted((row for row in rows if row[key] is not None), key=lambda row: row[key],
+                          reverse=descending)
+            # NULLs come first in either direction
+            rows = nulls + rest
+        return rows[:limit] if limit else rows
+
+    def test_range_predicates(self):
+        table = self.db.tables['t']
+        self.assertIsInstance(table.indexes['age'], OrderedIndex)
+        path = table.plan("age > 30 AND age <= 40")
+        self.assertFalse(path.is_scan)
+        self.assertEqual(path.index_column, 'age')
+        self.assertEqual(self.sql("SELECT * FROM t WHERE age > 30 AND age <= 40"),
+                         self.expected(lambda r: r['age'] is not None and 30 < r['age'] <= 40))
+        self.assertEqual(self.sql("SELECT * FROM t WHERE age BETWEEN 10 AND 12"),
+                         self.expected(lambda r: r['age'] is not None and 10 <= r['age'] <= 12))
+
+    def test_order_by_index(self):
+        self.assertEqual(self.sql("SELECT * FROM t ORDER BY age LIMIT 50"),
+                         self.expected(lambda r: True, 'age', False, 50))
+        self.assertEqual(self.sql("SELECT * FROM t WHERE age > 20 ORDER BY age DESC LIMIT 30"),
+                         self.expected(lambda r: r['age'] is not None and r['age'] > 20, 'age', True, 30))
+
+    def test_unknown_index_method(self):
+        with self.assertRaises(ValueError):
+            self.sql("CREATE INDEX ib ON t (score) USING SKIPLIST")
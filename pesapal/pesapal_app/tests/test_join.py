@@ -0,0 +1,46 @@
+# @Felix 2026
+
+from .support import EngineTestCase
+
+
+class JoinTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.sql("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+        self.sql("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER, total REAL)")
+        for name in ('a', 'b', 'c'):
+            self.sql("INSERT INTO users (name) VALUES (?)", [name])
+        # user 3 has no orders; order 4 has no user and order 5 a NULL key
+        for user_id, total in [(1, 1.0), (1, 2.0), (2, 3.0), (9, 4.0), (None, 5.0)]:
+            self.sql("INSERT INTO orders (user_id, total) VALUES (?, ?)", [user_id, total])
+
+    def pairs(self, join_type):
+        rows = self.db.join('users', 'orders', 'users.id = orders.user_id', join_type)
+        return sorted(((row.get('users.id'), row.get('orders.id')) for row in rows), key=str)
+
+    def check_all_types(self):
+        self.assertEqual(self.pairs('INNER'), [(1, 1), (1, 2), (2, 3)])
+        self.assertEqual(self.pairs('LEFT'), [(1, 1), (1, 2), (2, 3), (3, None)])
+        self.assertEqual(self.pairs('RIGHT'), sorted([(1, 1), (1, 2), (2, 3), (None, 4), (None, 5)], key=str))
+        self.assertEqual(len(self.pairs('FULL')), 6)
+        self.assertEqual(len(self.pairs('CROSS')), 15)
+
+    def test_hash_join(self):
+        self.check_all_types()
+
+    def test_index_nested_loop_join(self):
+        self.sql("CREATE INDEX io ON orders (user_id)")
+        self.check_all_types()
+
+    def test_reversed_condition(self):
+        rows = self.db.join('users', 'orders', 'orders.user_id = users.id', 'INNER')
+        self.assertEqual(len(rows), 3)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.db.join('users', 'orders', 'users.id > orders.user_id')
+        with self.assertRaises(ValueError):
+            self.db.join('users', 'orders', 'users.id = orders.user_id', 'SIDEWAYS')
+        with self.assertRaises(ValueError):
+            self.db.join('users', 'nope', 'users.id = nope.user_id')
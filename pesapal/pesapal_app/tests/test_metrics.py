@@ -0,0 +1,53 @@
+# @Felix 2026
+
+from ..rdbms_metrics import MetricsRegistry
+from .support import EngineTestCase
+
+
+class MetricsTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(20)
+        self.db.set_metrics(True)
+
+    def test_statements_and_table_accesses(self):
+        self.sql("SELECT * FROM users WHERE id = 3")
+        self.sql("SELECT * FROM users WHERE age = 3")
+        self.sql("UPDATE users SET age = 0 WHERE id < 5")
+        with self.assertRaises(ValueError):
+            self.sql("SELECT * FROM nope")
+
+        text = self.db.metrics_text()
+        self.assertIn('pesapal_statements_total{type="SELECT"} 3', text)
+        self.assertIn('pesapal_statement_errors_total{type="SELECT"} 1', text)
+        self.assertIn('pesapal_statement_duration_seconds_count{type="UPDATE"} 1', text)
+        self.assertIn('pesapal_rows_written_total{table="users",operation="update"} 4', text)
+        self.assertIn('pesapal_full_scans_total{table="users"} 1', text)
+        self.assertIn('pesapal_index_probes_total{table="users"} 2', text)
+        self.assertIn('# TYPE pesapal_statement_duration_seconds histogram', text)
+
+    def test_saves_and_loads(self):
+        self.db.save_to_file(self.path())
+        text = self.db.metrics_text()
+        self.assertIn('pesapal_save_duration_seconds_count 1', text)
+        self.assertIn('pesapal_save_bytes_total', text)
+
+    def test_disabled(self):
+        self.db.set_metrics(False)
+        self.sql("SELECT * FROM users")
+        self.assertNotIn('pesapal_statements_total', self.db.metrics_text())
+        self.assertIsNone(self.db.tables['users'].metrics)
+
+
+class RegistryTest(EngineTestCase):
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        for seconds in (0.00005, 0.002, 0.002, 20.0):
+            registry.observe('pesapal_statement_duration_seconds', (('type', 'SELECT'),), seconds)
+        text = registry.render()
+        self.assertIn('pesapal_statement_duration_seconds_bucket{type="SELECT",le="0.0001"} 1', text)
+        self.assertIn('pesapal_statement_duration_seconds_bucket{type="SELECT",le="0.0025"} 3', text)
+        self.assertIn('pesapal_statement_duration_seconds_bucket{type="SELECT",le="+Inf"} 4', text)
+        self.assertIn('pesapal_statement_duration_seconds_count{type="SELECT"} 4', text)
@@ -0,0 +1,46 @@
+# @Felix 2026
+
+import random
+
+from .support import EngineTestCase
+
+
+class OrderByTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.sql("CREATE TABLE t (id INTEGER PRIMARY KEY, g TEXT, v INTEGER, r REAL)")
+        self.db.executemany("INSERT INTO t (g, v, r) VALUES (?, ?, ?)",
+                            [('a', 10, 1.5), ('a', None, 0.5), ('b', 9, None), ('b', 100, 2.5), ('c', 3, 0.25)])
+
+    def test_typed_keys(self):
+        # numbers compare as numbers (100 after 9), NULLs come first
+        self.assertEqual(self.ids("SELECT id FROM t ORDER BY v"), [2, 5, 3, 1, 4])
+        self.assertEqual(self.ids("SELECT id FROM t ORDER BY r DESC"), [3, 4, 1, 2, 5])
+
+    def test_multiple_columns_and_top_k(self):
+        self.assertEqual(self.ids("SELECT id FROM t ORDER BY g DESC, v ASC"), [5, 3, 4, 2, 1])
+        self.assertEqual(self.ids("SELECT id FROM t ORDER BY g, v DESC LIMIT 3"), [2, 1, 4])
+        self.assertEqual(self.ids("SELECT id FROM t WHERE v > 5 ORDER BY v DESC LIMIT 1"), [4])
+
+    def test_nulls_placement_with_per_key_direction(self):
+        self.assertEqual(self.ids("SELECT id FROM t ORDER BY v DESC"), [2, 4, 1, 3, 5])
+        self.assertEqual(self.ids("SELECT id FROM t ORDER BY v DESC NULLS LAST"), [4, 1, 3, 5, 2])
+        self.assertEqual(self.ids("SELECT id FROM t ORDER BY g DESC, v DESC NULLS LAST"), [5, 4, 3, 1, 2])
+        self.assertEqual(self.ids("SELECT id FROM t ORDER BY r DESC NULLS LAST, g"), [4, 1, 2, 5, 3])
+        self.assertEqual(self.ids("SELECT id FROM t ORDER BY g, v NULLS FIRST"), [2, 1, 3, 4, 5])
+
+    def test_top_k_matches_a_full_sort(self):
+        rng = random.Random(7)
+        self.db.executemany("INSERT INTO t (g, v, r) VALUES (?, ?, ?)",
+                            [(rng.choice('abc'), rng.choice([None, *range(20)]), rng.random()) for _ in range(300)])
+        for order in ("v", "v DESC", "g DESC, v NULLS LAST", "v DESC NULLS LAST, g", "g, v DESC, r"):
+            full = self.ids(f"SELECT id FROM t ORDER BY {order}")
+            for k in (1, 7, 50):
+                with self.subTest(order=order, limit=k):
+                    self.assertEqual(self.ids(f"SELECT id FROM t ORDER BY {order} LIMIT {k}"), full[:k])
+
+    def test_invalid_terms(self):
+        for sql in ("SELECT * FROM t ORDER BY id SIDEWAYS", "SELECT * FROM t ORDER BY v, "):
+            with self.assertRaises(ValueError):
+                self.sql(sql)
@@ -0,0 +1,167 @@
+# @Felix 2026
+
+import os
+import pickle
+import threading
+from unittest import mock
+
+from ..rdbms_core import Database, Table
+from .support import EngineTestCase
+
+
+class WriteAheadLogTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db.save_to_file(self.path())
+        self.create_users(50)
+        self.sql("UPDATE users SET age = 99 WHERE age = 3")
+        self.sql("DELETE FROM users WHERE age = 5")
+        self.sql("ALTER TABLE users ADD COLUMN note TEXT")
+        self.sql("UPDATE users SET note = 'x' WHERE id < 10")
+        self.expected = self.sql("SELECT * FROM users")
+
+    def test_replay_after_crash(self):
+        # nothing was checkpointed: every change since the save is in the log
+        self.assertGreater(os.path.getsize(self.path() + '-wal'), 0)
+        self.assertEqual(self.reopen(self.path()).execute_sql("SELECT * FROM users"), self.expected)
+
+    def test_torn_tail_is_ignored(self):
+        with open(self.path() + '-wal', 'ab') as wal:
+            wal.write(b'999 deadbeef {"partial')
+        db = self.reopen(self.path())
+        self.assertEqual(db.execute_sql("SELECT * FROM users"), self.expected)
+        # the torn record is cut off, so later commits replay too
+        db.execute_sql("INSERT INTO users (name) VALUES ('after')")
+        self.assertEqual(len(self.reopen(self.path()).execute_sql("SELECT * FROM users")), len(self.expected) + 1)
+
+    def test_checkpoint_truncates_the_log(self):
+        self.db.checkpoint()
+        self.assertEqual(os.path.getsize(self.path() + '-wal'), 0)
+        self.assertEqual(self.reopen(self.path()).execute_sql("SELECT * FROM users"), self.expected)
+
+
+class DurabilityModeTest(EngineTestCase):
+
+    def write_concurrently(self, mode: str, **options) -> dict:
+        db = Database('test')
+        db.set_durability(mode, **options)
+        db.save_to_file(self.path())
+        db.execute_sql("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+
+        def writer(k):
+            for i in range(20):
+                db.execute_sql("INSERT INTO t (name) VALUES (?)", [f"{k}-{i}"])
+
+        threads = [threading.Thread(target=writer, args=(k,)) for k in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = db.scheduler.stats()
+        db.close()
+        self.assertEqual(self.reopen(self.path()).tables['t'].row_count, 80, mode)
+        return stats
+
+    def test_every_mode_keeps_every_commit(self):
+        self.assertEqual(self.write_concurrently('sync')['commits'], 81)
+        self.assertEqual(self.write_concurrently('group', max_delay_ms=2)['mode'], 'group')
+        self.write_concurrently('async', checkpoint_interval_ms=20)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            self.db.set_durability('eventually')
+
+
+class PagedSnapshotTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(500)
+        self.sql("CREATE TABLE small (id INTEGER PRIMARY KEY, v TEXT) USING COLUMNAR")
+        self.sql("INSERT INTO small (v) VALUES ('a')")
+        self.sql("INSERT INTO small (v) VALUES ('b')")
+        self.db.save_to_file(self.path())
+        self.db.close()
+
+    def test_tables_load_on_first_use(self):
+        db = self.reopen(self.path())
+        self.assertFalse(db.tables['users'].is_loaded)
+        self.assertEqual(db.get_schema()['tables']['users']['row_count'], 500)
+        self.assertEqual(len(db.execute_sql("SELECT * FROM small")), 2)
+        self.assertFalse(db.tables['users'].is_loaded)
+
+        # a checkpoint copies a deferred table's extent without loading it
+        db.execute_sql("INSERT INTO small (v) VALUES ('c')")
+        db.checkpoint()
+        self.assertFalse(db.tables['users'].is_loaded)
+        self.assertEqual(len(db.execute_sql("SELECT * FROM users WHERE age = 7")), 50)
+
+        db = self.reopen(self.path())
+        self.assertEqual(len(db.execute_sql("SELECT * FROM small")), 3)
+        self.assertEqual(db.tables['users'].insert({'name': 'next'}), 501)
+
+    def test_add_column_to_a_deferred_table(self):
+        for table in ('users', 'small'):
+            db = self.reopen(self.path())
+            self.assertFalse(db.tables[table].is_loaded)
+            db.execute_sql(f"ALTER TABLE {table} ADD COLUMN note TEXT")
+            db.execute_sql(f"UPDATE {table} SET note = 'x' WHERE id = 2")
+            rows = db.execute_sql(f"SELECT * FROM {table} WHERE id <= 2")
+            self.assertEqual([(row['id'], row['note']) for row in rows], [(1, None), (2, 'x')])
+            if table == 'users':
+                self.assertEqual(db.tables[table].rows[0], (1, 'u1', 'u1@x', 1, None))
+            db.checkpoint()
+            db.close()
+            self.assertEqual(self.reopen(self.path()).execute_sql(f"SELECT * FROM {table} WHERE id <= 2"), rows)
+
+    def test_corrupt_extent(self):
+        with open(self.path(), 'r+b') as f:
+            f.seek(4096 + 100)
+            byte = f.read(1)
+            f.seek(4096 + 100)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        db = self.reopen(self.path())
+        with self.assertRaises(ValueError):
+            db.execute_sql("SELECT * FROM users LIMIT 1")
+
+
+class PersistedIndexTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(300)
+        self.sql("CREATE INDEX ia ON users (age) USING HASH")
+        self.sql("CREATE INDEX ib ON users (name) USING BTREE")
+        self.sql("DELETE FROM users WHERE id < 10")
+        self.db.save_to_file(self.path())
+        self.db.close()
+
+    def test_indexes_are_loaded_not_rebuilt(self):
+        with mock.patch.object(Table, '_rebuild_indexes', autospec=True,
+                               side_effect=Table._rebuild_indexes) as rebuild:
+            db = self.reopen(self.path())
+            self.assertEqual(len(db.execute_sql("SELECT * FROM users WHERE age = 3")), 29)
+        rebuild.assert_not_called()
+        table = db.tables['users']
+        self.assertEqual((table.indexes['age'].kind, table.indexes['name'].kind), ('HASH', 'BTREE'))
+        with self.assertRaises(ValueError):
+            db.execute_sql("INSERT INTO users (name, email) VALUES ('dup', 'u50@x')")
+
+    def test_mismatched_index_is_rebuilt(self):
+        db = Database('test')
+        self.addCleanup(db.close)
+        db.load_from_file(self.path())
+        read_extent = db._pager.read_extent
+
+        def stale(entry):
+            data = pickle.loads(read_extent(entry))
+            postings = data['indexes'][-1]['postings']
+            postings.pop(next(iter(postings)))
+            return pickle.dumps(data)
+
+        with mock.patch.object(Table, '_rebuild_indexes', autospec=True,
+                               side_effect=Table._rebuild_indexes) as rebuild, \
+                mock.patch.object(db._pager, 'read_extent', side_effect=stale):
+            self.assertEqual(len(db.execute_sql("SELECT * FROM users WHERE name > ''")), 291)
+        rebuild.assert_called_once()
@@ -0,0 +1,37 @@
+# @Felix 2026
+
+from .support import EngineTestCase
+
+
+class PreparedStatementTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users()
+
+    def test_positional_named_and_numbered_params(self):
+        insert = self.db.prepare("INSERT INTO users (name, email, age) VALUES (?, ?, ?)")
+        for i in range(3):
+            insert.execute([f"n{i}", f"e{i}@x", 20 + i])
+        self.sql("INSERT INTO users (name, email) VALUES (:name, :email)", {'name': "it's ? here", 'email': 'q@x'})
+
+        self.assertEqual(self.sql("SELECT name FROM users WHERE email = ?1 OR name = ?1", ['e1@x']), [{'name': 'n1'}])
+        self.assertEqual(self.ids("SELECT * FROM users WHERE name = ?", ["it's ? here"]), [4])
+        self.assertEqual(self.ids("SELECT * FROM users WHERE age >= ? ORDER BY id LIMIT ?", [21, 1]), [2])
+        self.assertEqual(self.sql("UPDATE users SET age = ? WHERE id = ?", [99, 1]), 1)
+        self.assertEqual(self.sql("SELECT age FROM users WHERE id = 1"), [{'age': 99}])
+
+    def test_statements_are_parsed_once(self):
+        sql = "SELECT * FROM users WHERE id = ?"
+        self.sql(sql, [1])
+        statement = self.db._statements[sql]
+        self.sql(sql, [2])
+        self.assertIs(self.db._statements[sql], statement)
+
+    def test_missing_params(self):
+        with self.assertRaises(ValueError):
+            self.sql("SELECT * FROM users WHERE id = ?")
+        with self.assertRaises(ValueError):
+            self.sql("SELECT * FROM users WHERE id = ?", [])
+        with self.assertRaises(ValueError):
+            self.sql("SELECT * FROM users WHERE id = :id", {'other': 1})
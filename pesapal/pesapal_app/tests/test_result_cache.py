@@ -0,0 +1,53 @@
+# @Felix 2026
+
+from .support import EngineTestCase
+
+
+class ResultCacheTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(20)
+        self.sql("CREATE TABLE products (id INTEGER PRIMARY KEY, name TEXT)")
+        self.db.set_result_cache(True)
+
+    def stats(self):
+        return self.db.result_cache_stats()
+
+    def test_hits_until_a_read_table_is_written(self):
+        sql = "SELECT * FROM users WHERE age = ?"
+        first = self.sql(sql, [3])
+        self.assertEqual(self.sql(sql, [3]), first)
+        self.assertEqual((self.stats()['hits'], self.stats()['misses']), (1, 1))
+
+        # callers get their own copies
+        first[0]['name'] = 'changed'
+        self.assertEqual(self.sql(sql, [3])[0]['name'], 'u3')
+
+        self.sql("INSERT INTO products (name) VALUES ('p')")
+        self.sql(sql, [3])
+        self.assertEqual(self.stats()['invalidations'], 0)
+
+        self.sql("UPDATE users SET age = 3 WHERE id = 1")
+        self.assertEqual(self.ids(sql, [3]), [1, 3, 13])
+        self.assertEqual(self.stats()['invalidations'], 1)
+
+    def test_transactions_bypass_the_cache(self):
+        sql = "SELECT * FROM users WHERE id = 1"
+        self.sql(sql)
+        with self.db.transaction():
+            self.sql("DELETE FROM users WHERE id = 1")
+            self.assertEqual(self.sql(sql), [])
+        self.assertEqual(self.sql(sql), [])
+
+    def test_size_bound_and_disabled(self):
+        self.db.set_result_cache(True, max_bytes=2000)
+        for i in range(1, 21):
+            self.sql("SELECT * FROM users WHERE id = ?", [i])
+        self.assertGreater(self.stats()['evictions'], 0)
+        self.assertLessEqual(self.stats()['bytes'], 2000)
+
+        self.db.set_result_cache(False)
+        self.assertEqual(self.stats(), {'enabled': False})
+        with self.assertRaises(ValueError):
+            self.sql("SELECT * FROM nope")
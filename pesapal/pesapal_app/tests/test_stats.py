@@ -0,0 +1,103 @@
+# @Felix 2026
+
+import json
+import threading
+from unittest import mock
+
+from .. import rdbms_stats
+from .support import EngineTestCase
+
+
+class StatisticsTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.sql("CREATE TABLE t (id INTEGER PRIMARY KEY, g TEXT, v INTEGER)")
+        self.db.executemany("INSERT INTO t (g, v) VALUES (?, ?)",
+                            [('a' if i % 20 else 'rare', i % 50) for i in range(1000)])
+        self.sql("CREATE INDEX ig ON t (g)")
+        self.sql("CREATE INDEX iv ON t (v) USING BTREE")
+        self.table = self.db.tables['t']
+
+    def test_analyze_and_cost_based_plans(self):
+        self.assertEqual(self.sql("ANALYZE"), {'t': 1000})
+        stats = self.db.get_schema()['tables']['t']['stats']
+        json.dumps(stats)
+        self.assertEqual(stats['analyzed_rows'], 1000)
+        self.assertEqual((stats['columns']['v']['min'], stats['columns']['v']['max']), (0, 49))
+
+        # a probe that matches nearly every row loses to a scan
+        self.assertTrue(self.table.plan("g = 'a'").is_scan)
+        self.assertEqual(self.table.plan("g = 'rare'").index_column, 'g')
+        self.assertEqual(self.table.plan("v > 45").index_column, 'v')
+        self.assertTrue(self.table.plan("v > 2").is_scan)
+        # the plan only changes how rows are found
+        self.assertEqual(len(self.sql("SELECT * FROM t WHERE g = 'a'")), 950)
+
+    def test_analyze_changes_the_access_path(self):
+        # without statistics an equality on an indexed column always probes
+        self.assertEqual(self.table.plan("g = 'a'").index_column, 'g')
+        self.sql("ANALYZE t")
+        self.assertTrue(self.table.plan("g = 'a'").is_scan)
+
+    def test_analyze_changes_the_hash_join_build_side(self):
+        # a: 100 rows, only 10 with a key; b: 30 rows, all keyed. Neither side is indexed.
+        self.sql("CREATE TABLE a (id INTEGER PRIMARY KEY, k INTEGER)")
+        self.sql("CREATE TABLE b (id INTEGER PRIMARY KEY, k INTEGER)")
+        self.db.executemany("INSERT INTO a (k) VALUES (?)", [(i if i < 10 else None,) for i in range(100)])
+        self.db.executemany("INSERT INTO b (k) VALUES (?)", [(i % 10,) for i in range(30)])
+        chosen = []
+        join_strategy = rdbms_stats.join_strategy
+
+        def record(*args):
+            strategy = join_strategy(*args)
+            chosen.append(strategy[0])
+            return strategy
+
+        with mock.patch.object(rdbms_stats, 'join_strategy', record):
+            before = self.db.join('a', 'b', 'a.k = b.k', 'INNER')
+            self.sql("ANALYZE a")
+            after = self.db.join('a', 'b', 'a.k = b.k', 'INNER')
+        # counted by rows, a looks larger and b is built; counted by keys, a is the smaller input
+        self.assertEqual(chosen, ['hash_right', 'hash_left'])
+        self.assertEqual(len(before), 30)
+        self.assertEqual(after, before)
+
+    def test_statistics_follow_writes(self):
+        self.sql("ANALYZE t")
+        self.db.executemany("INSERT INTO t (g, v) VALUES (?, ?)", [('new', 500)] * 10)
+        self.sql("DELETE FROM t WHERE v = 0")
+        stats = self.db.get_schema()['tables']['t']['stats']
+        self.assertEqual(stats['modified_since_analyze'], 30)
+        self.assertEqual(stats['columns']['v']['max'], 500)
+
+    def test_writes_during_analyze_are_kept(self):
+        self.sql("ANALYZE t")
+        passes = []
+        analyze = rdbms_stats.analyze
+
+        def write_during_the_first_pass(columns, rows):
+            if not passes:
+                # ANALYZE holds no lock while it reads its snapshot, so this writer does not wait
+                writer = threading.Thread(target=lambda: (
+                    self.db.executemany("INSERT INTO t (g, v) VALUES (?, ?)", [('new', 500)] * 10),
+                    self.sql("DELETE FROM t WHERE v = 0")))
+                writer.start()
+                writer.join(5)
+            passes.append(columns)
+            return analyze(columns, rows)
+
+        with mock.patch.object(rdbms_stats, 'analyze', write_during_the_first_pass):
+            self.assertEqual(self.sql("ANALYZE t"), {'t': 990})
+            self.assertEqual(len(passes), 2)
+            # without writes in between, the snapshot pass is kept
+            self.sql("ANALYZE t")
+            self.assertEqual(len(passes), 3)
+        stats = self.db.get_schema()['tables']['t']['stats']
+        self.assertEqual((stats['analyzed_rows'], stats['modified_since_analyze']), (990, 0))
+        self.assertEqual((stats['columns']['v']['min'], stats['columns']['v']['max']), (1, 500))
+
+    def test_analyze_unknown_table(self):
+        self.assertIsNone(self.db.get_schema()['tables']['t']['stats'])
+        with self.assertRaises(ValueError):
+            self.sql("ANALYZE nope")
@@ -0,0 +1,111 @@
+# @Felix 2026
+
+from ..rdbms_core import ColumnarTable, RowView
+from .support import EngineTestCase
+
+
+QUERIES = [
+    "SELECT * FROM users WHERE age > 3 AND name LIKE 'u1%'",
+    "SELECT name, age FROM users WHERE email IS NULL ORDER BY age DESC LIMIT 5",
+    "SELECT id FROM users WHERE age IN (1, 2) OR id = 40",
+    "SELECT * FROM users ORDER BY age DESC",
+]
+
+WRITES = [
+    "UPDATE users SET age = NULL WHERE age = 4",
+    "DELETE FROM users WHERE age = 7",
+    "UPDATE users SET email = NULL, age = 1 WHERE id < 10",
+    "ALTER TABLE users ADD COLUMN note TEXT",
+    "UPDATE users SET note = 'x' WHERE age = 1",
+]
+
+
+class ColumnarStorageTest(EngineTestCase):
+
+    def test_columnar_matches_row_store(self):
+        self.create_users(60)
+        self.sql("CREATE TABLE users_c (id INTEGER PRIMARY KEY, name TEXT NOT NULL, email TEXT UNIQUE, age INTEGER) "
+                 "USING COLUMNAR")
+        columnar = self.db.tables['users_c']
+        for i in range(1, 61):
+            columnar.insert({'name': f"u{i}", 'email': f"u{i}@x", 'age': i % 10})
+        self.assertIsInstance(columnar, ColumnarTable)
+        self.assertEqual(columnar.vectors['age'].typecode, 'q')
+
+        for write in [None] + WRITES:
+            if write:
+                self.assertEqual(self.sql(write), self.sql(write.replace('users', 'users_c', 1)), write)
+            for query in QUERIES:
+                self.assertEqual(self.sql(query), self.sql(query.replace('users', 'users_c', 1)), (write, query))
+
+    def test_columnar_survives_save_and_load(self):
+        self.create_users(20, 'COLUMNAR')
+        self.db.save_to_file(self.path())
+        db = self.reopen(self.path())
+        self.assertEqual(db.tables['users'].storage, 'COLUMNAR')
+        self.assertEqual(db.execute_sql("SELECT * FROM users"), self.sql("SELECT * FROM users"))
+
+    def test_unknown_storage(self):
+        with self.assertRaises(ValueError):
+            self.sql("CREATE TABLE t (id INTEGER PRIMARY KEY) USING FOO")
+
+
+class RowViewTest(EngineTestCase):
+
+    def test_rows_are_tuples_and_views_are_read_only(self):
+        self.create_users(3)
+        table = self.db.tables['users']
+        self.assertEqual(table.rows[0], (1, 'u1', 'u1@x', 1))
+        view = table.select_views("id = 2")[0]
+        self.assertEqual(view['_id'], 2)
+        self.assertIsInstance(view, RowView)
+        self.assertEqual((view['name'], view.get('missing', 'd')), ('u2', 'd'))
+        self.assertEqual(view.to_dict(['id', 'age']), {'id': 2, 'age': 2})
+        with self.assertRaises(TypeError):
+            view['name'] = 'z'
+        with self.assertRaises(KeyError):
+            view['missing']
+        # select hands out plain dicts that callers may change freely
+        row = table.select("id = 2")[0]
+        row['name'] = 'changed'
+        self.assertEqual(self.sql("SELECT name FROM users WHERE id = 2"), [{'name': 'u2'}])
+
+
+class StableRowIdTest(EngineTestCase):
+
+    def test_row_ids_survive_deletes_and_vacuum(self):
+        for storage in ('ROW', 'COLUMNAR'):
+            with self.subTest(storage=storage):
+                if 'users' in self.db.tables:
+                    self.sql("DROP TABLE users")
+                self.create_users(10, storage)
+                before = {row['id']: row['_id'] for row in self.sql("SELECT * FROM users")}
+                self.assertEqual(self.sql("DELETE FROM users WHERE age < 5"), 5)
+                table = self.db.tables['users']
+                self.assertEqual((table.row_count, table.dead_rows), (5, 5))
+                self.assertEqual(self.sql("VACUUM users"), 5)
+                self.assertEqual(table.dead_rows, 0)
+                after = {row['id']: row['_id'] for row in self.sql("SELECT * FROM users")}
+                self.assertEqual(after, {pk: rowid for pk, rowid in before.items() if pk % 10 >= 5})
+                self.assertEqual(self.ids("SELECT * FROM users WHERE id = 8"), [8])
+                # ids are never reused
+                self.sql("INSERT INTO users (name) VALUES ('new')")
+                self.assertEqual(table.select_views("name = 'new'")[0]['_id'], 11)
+
+    def test_single_row_insert_returns_the_primary_key(self):
+        self.create_users(3)
+        self.sql("DELETE FROM users WHERE id = 3")
+        with self.assertRaises(ValueError), self.db.transaction():
+            self.sql("INSERT INTO users (name) VALUES ('gone')")
+            raise ValueError("roll back")
+        # the deleted row and the rolled-back insert used up row ids 3 and 4, but key 3 is free again
+        new_id = self.sql("INSERT INTO users (name) VALUES ('new')")
+        row = self.sql("SELECT * FROM users WHERE name = 'new'")[0]
+        self.assertEqual((new_id, row['id'], row['_id']), (3, 3, 5))
+
+        self.sql("CREATE TABLE notes (body TEXT)")
+        self.assertEqual(self.sql("INSERT INTO notes (body) VALUES ('x')"), 1)
+
+    def test_vacuum_unknown_table(self):
+        with self.assertRaises(ValueError):
+            self.sql("VACUUM nope")
@@ -0,0 +1,92 @@
+# @Felix 2026
+
+import os
+
+from .support import EngineTestCase
+
+
+class TransactionTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(5)
+        self.before = self.sql("SELECT * FROM users")
+
+    def test_rollback_undoes_every_change(self):
+        self.sql("BEGIN")
+        self.sql("INSERT INTO users (name, email) VALUES ('new', 'new@x')")
+        self.sql("UPDATE users SET age = 50 WHERE id < 3")
+        self.sql("DELETE FROM users WHERE id = 4")
+        self.sql("CREATE TABLE extra (id INTEGER PRIMARY KEY)")
+        self.sql("CREATE INDEX ia ON users (age)")
+        self.assertEqual(len(self.sql("SELECT * FROM users WHERE age = 50")), 2)
+        self.sql("ROLLBACK")
+
+        self.assertEqual(self.sql("SELECT * FROM users"), self.before)
+        self.assertNotIn('extra', self.db.tables)
+        self.assertNotIn('age', self.db.tables['users'].indexes)
+        # the unique index was restored too
+        self.sql("INSERT INTO users (name, email) VALUES ('new', 'new@x')")
+
+    def test_commit_keeps_changes_and_logs_them_once(self):
+        self.db.save_to_file(self.path())
+        with self.db.transaction():
+            self.sql("UPDATE users SET age = 50 WHERE id = 1")
+            self.sql("DELETE FROM users WHERE id = 2")
+        expected = self.sql("SELECT * FROM users")
+        self.assertEqual(len(expected), 4)
+        self.assertEqual(self.reopen(self.path()).execute_sql("SELECT * FROM users"), expected)
+
+    def test_transaction_rolls_back_when_the_block_raises(self):
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.sql("DELETE FROM users")
+                self.sql("INSERT INTO users (name, email) VALUES ('a', 'dup@x')")
+                self.sql("INSERT INTO users (name, email) VALUES ('b', 'dup@x')")
+        self.assertEqual(self.sql("SELECT * FROM users"), self.before)
+
+    def test_misuse(self):
+        with self.assertRaises(ValueError):
+            self.sql("ROLLBACK")
+        self.sql("BEGIN")
+        self.addCleanup(self.db.rollback)
+        with self.assertRaises(ValueError):
+            self.sql("BEGIN")
+        with self.assertRaises(ValueError):
+            self.sql("ALTER TABLE users ADD COLUMN note TEXT")
+
+
+class RenameTableTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(5)
+        self.sql("CREATE TABLE products (id INTEGER PRIMARY KEY, name TEXT)")
+
+    def test_rename_and_roll_back(self):
+        self.sql("BEGIN")
+        self.sql("ALTER TABLE users RENAME TO members")
+        self.assertEqual(len(self.sql("SELECT * FROM members")), 5)
+        self.sql("ROLLBACK")
+        self.assertEqual(sorted(self.db.tables), ['products', 'users'])
+        self.assertEqual(self.db.tables['users'].name, 'users')
+
+    def test_rename_a_deferred_table(self):
+        self.db.save_to_file(self.path())
+        self.db.close()
+        db = self.reopen(self.path())
+        self.assertFalse(db.tables['users'].is_loaded)
+        db.execute_sql("ALTER TABLE users RENAME TO members")
+        self.assertEqual(len(db.execute_sql("SELECT * FROM members")), 5)
+        db.checkpoint()
+        self.assertEqual(os.path.getsize(self.path() + '-wal'), 0)
+        db.close()
+        self.assertEqual(len(self.reopen(self.path()).execute_sql("SELECT * FROM members")), 5)
+
+    def test_rename_onto_an_existing_table(self):
+        with self.assertRaises(ValueError):
+            self.sql("ALTER TABLE users RENAME TO products")
+        self.assertEqual(len(self.sql("SELECT * FROM users")), 5)
+        self.assertEqual(self.sql("SELECT * FROM products"), [])
+        with self.assertRaises(ValueError):
+            self.sql("ALTER TABLE nope RENAME TO other")
@@ -0,0 +1,51 @@
+# @Felix 2026
+
+import unittest
+from unittest import mock
+
+from .. import rdbms_vector
+from .support import EngineTestCase
+
+
+QUERIES = [
+    "SELECT COUNT(*) AS n, SUM(v) AS s, MIN(v) AS lo, MAX(v) AS hi FROM t WHERE v > 10 AND r < 50",
+    "SELECT id FROM t WHERE v BETWEEN 5 AND 9 OR v IN (90, 91)",
+    "SELECT id FROM t WHERE NOT (v >= 3) AND r IS NOT NULL",
+    "SELECT COUNT(v) AS c FROM t WHERE v * 2 + 1 > 150",
+]
+
+
+@unittest.skipUnless(rdbms_vector.available(), "NumPy is not installed")
+class VectorizedTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(rdbms_vector, 'MIN_ROWS', 10)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sql("CREATE TABLE t (id INTEGER PRIMARY KEY, v INTEGER, r REAL) USING COLUMNAR")
+        self.db.executemany("INSERT INTO t (v, r) VALUES (?, ?)",
+                            [(None if i % 13 == 0 else i % 100, None if i % 7 == 0 else i / 3) for i in range(1, 501)])
+
+    def test_vectorized_results_match_the_row_path(self):
+        average = "SELECT AVG(r) AS a FROM t WHERE v > 10"
+        expected = [self.sql(query) for query in QUERIES]
+        expected_average = self.sql(average)[0]['a']
+        self.db.set_vectorized(True)
+        self.assertEqual([self.sql(query) for query in QUERIES], expected)
+        # NumPy sums floats pairwise, so only the last digits may differ
+        self.assertAlmostEqual(self.sql(average)[0]['a'], expected_average)
+        plan = [row['QUERY PLAN'] for row in self.sql("EXPLAIN SELECT id FROM t WHERE v > 10")]
+        self.assertTrue(plan[0].startswith("Vector Scan"), plan)
+
+    def test_vectorized_reads_see_snapshots(self):
+        self.db.set_vectorized(True)
+        cursor = self.sql("SELECT id FROM t WHERE v >= 0", cursor=True)
+        self.sql("UPDATE t SET v = -1 WHERE id < 100")
+        self.assertEqual(len(cursor.fetchall()), 462)
+        self.assertEqual(self.sql("SELECT COUNT(*) AS n FROM t WHERE v < 0"), [{'n': 99}])
+
+    def test_unavailable(self):
+        with mock.patch.object(rdbms_vector, 'np', None):
+            with self.assertRaises(ValueError):
+                self.db.set_vectorized(True)
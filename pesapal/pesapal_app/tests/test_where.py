@@ -0,0 +1,52 @@
+# @Felix 2026
+
+import unittest
+
+from ..rdbms_where import compile_where, parse_where
+from .support import EngineTestCase
+
+
+def matches(clause, row):
+    return compile_where(clause, lambda name: ((lambda r: r[name]), None))(row)
+
+
+class CompiledWhereTest(unittest.TestCase):
+
+    def test_comparisons_and_logic(self):
+        row = {'age': 30, 'name': "O'Neil", 'email': None}
+        self.assertTrue(matches("age > 20 AND name = 'O''Neil'", row))
+        self.assertTrue(matches("age BETWEEN 30 AND 40 OR email IS NOT NULL", row))
+        self.assertTrue(matches("age IN (1, 30) AND name LIKE 'o%'", row))
+        self.assertTrue(matches("NOT (age < 10)", row))
+        self.assertTrue(matches("age + 5 = 35", row))
+        self.assertFalse(matches("age NOT BETWEEN 20 AND 40", row))
+
+    def test_null_is_unknown(self):
+        row = {'email': None, 'age': 1}
+        self.assertFalse(matches("email = 'x'", row))
+        self.assertFalse(matches("NOT email = 'x'", row))
+        self.assertTrue(matches("email IS NULL", row))
+        # 1 NOT IN (2, NULL) is unknown, not true
+        self.assertFalse(matches("age NOT IN (2, NULL)", row))
+
+    def test_syntax_errors(self):
+        for clause in ("age >", "age = 'x", "age $ 3", "(age = 1"):
+            with self.assertRaises(ValueError, msg=clause):
+                parse_where(clause)
+
+
+class WhereThroughSqlTest(EngineTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_users(10)
+
+    def test_select_update_delete(self):
+        self.assertEqual(self.ids("SELECT * FROM users WHERE age >= 8 OR name = 'u1'"), [1, 8, 9])
+        self.assertEqual(self.sql("UPDATE users SET age = 50 WHERE age IN (2, 3)"), 2)
+        self.assertEqual(self.sql("DELETE FROM users WHERE age = 50"), 2)
+        self.assertEqual(len(self.sql("SELECT * FROM users")), 8)
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            self.sql("SELECT * FROM users WHERE nope = 1")
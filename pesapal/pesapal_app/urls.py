@@ -14,6 +14,7 @@ urlpatterns = [
     path('products/add/', views.add_product, name='add_product'),
     path('api/query/', views.api_query, name='api_query'),
     path('api/schema/', views.api_schema, name='api_schema'),
+    path('api/metrics/', views.api_metrics, name='api_metrics'),
     path('join/', views.run_join, name='join_demo'),
     path('terminal/', views.web_terminal, name='terminal'),
 
@@ -2,8 +2,9 @@
 
 
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from .models import User, Product, RDBMSWrapper
+from .rdbms_core import Cursor
 
 
 def index(request):
@@ -61,8 +62,8 @@ def users_view(request):
         print(f"DEBUG users_view: User {i+1}: id={user['id']}, name={user['name']}, email={user['email']}, age={user['age']}")
     
     
-    ages = [u['age'] for u in user_list if u['age'] and str(u['age']).isdigit()]
-    avg_age = sum(int(age) for age in ages) // len(ages) if ages else 0
+    result = RDBMSWrapper.get_db().execute_sql("SELECT AVG(age) as avg_age FROM users WHERE age > 0")
+    avg_age = int(result[0]['avg_age']) if result and result[0]['avg_age'] is not None else 0
     
     return render(request, 'users.html', {
         'users': user_list,
@@ -230,13 +231,14 @@ def add_product(request):
         
         try:
             
-            in_stock_val = 'TRUE' if in_stock else 'FALSE'
+            price_value = float(price) if price else None
             
             
-            sql = f"INSERT INTO products (name, price, in_stock, category) VALUES ('{name}', {price}, {in_stock_val}, '{category}')"
+            sql = "INSERT INTO products (name, price, in_stock, category) VALUES (?, ?, ?, ?)"
+            params = [name, price_value, in_stock, category]
             
-            print(f"DEBUG add_product: Executing SQL: {sql}")
-            db.execute_sql(sql)
+            print(f"DEBUG add_product: Executing SQL: {sql} {params}")
+            db.execute_sql(sql, params)
             RDBMSWrapper.save_db()
             return redirect('products')
             
@@ -263,13 +265,18 @@ def api_query(request):
         
         try:
             db = RDBMSWrapper.get_db()
-            result = db.execute_sql(query)
+            if query.strip().upper().startswith('EXPLAIN'):
+                return _explain_response(db, query, format)
             
+            result = db.execute_sql(query, cursor=True)
             
-            if isinstance(result, list):
+            
+            if isinstance(result, Cursor):
                 
-                if format == 'table':
-                    result = result[:100]  
+                with result:
+                    result = result.fetchmany(100) if format == 'table' else result.fetchall()
+            
+            if isinstance(result, list):
                 
                 
                 serializable_result = []
@@ -302,6 +309,17 @@ def api_query(request):
     return JsonResponse({'error': 'POST required'}, status=400)
 
 
+def _explain_response(db, query, format):
+    """EXPLAIN [ANALYZE] as the plan's text lines (like any result rows) plus the plan tree"""
+    plan = db.explain(query)
+    return JsonResponse({
+        'success': True,
+        'result': [{'QUERY PLAN': line} for line in plan.lines()],
+        'plan': plan.to_dict(),
+        'format': format
+    })
+
+
 def api_schema(request):
     """Get database schema via API"""
     db = RDBMSWrapper.get_db()
@@ -309,6 +327,12 @@ def api_schema(request):
     return JsonResponse(schema)
 
 
+def api_metrics(request):
+    """Engine metrics in the Prometheus text format, for scraping"""
+    db = RDBMSWrapper.get_db()
+    return HttpResponse(db.metrics_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 
 def run_join(request):
     """Demonstrate JOIN operations with different types"""
@@ -359,13 +383,19 @@ def web_terminal(request):
                     'format': format
                 })
             
-            result = db.execute_sql(query)
+            if query.strip().upper().startswith('EXPLAIN'):
+                return _explain_response(db, query, format)
             
+            result = db.execute_sql(query, cursor=True)
             
-            if isinstance(result, list):
+            
+            if isinstance(result, Cursor):
                 
-                if format == 'table':
-                    result = result[:limit]
+                # table view only shows `limit` rows, so only that many are read
+                with result:
+                    result = result.fetchmany(limit) if format == 'table' else result.fetchall()
+            
+            if isinstance(result, list):
                 
                 
                 serializable_result = []
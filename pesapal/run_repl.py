@@ -9,6 +9,8 @@ from pesapal_app.rdbms_core import Database
 
 def main():
     db = Database("pesapal_db")
+    # COPY ... FROM 'file' reads files in the directory the REPL was started from
+    db.set_copy_directory(os.getcwd())
     
     
     if os.path.exists("db.pesapal"):
@@ -42,9 +44,13 @@ def main():
     else:
         print("✗ No db.pesapal file found, starting fresh")
     
+    
+    if db.filename is None:
+        db.save_to_file()
+    
     print("\n" + "="*50)
     print("PESAPALDB REPL with File Persistence")
-    print("Database will auto-save to 'db.pesapal'")
+    print("Every change is logged to 'db.pesapal-wal' as it commits")
     print("Commands: SAVE, LOAD, EXIT, or SQL")
     print("="*50 + "\n")
     
@@ -54,6 +60,9 @@ def main():
             
             if cmd.upper() == 'EXIT':
                 
+                if db.in_transaction:
+                    db.rollback()
+                    print("Open transaction rolled back")
                 db.save_to_file()
                 print("Database saved. Goodbye!")
                 break
@@ -67,9 +76,16 @@ def main():
             elif cmd.upper() == 'HELP':
                 print("""
 Commands:
-  SAVE           - Save database to db.pesapal
+  SAVE           - Checkpoint database to db.pesapal
   LOAD           - Load database from db.pesapal
   SCHEMA         - Show database schema
+  BEGIN          - Start a transaction (COMMIT or ROLLBACK ends it)
+  EXPLAIN [ANALYZE] <sql>
+                 - Show a statement's plan; ANALYZE runs it and adds
+                   rows in/out, time and memory to every step
+  COPY <table> FROM '<file>'
+                 - Bulk-load a CSV or JSON Lines file from the
+                   current directory
   EXIT           - Exit and save
   Any SQL query  - Execute SQL
                 """)
@@ -105,10 +121,6 @@ Commands:
                     else:
                         print(f"Result: {result}")
                 
-                
-                db.save_to_file()
-                print("✓ Auto-saved to db.pesapal")
-                
         except Exception as e:
             print(f"Error: {e}")
 